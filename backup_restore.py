@@ -4,10 +4,109 @@ import shutil
 from datetime import datetime
 import tempfile
 import random
+import zlib
+import threading
+import time
+import platform
+import json
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
 # 版本常量
 VERSION = "v0.3.0"
 
+# 还原时必须存在、对比时会解码的存档文件
+REQUIRED_FILES = ['DevilConnection_sf.sav', 'DevilConnection_tyrano_data.sav']
+
+# 备份目录中的备份目录信息文件（记录校验结果等）
+CATALOG_FILENAME = "dcsm_catalog.json"
+VERIFY_WORKERS = 4  # 并行校验的备份数量
+ARCHIVE_TEMP_SUFFIX = ".lzma_tmp"  # LZMA重新打包时的临时文件后缀
+
+# 还原相关常量
+RESTORE_STAGING_SUFFIX = ".dcsm_restoring"  # 暂存目录后缀（与_storage同级）
+PRE_RESTORE_PREFIX = "pre_restore_"  # 还原前自动备份目录前缀（位于备份目录下）
+PRE_RESTORE_KEEP = 3  # 保留的还原前备份数量
+RESTORE_WORKERS = 4  # 并行解压线程数
+COPY_CHUNK_SIZE = 1024 * 1024
+MEMBER_SPOOL_SIZE = 8 * 1024 * 1024  # 备份时单个文件先读入内存的上限，超过后暂存到临时文件
+ZIP64_THRESHOLD = (1 << 31) - 1  # 超过该大小的成员需要强制使用ZIP64
+PROGRESS_UPDATE_INTERVAL = 0.1  # 进度回调的最小间隔（秒）
+
+# 自动备份相关常量
+AUTO_BACKUP_PREFIX = "DC_storage_autobackup_"  # 自动快照文件名前缀（保留策略只作用于此类文件）
+AUTO_BACKUP_DELAY_SECONDS = 30  # 检测到变化后延迟多久再备份，把连续写入合并到同一个快照
+AUTO_BACKUP_DEFAULT_INTERVAL_MINUTES = 10
+AUTO_BACKUP_RETRY_SECONDS = 30  # 有其他备份/还原操作进行中时的重试间隔
+AUTO_BACKUP_KEEP_HOURLY = 24
+AUTO_BACKUP_KEEP_DAILY = 7
+AUTO_BACKUP_KEEP_WEEKLY = 4
+
+class OperationCancelled(Exception):
+    """备份/还原被用户取消"""
+
+
+class CancelToken:
+    """跨线程的取消标记"""
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def cancel(self):
+        """请求取消"""
+        self._event.set()
+    
+    def is_cancelled(self):
+        """是否已请求取消"""
+        return self._event.is_set()
+
+
+class ProgressTracker:
+    """
+    按字节统计进度并节流回调（线程安全）
+    
+    回调参数：(已处理字节数, 总字节数, 速度字节每秒, 预计剩余秒数或None)
+    """
+    
+    def __init__(self, total_bytes, callback=None, interval=PROGRESS_UPDATE_INTERVAL):
+        self.total_bytes = total_bytes
+        self.callback = callback
+        self.interval = interval
+        self.done_bytes = 0
+        self._start_time = time.monotonic()
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+    
+    def advance(self, byte_count):
+        """记录新处理的字节数，到达节流间隔时触发回调"""
+        with self._lock:
+            self.done_bytes += byte_count
+            now = time.monotonic()
+            if now - self._last_report < self.interval:
+                return
+            self._last_report = now
+            snapshot = self._snapshot(now)
+        self._report(snapshot)
+    
+    def finish(self):
+        """完成时强制回调一次"""
+        with self._lock:
+            self.done_bytes = self.total_bytes
+            snapshot = self._snapshot(time.monotonic())
+        self._report(snapshot)
+    
+    def _snapshot(self, now):
+        elapsed = now - self._start_time
+        rate = self.done_bytes / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self.total_bytes - self.done_bytes)
+        eta = remaining / rate if rate > 0 else None
+        return (self.done_bytes, self.total_bytes, rate, eta)
+    
+    def _report(self, snapshot):
+        if self.callback:
+            self.callback(*snapshot)
+
+
 class BackupRestore:
     def __init__(self, storage_dir):
         """
@@ -17,6 +116,12 @@ class BackupRestore:
             storage_dir: _storage文件夹的路径
         """
         self.storage_dir = storage_dir
+        # 文件CRC32缓存：{绝对路径: ((大小, mtime_ns), crc32)}
+        self._crc_cache = {}
+        # 备份/还原互斥锁，避免自动快照与手动备份、还原同时操作_storage
+        self.operation_lock = threading.Lock()
+        # 备份目录信息（校验结果）的读写锁
+        self._catalog_lock = threading.Lock()
     
     def get_backup_dir(self):
         """
@@ -119,16 +224,22 @@ class BackupRestore:
         except Exception:
             return None
     
-    def create_backup(self, storage_dir, progress_callback=None):
+    def create_backup(self, storage_dir, progress_callback=None, prefix="DC_storage_backup_",
+                      cancel_token=None, skipped_files=None):
         """
         创建备份
         
         Args:
             storage_dir: _storage文件夹路径
-            progress_callback: 进度回调函数，接收 (current, total) 参数
+            progress_callback: 进度回调函数，按字节计，接收
+                (已处理字节数, 总字节数, 速度字节每秒, 预计剩余秒数或None) 参数，
+                调用频率受PROGRESS_UPDATE_INTERVAL限制
+            prefix: 备份文件名前缀
+            cancel_token: 可选的CancelToken，取消后会删除未完成的zip
+            skipped_files: 可选的列表，无法读取而被跳过的文件（相对路径）会追加到其中
         
         Returns:
-            (备份文件路径, 实际大小, 绝对路径) 或 None（如果失败）
+            (备份文件路径, 实际大小, 绝对路径) 或 None（如果失败或被取消）
         """
         if not os.path.exists(storage_dir):
             return None
@@ -143,54 +254,108 @@ class BackupRestore:
             except OSError:
                 return None
         
+        backup_path = None
         try:
             now = datetime.now()
-            filename = f"DC_storage_backup_{now.strftime('%Y%m%d_%H%M%S')}.zip"
+            filename = f"{prefix}{now.strftime('%Y%m%d_%H%M%S')}.zip"
             backup_path = os.path.join(backup_dir, filename)
             
-            # 先收集所有文件，用于计算进度
+            # 先收集所有文件及大小，用于按字节计算进度
             all_files = []
+            all_sizes = {}
+            total_bytes = 0
             for root, dirs, files in os.walk(storage_dir):
                 for file in files:
                     file_path = os.path.join(root, file)
+                    try:
+                        file_size = os.path.getsize(file_path)
+                    except OSError:
+                        continue
                     all_files.append(file_path)
+                    all_sizes[file_path] = file_size
+                    total_bytes += file_size
             
-            total_files = len(all_files) + 1  # +1 for INFO file
+            tracker = ProgressTracker(total_bytes, progress_callback)
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                info_file_path = os.path.join(temp_dir, "dcsmINFO.txt")
-                
-                timestamp_str = now.strftime('%Y-%m-%d %H:%M:%S')
-                with open(info_file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"{timestamp_str}\n")
-                    f.write("This backup .zip was created using https://github.com/Hxueit/Devil-Connection-Sav-Manager/\n")
-                    f.write(f"ver:{VERSION}\n")
+            timestamp_str = now.strftime('%Y-%m-%d %H:%M:%S')
+            info_content = (
+                f"{timestamp_str}\n"
+                "This backup .zip was created using https://github.com/Hxueit/Devil-Connection-Sav-Manager/\n"
+                f"ver:{VERSION}\n"
+            )
+            
+            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=7) as zipf:
+                zipf.writestr("dcsmINFO.txt", info_content)
                 
-                current = 0
-                with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=7) as zipf:
-                    zipf.write(info_file_path, "dcsmINFO.txt")
-                    current += 1
-                    if progress_callback:
-                        progress_callback(current, total_files)
+                for file_path in all_files:
+                    if cancel_token is not None and cancel_token.is_cancelled():
+                        raise OperationCancelled()
                     
-                    for file_path in all_files:
-                        try:
-                            rel_path = os.path.relpath(file_path, storage_dir)
-                            zipf.write(file_path, rel_path)
-                            current += 1
-                            if progress_callback:
-                                progress_callback(current, total_files)
-                        except Exception:
-                                continue
-                
-                actual_size = os.path.getsize(backup_path)
-                abs_path = os.path.abspath(backup_path)
-                
-                return (backup_path, actual_size, abs_path)
-                
+                    rel_path = os.path.relpath(file_path, storage_dir)
+                    if not self._write_member_chunked(zipf, file_path, rel_path, tracker, cancel_token):
+                        # 无法读取的文件跳过，继续备份其他文件
+                        tracker.advance(all_sizes.get(file_path, 0))
+                        if skipped_files is not None:
+                            skipped_files.append(rel_path)
+            
+            tracker.finish()
+            
+            actual_size = os.path.getsize(backup_path)
+            abs_path = os.path.abspath(backup_path)
+            
+            return (backup_path, actual_size, abs_path)
+            
         except Exception:
+            # 失败或取消时删除未完成的zip
+            if backup_path and os.path.exists(backup_path):
+                try:
+                    os.remove(backup_path)
+                except OSError:
+                    pass
             return None
     
+    def _write_member_chunked(self, zipf, file_path, arcname, tracker, cancel_token):
+        """
+        分块把文件写入zip，每块汇报进度并检查取消
+        
+        先完整读取文件（小文件在内存中，大文件暂存到临时文件）再写入zip，
+        读取中途出错时zip中不会留下不完整的成员
+        
+        Returns:
+            是否写入成功（文件无法读取时返回False）
+        """
+        with tempfile.SpooledTemporaryFile(max_size=MEMBER_SPOOL_SIZE) as spool:
+            try:
+                zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                with open(file_path, 'rb') as src:
+                    while True:
+                        if cancel_token is not None and cancel_token.is_cancelled():
+                            raise OperationCancelled()
+                        chunk = src.read(COPY_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        spool.write(chunk)
+            except OSError:
+                return False
+            
+            zinfo.file_size = spool.tell()
+            zinfo.compress_type = zipf.compression
+            if hasattr(zinfo, "compress_level"):
+                # Python 3.13+ 才有公开的 compress_level，更早的版本使用zlib默认压缩级别
+                zinfo.compress_level = zipf.compresslevel
+            spool.seek(0)
+            
+            with zipf.open(zinfo, 'w', force_zip64=zinfo.file_size > ZIP64_THRESHOLD) as dst:
+                while True:
+                    if cancel_token is not None and cancel_token.is_cancelled():
+                        raise OperationCancelled()
+                    chunk = spool.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    tracker.advance(len(chunk))
+        return True
+    
     def scan_backups(self, backup_dir):
         """
         扫描备份目录，返回备份列表
@@ -254,63 +419,649 @@ class BackupRestore:
         Returns:
             缺失文件列表，如果都存在则返回空列表
         """
-        required_files = ['DevilConnection_sf.sav', 'DevilConnection_tyrano_data.sav']
         missing_files = []
         
         try:
             with zipfile.ZipFile(zip_path, 'r') as zipf:
                 file_list = zipf.namelist()
-                for required_file in required_files:
+                for required_file in REQUIRED_FILES:
                     if required_file not in file_list:
                         missing_files.append(required_file)
         except Exception:
             # 如果无法打开zip，认为所有文件都缺失
-            return required_files
+            return list(REQUIRED_FILES)
         
         return missing_files
     
-    def restore_backup(self, zip_path, storage_dir):
+    def _get_catalog_path(self):
+        """获取备份目录信息文件路径"""
+        backup_dir = self.get_backup_dir()
+        if not backup_dir:
+            return None
+        return os.path.join(backup_dir, CATALOG_FILENAME)
+    
+    def _load_catalog(self):
+        """读取备份目录信息，格式：{zip文件名: {...}}，失败返回空字典"""
+        catalog_path = self._get_catalog_path()
+        if not catalog_path or not os.path.exists(catalog_path):
+            return {}
+        try:
+            with open(catalog_path, 'r', encoding='utf-8') as f:
+                catalog = json.load(f)
+            return catalog if isinstance(catalog, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_catalog(self, catalog):
+        """原子写入备份目录信息，并丢弃已不存在的备份的记录"""
+        catalog_path = self._get_catalog_path()
+        if not catalog_path:
+            return
+        backup_dir = os.path.dirname(catalog_path)
+        catalog = {name: entry for name, entry in catalog.items()
+                   if os.path.exists(os.path.join(backup_dir, name))}
+        
+        temp_path = None
+        try:
+            temp_fd, temp_path = tempfile.mkstemp(dir=backup_dir, prefix='.dcsm_catalog_', suffix='.json')
+            with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+                json.dump(catalog, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, catalog_path)
+        except OSError:
+            if temp_path and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+    
+    def get_verification(self, zip_path):
         """
-        还原备份
+        获取备份最近一次的校验结果
+        
+        Returns:
+            {"ok": bool, "verified_at": "YYYY-mm-dd HH:MM:SS", "error": str}，
+            未校验过或备份在校验后被修改时返回None
+        """
+        with self._catalog_lock:
+            entry = self._load_catalog().get(os.path.basename(zip_path))
+        if not entry:
+            return None
+        
+        try:
+            file_stat = os.stat(zip_path)
+        except OSError:
+            return None
+        if entry.get("size") != file_stat.st_size or entry.get("mtime_ns") != file_stat.st_mtime_ns:
+            return None
+        return entry
+    
+    def verify_backup(self, zip_path, tracker=None, cancel_token=None):
+        """
+        校验单个备份：流式读取每个成员并检查CRC，确认必需的存档文件能正常解码
         
         Args:
             zip_path: 备份zip文件路径
+            tracker: 可选的ProgressTracker（按解压后字节计）
+            cancel_token: 可选的CancelToken
+        
+        Returns:
+            (是否通过, 错误信息)
+        """
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zipf:
+                names = set()
+                for info in zipf.infolist():
+                    names.add(info.filename)
+                    if info.is_dir():
+                        continue
+                    
+                    crc = 0
+                    with zipf.open(info) as src:
+                        while True:
+                            if cancel_token is not None and cancel_token.is_cancelled():
+                                raise OperationCancelled()
+                            chunk = src.read(COPY_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            crc = zlib.crc32(chunk, crc)
+                            if tracker is not None:
+                                tracker.advance(len(chunk))
+                    
+                    if (crc & 0xffffffff) != info.CRC:
+                        return (False, f"CRC mismatch: {info.filename}")
+                
+                for name in REQUIRED_FILES:
+                    if name not in names:
+                        return (False, f"missing: {name}")
+                    if not isinstance(self.decode_save_bytes(zipf.read(name)), dict):
+                        return (False, f"undecodable: {name}")
+            
+            return (True, "")
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            return (False, str(e) or type(e).__name__)
+    
+    def verify_backups(self, zip_paths, progress_callback=None, cancel_token=None):
+        """
+        在线程池中校验多个备份，并把结果和时间写入备份目录信息
+        
+        Args:
+            zip_paths: 备份zip文件路径列表
+            progress_callback: 进度回调函数，参数同create_backup
+            cancel_token: 可选的CancelToken，取消时已完成的结果仍会被保存
+        
+        Returns:
+            {zip_path: (是否通过, 错误信息)}
+        """
+        total_bytes = 0
+        for zip_path in zip_paths:
+            try:
+                with zipfile.ZipFile(zip_path, 'r') as zipf:
+                    total_bytes += sum(info.file_size for info in zipf.infolist())
+            except Exception:
+                continue
+        tracker = ProgressTracker(total_bytes, progress_callback)
+        
+        def verify_one(zip_path):
+            # 先记录校验前的文件状态，避免把校验期间被替换的文件标记为已校验
+            file_stat = os.stat(zip_path)
+            ok, error = self.verify_backup(zip_path, tracker, cancel_token)
+            return zip_path, file_stat, ok, error
+        
+        results = {}
+        entries = {}
+        with ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as executor:
+            futures = [executor.submit(verify_one, zip_path) for zip_path in zip_paths]
+            for future in as_completed(futures):
+                try:
+                    zip_path, file_stat, ok, error = future.result()
+                except (OperationCancelled, OSError):
+                    continue
+                results[zip_path] = (ok, error)
+                entries[os.path.basename(zip_path)] = {
+                    "ok": ok,
+                    "error": error,
+                    "verified_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    "size": file_stat.st_size,
+                    "mtime_ns": file_stat.st_mtime_ns,
+                }
+        
+        self._update_catalog(entries)
+        
+        if cancel_token is None or not cancel_token.is_cancelled():
+            tracker.finish()
+        return results
+    
+    def _update_catalog(self, entries):
+        """合并写入备份目录信息，entries格式：{zip文件名: {...}}"""
+        with self._catalog_lock:
+            catalog = self._load_catalog()
+            for name, entry in entries.items():
+                merged = dict(catalog.get(name, {}))
+                merged.update(entry)
+                catalog[name] = merged
+            self._save_catalog(catalog)
+    
+    def is_archived(self, zip_path):
+        """备份是否已用LZMA重新打包（根据备份目录信息判断）"""
+        entry = self.get_verification(zip_path)
+        return bool(entry and entry.get("archived"))
+    
+    def archive_backups(self, zip_paths, progress_callback=None, cancel_token=None):
+        """
+        在后台进程池中把备份重新打包为ZIP_LZMA格式（适合长期保存的旧备份）
+        
+        新文件校验通过后才会替换原文件，文件名和修改时间保持不变，
+        仍然可以通过scan_backups/restore_backup正常列出和还原。
+        
+        Args:
+            zip_paths: 备份zip文件路径列表
+            progress_callback: 进度回调函数，参数同create_backup（按原备份大小计）
+            cancel_token: 可选的CancelToken，取消后尚未开始的备份不再处理
+        
+        Returns:
+            {zip_path: (是否成功, 原大小, 新大小, 错误信息)}
+        """
+        sizes = {}
+        for zip_path in zip_paths:
+            try:
+                sizes[zip_path] = os.path.getsize(zip_path)
+            except OSError:
+                continue
+        tracker = ProgressTracker(sum(sizes.values()), progress_callback)
+        
+        results = {}
+        entries = {}
+        worker_count = max(1, min(os.cpu_count() or 1, len(sizes)))
+        with ProcessPoolExecutor(max_workers=worker_count, initializer=_lower_process_priority) as executor:
+            futures = {executor.submit(repack_backup_lzma, zip_path): zip_path for zip_path in sizes}
+            for future in as_completed(futures):
+                zip_path = futures[future]
+                if cancel_token is not None and cancel_token.is_cancelled():
+                    for pending in futures:
+                        pending.cancel()
+                if future.cancelled():
+                    continue
+                try:
+                    ok, old_size, new_size, error = future.result()
+                except Exception as e:
+                    ok, old_size, new_size, error = False, sizes[zip_path], sizes[zip_path], str(e)
+                results[zip_path] = (ok, old_size, new_size, error)
+                tracker.advance(sizes[zip_path])
+                
+                if ok:
+                    # repack_backup_lzma 已逐个成员校验CRC（重新打包的和已是LZMA格式的都会校验），直接记为校验通过
+                    file_stat = os.stat(zip_path)
+                    entries[os.path.basename(zip_path)] = {
+                        "ok": True,
+                        "error": "",
+                        "verified_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                        "size": file_stat.st_size,
+                        "mtime_ns": file_stat.st_mtime_ns,
+                        "archived": True,
+                    }
+        
+        self._update_catalog(entries)
+        return results
+    
+    def decode_save_bytes(self, raw):
+        """
+        解码存档文件内容（URL编码的JSON）
+        
+        Args:
+            raw: 文件的原始字节
+        
+        Returns:
+            解码后的对象，失败返回None
+        """
+        try:
+            encoded = raw.decode('utf-8', errors='ignore').strip()
+            return json.loads(urllib.parse.unquote(encoded))
+        except (ValueError, TypeError):
+            return None
+    
+    def read_backup_saves(self, zip_path):
+        """
+        直接在内存中读取备份里的存档文件并解码（不解压到磁盘）
+        
+        Args:
+            zip_path: 备份zip文件路径
+        
+        Returns:
+            {文件名: 解码后的数据或None}，无法打开zip时返回None
+        """
+        saves = {}
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zipf:
+                names = set(zipf.namelist())
+                for name in REQUIRED_FILES:
+                    if name in names:
+                        saves[name] = self.decode_save_bytes(zipf.read(name))
+                    else:
+                        saves[name] = None
+        except Exception:
+            return None
+        return saves
+    
+    def read_live_saves(self, storage_dir):
+        """
+        读取当前_storage中的存档文件并解码
+        
+        Args:
             storage_dir: _storage文件夹路径
         
         Returns:
-            True if successful, False otherwise
+            {文件名: 解码后的数据或None}
+        """
+        saves = {}
+        for name in REQUIRED_FILES:
+            try:
+                with open(os.path.join(storage_dir, name), 'rb') as f:
+                    saves[name] = self.decode_save_bytes(f.read())
+            except OSError:
+                saves[name] = None
+        return saves
+    
+    def restore_backup(self, zip_path, storage_dir, progress_callback=None, cancel_token=None):
+        """
+        还原备份（差分还原）
+        
+        先比较备份成员与当前文件的大小和CRC32，只有内容不同的成员会被并行解压到
+        与_storage同级的暂存目录并校验CRC；全部成功后再逐个重命名替换，并删除备份中
+        不存在的文件。被替换或删除的原文件会保留为自动的还原前备份。
+        任何一步失败都会回滚，不会留下半还原的_storage。
+        
+        Args:
+            zip_path: 备份zip文件路径
+            storage_dir: _storage文件夹路径
+            progress_callback: 进度回调函数，参数同create_backup（按需要写入的字节计）
+            cancel_token: 可选的CancelToken，在替换文件之前取消不会改动_storage
+        
+        Returns:
+            True if successful, False otherwise（包括被取消）
         """
         if not os.path.exists(zip_path):
             return False
         
+        storage_dir = os.path.abspath(storage_dir)
+        staging_dir = storage_dir + RESTORE_STAGING_SUFFIX
+        
         try:
-            if os.path.exists(storage_dir):
-                for root, dirs, files in os.walk(storage_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            os.remove(file_path)
-                        except Exception:
-                            pass
-                    for dir_name in dirs:
-                        dir_path = os.path.join(root, dir_name)
-                        try:
-                            shutil.rmtree(dir_path)
-                        except Exception:
-                            pass
+            plan = self._build_restore_plan(zip_path, storage_dir)
+            if plan is None:
+                return False
+            
+            to_write, to_delete = plan
+            if not to_write and not to_delete:
+                return True
+            
+            # 清理上次异常退出遗留的暂存目录
+            if os.path.exists(staging_dir):
+                shutil.rmtree(staging_dir)
+            os.makedirs(staging_dir)
             
+            tracker = ProgressTracker(sum(info.file_size for info in to_write), progress_callback)
+            if not self._extract_to_staging(zip_path, to_write, staging_dir, tracker, cancel_token):
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                return False
+            
+            # 替换开始后不再响应取消，保证_storage不会处于半还原状态
+            if cancel_token is not None and cancel_token.is_cancelled():
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                return False
+            
+            pre_restore_dir = self._get_pre_restore_dir()
+            if not self._apply_restore_plan(to_write, to_delete, staging_dir,
+                                            storage_dir, pre_restore_dir):
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                return False
+            
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            self._prune_pre_restore_dirs()
+            tracker.finish()
+            return True
+            
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return False
+    
+    def _safe_member_path(self, base_dir, member_name):
+        """
+        计算zip成员解压后的路径，拒绝指向base_dir之外的成员
+        
+        Returns:
+            目标绝对路径，非法成员返回None
+        """
+        target = os.path.abspath(os.path.join(base_dir, member_name))
+        if os.path.commonpath([base_dir, target]) != base_dir:
+            return None
+        return target
+    
+    def _get_file_crc(self, file_path, file_stat):
+        """
+        计算文件的CRC32（按路径、大小和修改时间缓存）
+        
+        Args:
+            file_path: 文件路径
+            file_stat: 该文件的os.stat结果
+        
+        Returns:
+            CRC32值
+        """
+        cache_key = (file_stat.st_size, file_stat.st_mtime_ns)
+        cached = self._crc_cache.get(file_path)
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+        
+        crc = 0
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                crc = zlib.crc32(chunk, crc)
+        crc &= 0xffffffff
+        
+        self._crc_cache[file_path] = (cache_key, crc)
+        return crc
+    
+    def _build_restore_plan(self, zip_path, storage_dir):
+        """
+        比较备份与当前_storage，计算需要写入和删除的文件
+        
+        Args:
+            zip_path: 备份zip文件路径
+            storage_dir: _storage文件夹绝对路径
+        
+        Returns:
+            (需要写入的ZipInfo列表, 需要删除的文件绝对路径列表)，备份含非法成员时返回None
+        """
+        with zipfile.ZipFile(zip_path, 'r') as zipf:
+            members = [info for info in zipf.infolist()
+                       if info.filename != 'dcsmINFO.txt' and not info.is_dir()]
+        
+        to_write = []
+        backup_paths = set()
+        for info in members:
+            target = self._safe_member_path(storage_dir, info.filename)
+            if target is None:
+                return None
+            backup_paths.add(os.path.normcase(target))
+            
+            try:
+                file_stat = os.stat(target)
+            except OSError:
+                to_write.append(info)
+                continue
+            
+            if file_stat.st_size != info.file_size:
+                to_write.append(info)
+            elif self._get_file_crc(target, file_stat) != info.CRC:
+                to_write.append(info)
+        
+        to_delete = []
+        if os.path.exists(storage_dir):
+            for root, dirs, files in os.walk(storage_dir):
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    if os.path.normcase(file_path) not in backup_paths:
+                        to_delete.append(file_path)
+        
+        return (to_write, to_delete)
+    
+    def _extract_to_staging(self, zip_path, members, staging_dir, tracker=None, cancel_token=None):
+        """
+        并行解压指定成员到暂存目录并校验每个成员的CRC
+        
+        Args:
+            zip_path: 备份zip文件路径
+            members: 需要解压的ZipInfo列表
+            staging_dir: 暂存目录路径
+            tracker: 可选的ProgressTracker
+            cancel_token: 可选的CancelToken
+        
+        Returns:
+            True if all members were extracted and verified, False otherwise
+        """
+        if not members:
+            return True
+        
+        # 每个线程使用独立的ZipFile句柄，按大小交错分组使各线程负载接近
+        worker_count = min(RESTORE_WORKERS, len(members))
+        members = sorted(members, key=lambda info: info.file_size, reverse=True)
+        batches = [members[i::worker_count] for i in range(worker_count)]
+        
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            futures = [executor.submit(self._extract_batch, zip_path, batch, staging_dir,
+                                       tracker, cancel_token)
+                       for batch in batches]
+            results = [future.result() for future in as_completed(futures)]
+        
+        return all(results)
+    
+    def _extract_batch(self, zip_path, members, staging_dir, tracker=None, cancel_token=None):
+        """解压一组zip成员（在工作线程中运行）"""
+        try:
             with zipfile.ZipFile(zip_path, 'r') as zipf:
-                for member in zipf.namelist():
-                    if member == 'dcsmINFO.txt':
-                        continue
+                for info in members:
+                    target = self._safe_member_path(staging_dir, info.filename)
+                    target_dir = os.path.dirname(target)
+                    if not os.path.exists(target_dir):
+                        os.makedirs(target_dir, exist_ok=True)
+                    
+                    crc = 0
+                    with zipf.open(info) as src, open(target, 'wb') as dst:
+                        while True:
+                            if cancel_token is not None and cancel_token.is_cancelled():
+                                return False
+                            chunk = src.read(COPY_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            crc = zlib.crc32(chunk, crc)
+                            dst.write(chunk)
+                            if tracker is not None:
+                                tracker.advance(len(chunk))
                     
-                    zipf.extract(member, storage_dir)
+                    if (crc & 0xffffffff) != info.CRC:
+                        return False
+            return True
+        except Exception:
+            return False
+    
+    def _get_pre_restore_dir(self):
+        """获取本次还原前备份的目录路径（位于备份目录下）"""
+        backup_dir = self.get_backup_dir()
+        if not os.path.exists(backup_dir):
+            os.makedirs(backup_dir)
+        
+        now = datetime.now()
+        name = f"{PRE_RESTORE_PREFIX}{now.strftime('%Y%m%d_%H%M%S')}"
+        pre_restore_dir = os.path.join(backup_dir, name)
+        suffix = 1
+        while os.path.exists(pre_restore_dir):
+            pre_restore_dir = os.path.join(backup_dir, f"{name}_{suffix}")
+            suffix += 1
+        return pre_restore_dir
+    
+    def _apply_restore_plan(self, to_write, to_delete, staging_dir, storage_dir, pre_restore_dir):
+        """
+        把暂存目录中的文件逐个重命名到_storage，并移走需要删除的文件
+        
+        被覆盖或删除的原文件会移动到pre_restore_dir；任何一步失败时回滚已做的改动。
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        moved_out = []  # (原路径, 还原前备份路径)
+        moved_in = []   # 已放入_storage的新文件路径
+        
+        def move_out(file_path):
+            saved = os.path.join(pre_restore_dir, os.path.relpath(file_path, storage_dir))
+            os.makedirs(os.path.dirname(saved), exist_ok=True)
+            os.replace(file_path, saved)
+            moved_out.append((file_path, saved))
+        
+        try:
+            for file_path in to_delete:
+                move_out(file_path)
+            
+            for info in to_write:
+                staged = self._safe_member_path(staging_dir, info.filename)
+                target = self._safe_member_path(storage_dir, info.filename)
+                if os.path.exists(target):
+                    move_out(target)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(staged, target)
+                moved_in.append(target)
             
             return True
             
-        except Exception:
+        except OSError:
+            for path in moved_in:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            for original, saved in reversed(moved_out):
+                try:
+                    os.replace(saved, original)
+                except OSError:
+                    pass
             return False
     
+    def _prune_pre_restore_dirs(self):
+        """只保留最近的若干个还原前备份目录"""
+        backup_dir = self.get_backup_dir()
+        if not backup_dir or not os.path.exists(backup_dir):
+            return
+        
+        try:
+            pre_restore_dirs = sorted(
+                name for name in os.listdir(backup_dir)
+                if name.startswith(PRE_RESTORE_PREFIX)
+                and os.path.isdir(os.path.join(backup_dir, name))
+            )
+        except OSError:
+            return
+        
+        for name in pre_restore_dirs[:-PRE_RESTORE_KEEP]:
+            shutil.rmtree(os.path.join(backup_dir, name), ignore_errors=True)
+    
+    def scan_auto_backups(self):
+        """
+        列出备份目录中的自动快照（时间戳取自文件名，不打开zip）
+        
+        Returns:
+            [(zip_path, timestamp), ...]
+        """
+        backup_dir = self.get_backup_dir()
+        if not backup_dir or not os.path.exists(backup_dir):
+            return []
+        
+        snapshots = []
+        try:
+            for filename in os.listdir(backup_dir):
+                if not filename.startswith(AUTO_BACKUP_PREFIX) or not filename.endswith('.zip'):
+                    continue
+                stamp = filename[len(AUTO_BACKUP_PREFIX):-len('.zip')]
+                try:
+                    timestamp = datetime.strptime(stamp, '%Y%m%d_%H%M%S')
+                except ValueError:
+                    continue
+                snapshots.append((os.path.join(backup_dir, filename), timestamp))
+        except OSError:
+            return []
+        
+        return snapshots
+    
+    def prune_auto_backups(self, keep_hourly=AUTO_BACKUP_KEEP_HOURLY,
+                           keep_daily=AUTO_BACKUP_KEEP_DAILY,
+                           keep_weekly=AUTO_BACKUP_KEEP_WEEKLY):
+        """
+        按祖父-父-子策略清理自动快照（手动备份不受影响）
+        
+        Returns:
+            (删除的快照数量, 释放的字节数)
+        """
+        snapshots = self.scan_auto_backups()
+        keep = select_auto_backups_to_keep(snapshots, keep_hourly, keep_daily, keep_weekly)
+        
+        removed_count = 0
+        freed_bytes = 0
+        for zip_path, _ in snapshots:
+            if zip_path in keep:
+                continue
+            try:
+                size = os.path.getsize(zip_path)
+                os.remove(zip_path)
+                removed_count += 1
+                freed_bytes += size
+            except OSError:
+                continue
+        
+        return (removed_count, freed_bytes)
+    
     def delete_backup(self, zip_path):
         """
         删除备份文件，如果备份目录为空则删除目录
@@ -377,3 +1128,256 @@ class BackupRestore:
         except Exception:
             return None
 
+
+
+def select_auto_backups_to_keep(snapshots, keep_hourly, keep_daily, keep_weekly):
+    """
+    祖父-父-子保留策略：最近keep_hourly个小时、keep_daily天、keep_weekly周内
+    各保留该时间段最新的一个快照，最新的快照总是保留
+    
+    Args:
+        snapshots: [(zip_path, timestamp), ...]
+    
+    Returns:
+        需要保留的zip_path集合
+    """
+    ordered = sorted(snapshots, key=lambda x: x[1], reverse=True)
+    keep = set()
+    if ordered:
+        keep.add(ordered[0][0])
+    
+    buckets = [
+        (keep_hourly, lambda t: (t.date(), t.hour)),
+        (keep_daily, lambda t: t.date()),
+        (keep_weekly, lambda t: t.isocalendar()[:2]),
+    ]
+    for bucket_count, bucket_key in buckets:
+        seen = set()
+        for zip_path, timestamp in ordered:
+            key = bucket_key(timestamp)
+            if key in seen:
+                continue
+            if len(seen) >= bucket_count:
+                break
+            seen.add(key)
+            keep.add(zip_path)
+    
+    return keep
+
+
+def _lower_current_thread_priority():
+    """
+    尽量降低当前线程的调度优先级（失败时忽略）
+
+    只在 Windows（SetThreadPriority）和 Linux（nice值按线程生效）上有效；
+    macOS/BSD 的线程ID不是进程ID，不能用 setpriority 按线程调整，这些平台上线程保持普通优先级
+    """
+    try:
+        system = platform.system()
+        if system == "Windows":
+            import ctypes
+            THREAD_PRIORITY_LOWEST = -2
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_LOWEST)
+        elif system == "Linux" and hasattr(threading, "get_native_id"):
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except Exception:
+        pass
+
+
+class AutoBackupScheduler:
+    """
+    存档变化触发的自动快照调度器
+    
+    连续的变化会被合并：每次快照之间至少间隔interval_minutes分钟，
+    快照在后台线程中创建（Windows/Linux上会降低该线程的优先级），完成后按保留策略批量清理旧快照。
+    """
+    
+    def __init__(self, backup_restore, interval_minutes=AUTO_BACKUP_DEFAULT_INTERVAL_MINUTES,
+                 on_snapshot=None):
+        """
+        Args:
+            backup_restore: BackupRestore实例
+            interval_minutes: 两次快照之间的最小间隔（分钟）
+            on_snapshot: 快照创建成功后的回调，接收create_backup的返回值（在后台线程中调用）
+        """
+        self.backup_restore = backup_restore
+        self.interval_seconds = max(1, interval_minutes) * 60
+        self.on_snapshot = on_snapshot
+        
+        self._condition = threading.Condition()
+        self._due_time = None  # 下一次快照的时间（time.monotonic），None表示没有待处理的快照
+        self._last_snapshot_time = None
+        self._running = False
+        self._thread = None
+    
+    def start(self):
+        """启动调度线程"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """停止调度线程（正在进行的快照会先完成）"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+    
+    def set_interval(self, interval_minutes):
+        """修改两次快照之间的最小间隔（分钟）"""
+        with self._condition:
+            self.interval_seconds = max(1, interval_minutes) * 60
+            self._condition.notify_all()
+    
+    def notify_change(self):
+        """通知存档发生变化（可在任意线程调用）"""
+        with self._condition:
+            if self._due_time is not None:
+                # 已有待处理的快照，本次变化会被合并进去
+                return
+            due_time = time.monotonic() + AUTO_BACKUP_DELAY_SECONDS
+            if self._last_snapshot_time is not None:
+                due_time = max(due_time, self._last_snapshot_time + self.interval_seconds)
+            self._due_time = due_time
+            self._condition.notify_all()
+    
+    def _run(self):
+        """调度循环（在后台线程中运行）"""
+        _lower_current_thread_priority()
+        while True:
+            with self._condition:
+                while self._running:
+                    if self._due_time is None:
+                        self._condition.wait()
+                        continue
+                    remaining = self._due_time - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(timeout=remaining)
+                if not self._running:
+                    return
+                self._due_time = None
+            
+            self._take_snapshot()
+    
+    def _take_snapshot(self):
+        """创建一个自动快照并清理旧快照"""
+        lock = self.backup_restore.operation_lock
+        if not lock.acquire(blocking=False):
+            # 其他备份/还原正在进行，稍后重试
+            with self._condition:
+                if self._due_time is None:
+                    self._due_time = time.monotonic() + AUTO_BACKUP_RETRY_SECONDS
+            return
+        
+        try:
+            result = self.backup_restore.create_backup(
+                self.backup_restore.storage_dir, prefix=AUTO_BACKUP_PREFIX
+            )
+            with self._condition:
+                self._last_snapshot_time = time.monotonic()
+            if result is not None:
+                self.backup_restore.prune_auto_backups()
+        except Exception as e:
+            print(f"自动备份异常: {e}")
+            result = None
+        finally:
+            lock.release()
+        
+        if result is not None and self.on_snapshot:
+            try:
+                self.on_snapshot(result)
+            except Exception:
+                pass
+
+
+def _lower_process_priority():
+    """进程池初始化：降低工作进程优先级（失败时忽略）"""
+    try:
+        if platform.system() == "Windows":
+            # os.nice 在 Windows 上不存在，改用 SetPriorityClass
+            import ctypes
+            BELOW_NORMAL_PRIORITY_CLASS = 0x00004000
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), BELOW_NORMAL_PRIORITY_CLASS)
+        elif hasattr(os, "nice"):
+            os.nice(10)
+    except Exception:
+        pass
+
+
+def repack_backup_lzma(zip_path):
+    """
+    把一个备份重新打包为ZIP_LZMA，校验通过后原子替换原文件（在工作进程中运行）
+    
+    Args:
+        zip_path: 备份zip文件路径
+    
+    Returns:
+        (是否成功, 原大小, 新大小, 错误信息)
+    """
+    temp_path = zip_path + ARCHIVE_TEMP_SUFFIX
+    try:
+        original_stat = os.stat(zip_path)
+        old_size = original_stat.st_size
+        
+        with zipfile.ZipFile(zip_path, 'r') as src_zip:
+            members = src_zip.infolist()
+            if members and all(info.compress_type == zipfile.ZIP_LZMA for info in members):
+                # 已经是LZMA格式，不重新打包，但仍逐个成员读取校验CRC（调用方会记为校验通过）
+                bad_member = src_zip.testzip()
+                if bad_member is not None:
+                    raise zipfile.BadZipFile(f"CRC check failed: {bad_member}")
+                return (True, old_size, old_size, "")
+            
+            with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_LZMA) as dst_zip:
+                for info in members:
+                    new_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                    new_info.external_attr = info.external_attr
+                    new_info.comment = info.comment
+                    if info.is_dir():
+                        dst_zip.writestr(new_info, b"")
+                        continue
+                    new_info.compress_type = zipfile.ZIP_LZMA
+                    new_info.file_size = info.file_size
+                    with src_zip.open(info) as src, \
+                            dst_zip.open(new_info, 'w', force_zip64=info.file_size > ZIP64_THRESHOLD) as dst:
+                        shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+        
+        # 替换前校验：成员列表、大小和CRC必须与原备份完全一致
+        with zipfile.ZipFile(zip_path, 'r') as src_zip, zipfile.ZipFile(temp_path, 'r') as new_zip:
+            expected = {info.filename: (info.file_size, info.CRC) for info in src_zip.infolist()}
+            actual = {}
+            for info in new_zip.infolist():
+                crc = 0
+                with new_zip.open(info) as f:
+                    while True:
+                        chunk = f.read(COPY_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        crc = zlib.crc32(chunk, crc)
+                actual[info.filename] = (info.file_size, crc & 0xffffffff)
+            if actual != expected:
+                raise zipfile.BadZipFile("verification failed")
+        
+        os.utime(temp_path, ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns))
+        os.replace(temp_path, zip_path)
+        return (True, old_size, os.path.getsize(zip_path), "")
+    
+    except Exception as e:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        try:
+            size = os.path.getsize(zip_path)
+        except OSError:
+            size = 0
+        return (False, size, size, str(e) or type(e).__name__)
@@ -0,0 +1,82 @@
+import bisect
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import tkinter as tk
+
+CARD_VIEWPORT_MARGIN = 200  # 可见区域上下额外绘制的范围（像素），滚动时不会看到空白
+
+
+class CardViewport:
+    """
+    Canvas上的虚拟化卡片列表：卡片的位置和高度预先计算好，
+    只绘制与可见区域（加上下边距）相交的卡片；滚出可见区域的卡片所用的
+    Canvas项目放回复用池，滚入的卡片直接复用这些项目，
+    因此Canvas上的项目数量只与可见卡片数有关，与列表长度无关
+    """
+
+    def __init__(self, canvas: tk.Canvas, layout: Sequence[Tuple[int, int]],
+                 create_slot: Callable[[], Any],
+                 bind_slot: Callable[[Any, int], None],
+                 hide_slot: Callable[[Any], None],
+                 margin: int = CARD_VIEWPORT_MARGIN):
+        """
+        Args:
+            canvas: 绘制卡片的Canvas（scrollregion由调用方设置）
+            layout: 每张卡片的 (y, 高度)，按y递增排列
+            create_slot: 创建一组卡片项目，返回槽对象
+            bind_slot: 把槽移动并填充为第 index 张卡片（同时负责显示）
+            hide_slot: 隐藏槽中的项目
+            margin: 可见区域上下额外绘制的范围
+        """
+        self.canvas = canvas
+        self.layout = list(layout)
+        self._tops = [y for y, _ in self.layout]
+        self._bottoms = [y + height for y, height in self.layout]
+        self.create_slot = create_slot
+        self.bind_slot = bind_slot
+        self.hide_slot = hide_slot
+        self.margin = margin
+        self._bound: Dict[int, Any] = {}  # 卡片下标 -> 正在显示该卡片的槽
+        self._free: List[Any] = []  # 已隐藏、可复用的槽
+        self._updating = False
+
+    def visible_range(self) -> Tuple[int, int]:
+        """计算与可见区域（含边距）相交的卡片下标范围 [start, end)"""
+        top = self.canvas.canvasy(0) - self.margin
+        bottom = self.canvas.canvasy(self.canvas.winfo_height()) + self.margin
+        # 第一张底边在 top 之下的卡片，到第一张顶边在 bottom 之下的卡片为止
+        start = bisect.bisect_right(self._bottoms, top)
+        end = bisect.bisect_left(self._tops, bottom)
+        return start, max(start, end)
+
+    def update(self, *args) -> None:
+        """根据当前滚动位置更新显示的卡片（可直接作为滚动/尺寸变化的回调）"""
+        if self._updating:
+            return
+        self._updating = True
+        try:
+            start, end = self.visible_range()
+
+            # 回收离开可见区域的卡片
+            for index in [index for index in self._bound if index < start or index >= end]:
+                slot = self._bound.pop(index)
+                self.hide_slot(slot)
+                self._free.append(slot)
+
+            # 绘制进入可见区域的卡片（优先复用池中的槽）
+            for index in range(start, end):
+                if index in self._bound:
+                    continue
+                slot = self._free.pop() if self._free else self.create_slot()
+                self.bind_slot(slot, index)
+                self._bound[index] = slot
+        except tk.TclError:
+            # 窗口已关闭
+            pass
+        finally:
+            self._updating = False
+
+    @property
+    def slot_count(self) -> int:
+        """已创建的槽数量（显示中 + 池中）"""
+        return len(self._bound) + len(self._free)
@@ -0,0 +1,349 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Iterable, List, Optional
+
+import tkinter as tk
+from tkinter import ttk
+
+from styles import get_cjk_font, Colors
+from utils import set_window_icon
+from save_diff import (OP_ADD, OP_REMOVE, OP_CHANGE, OP_TYPE, OP_LIST_APPEND,
+                       OP_LIST_REMOVE, OP_LIST_REORDER)
+
+# 变更历史数据库文件名（位于备份目录中，不写入_storage）
+HISTORY_FILENAME = "dcsm_history.db"
+HISTORY_MEMORY_LIMIT = 500  # 内存中保留的最近变更条数（环形缓冲区）
+HISTORY_MAX_ROWS = 200000  # 数据库最多保留的变更条数，超出时删除最旧的记录
+HISTORY_COMPACT_EVERY = 5000  # 每写入这么多条记录整理一次数据库
+HISTORY_VALUE_MAX_LENGTH = 2000  # 单个值序列化后的最大长度（超出截断）
+HISTORY_QUERY_LIMIT = 1000  # 查看器单次查询的最大条数
+
+# 各变更类型需要记录的值
+_OPS_WITH_OLD = {OP_REMOVE, OP_CHANGE, OP_TYPE, OP_LIST_REMOVE}
+_OPS_WITH_NEW = {OP_ADD, OP_CHANGE, OP_TYPE, OP_LIST_APPEND, OP_LIST_REORDER}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    path TEXT NOT NULL,
+    op TEXT NOT NULL,
+    old TEXT,
+    new TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_changes_path_ts ON changes (path, ts);
+CREATE INDEX IF NOT EXISTS idx_changes_session ON changes (session_id);
+"""
+
+
+class HistoryEntry:
+    """一条历史记录"""
+    __slots__ = ("ts", "session_id", "path", "op", "old", "new")
+
+    def __init__(self, ts: float, session_id: int, path: str, op: str,
+                 old: Optional[str], new: Optional[str]):
+        self.ts = ts
+        self.session_id = session_id
+        self.path = path
+        self.op = op
+        self.old = old  # JSON文本（可能被截断）
+        self.new = new
+
+    def format_change(self) -> str:
+        """格式化变化内容用于显示"""
+        if self.old is not None and self.new is not None:
+            return f"{self.old}→{self.new}"
+        if self.new is not None:
+            return f"+ {self.new}"
+        if self.old is not None:
+            return f"- {self.old}"
+        return self.op
+
+
+def _encode_value(value: Any) -> str:
+    """把值序列化为紧凑的JSON文本（过长时截断）"""
+    try:
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    except (TypeError, ValueError):
+        text = repr(value)
+    if len(text) > HISTORY_VALUE_MAX_LENGTH:
+        text = text[:HISTORY_VALUE_MAX_LENGTH] + "…"
+    return text
+
+
+class ChangeHistory:
+    """
+    存档变更历史：每次检测到的变化都追加写入SQLite数据库（按变量路径建立索引），
+    内存中只保留最近的有限条数
+
+    数据库在第一次写入时才创建（查询时只打开已存在的数据库），
+    没有任何变更时不会在备份目录中留下文件
+    """
+
+    def __init__(self, db_path: str, memory_limit: int = HISTORY_MEMORY_LIMIT):
+        """
+        Args:
+            db_path: 数据库文件路径
+            memory_limit: 内存环形缓冲区大小
+        """
+        self.db_path = db_path
+        self.recent = deque(maxlen=memory_limit)
+        self._lock = threading.Lock()
+        self._writes_since_compact = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._closed = False
+        self.session_id: Optional[int] = None  # 当前会话ID，会话在第一次写入时登记
+        self._session_started = time.time()
+
+    def begin_session(self) -> None:
+        """开始新的会话（每次启动监控时调用），之后的变更记录到新会话中"""
+        with self._lock:
+            self.session_id = None
+            self._session_started = time.time()
+            self.recent.clear()
+
+    def _connect(self, create: bool) -> bool:
+        """
+        按需打开数据库（调用方需持有锁）
+
+        Args:
+            create: 数据库不存在时是否创建
+
+        Returns:
+            连接是否可用
+        """
+        if self._conn is not None:
+            return True
+        if self._closed or (not create and not os.path.exists(self.db_path)):
+            return False
+        try:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            # 监控线程写入、界面线程查询，共用一个连接并用锁串行化
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.Error:
+                pass
+            conn.executescript(_SCHEMA)
+        except (sqlite3.Error, OSError) as e:
+            print(f"变更历史数据库打开失败: {e}")
+            return False
+        self._conn = conn
+        return True
+
+    def record(self, changes: Iterable[Any], timestamp: Optional[float] = None) -> int:
+        """
+        追加一批变更（同一事务写入）
+
+        Args:
+            changes: SaveChange 列表（需要 key/op/old/new 属性）
+            timestamp: 时间戳（默认当前时间）
+
+        Returns:
+            写入的条数，失败时返回0
+        """
+        ts = timestamp if timestamp is not None else time.time()
+        rows = []
+        for change in changes:
+            old = _encode_value(change.old) if change.op in _OPS_WITH_OLD else None
+            new = _encode_value(change.new) if change.op in _OPS_WITH_NEW else None
+            rows.append((ts, change.key, change.op, old, new))
+        if not rows:
+            return 0
+
+        with self._lock:
+            first_write = self._conn is None
+            if not self._connect(create=True):
+                return 0
+            try:
+                with self._conn:
+                    if self.session_id is None:
+                        cursor = self._conn.execute(
+                            "INSERT INTO sessions (started) VALUES (?)", (self._session_started,))
+                        self.session_id = cursor.lastrowid
+                    rows = [(self.session_id,) + row for row in rows]
+                    self._conn.executemany(
+                        "INSERT INTO changes (session_id, ts, path, op, old, new) VALUES (?, ?, ?, ?, ?, ?)",
+                        rows)
+            except sqlite3.Error as e:
+                print(f"写入变更历史失败: {e}")
+                return 0
+            for row in rows:
+                self.recent.append(HistoryEntry(row[1], row[0], row[2], row[3], row[4], row[5]))
+            self._writes_since_compact += len(rows)
+            need_compact = first_write or self._writes_since_compact >= HISTORY_COMPACT_EVERY
+
+        if need_compact:
+            self.compact()
+        return len(rows)
+
+    def query(self, path: Optional[str] = None, prefix: bool = False,
+              current_session: bool = False, since: Optional[float] = None,
+              limit: int = HISTORY_QUERY_LIMIT) -> List[HistoryEntry]:
+        """
+        查询历史记录（最新的在前）
+
+        Args:
+            path: 变量路径（如 "wholeTotalMP"），None表示全部
+            prefix: 是否把path作为前缀匹配（同时匹配其子路径）
+            current_session: 是否只查询本次会话
+            since: 只查询该时间戳之后的记录
+            limit: 最大条数
+
+        Returns:
+            HistoryEntry 列表，出错时返回空列表
+        """
+        conditions = []
+        params: List[Any] = []
+        if path:
+            if prefix:
+                # 用范围条件代替LIKE，可以使用 (path, ts) 索引
+                conditions.append("(path = ? OR (path >= ? AND path < ?))")
+                params.extend([path, path + ".", path + "/"])
+            else:
+                conditions.append("path = ?")
+                params.append(path)
+        if current_session:
+            if self.session_id is None:
+                return []
+            conditions.append("session_id = ?")
+            params.append(self.session_id)
+        if since is not None:
+            conditions.append("ts >= ?")
+            params.append(since)
+
+        sql = "SELECT ts, session_id, path, op, old, new FROM changes"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY ts DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            if not self._connect(create=False):
+                return []
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error:
+                return []
+        return [HistoryEntry(*row) for row in rows]
+
+    def compact(self) -> None:
+        """整理数据库：只保留最新的 HISTORY_MAX_ROWS 条记录，并删除没有记录的旧会话"""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._writes_since_compact = 0
+            try:
+                with self._conn:
+                    row = self._conn.execute(
+                        "SELECT id FROM changes ORDER BY id DESC LIMIT 1 OFFSET ?",
+                        (HISTORY_MAX_ROWS,)).fetchone()
+                    if row is not None:
+                        self._conn.execute("DELETE FROM changes WHERE id <= ?", (row[0],))
+                    self._conn.execute(
+                        "DELETE FROM sessions WHERE id IS NOT ? AND id NOT IN (SELECT DISTINCT session_id FROM changes)",
+                        (self.session_id,))
+            except sqlite3.Error as e:
+                print(f"整理变更历史失败: {e}")
+
+    def close(self) -> None:
+        """关闭数据库"""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error:
+                    pass
+                self._conn = None
+            self._closed = True
+
+
+class ChangeHistoryViewer:
+    """变更历史查看窗口"""
+
+    def __init__(self, root, history: ChangeHistory, t_func):
+        """
+        Args:
+            root: 根窗口
+            history: ChangeHistory 实例
+            t_func: 翻译函数
+        """
+        self.history = history
+        self.t = t_func
+
+        self.window = tk.Toplevel(root)
+        self.window.title(self.t("change_history_title"))
+        self.window.geometry("800x500")
+        set_window_icon(self.window)
+
+        # 查询条件
+        filter_frame = tk.Frame(self.window)
+        filter_frame.pack(fill="x", padx=10, pady=(10, 5))
+
+        tk.Label(filter_frame, text=self.t("change_history_path_label"),
+                 font=get_cjk_font(10)).pack(side="left")
+        self.path_var = tk.StringVar()
+        path_entry = tk.Entry(filter_frame, textvariable=self.path_var, font=get_cjk_font(10), width=30)
+        path_entry.pack(side="left", padx=5)
+        path_entry.bind("<Return>", lambda e: self.refresh())
+
+        self.prefix_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(filter_frame, text=self.t("change_history_include_children"),
+                        variable=self.prefix_var, command=self.refresh).pack(side="left", padx=5)
+
+        self.session_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(filter_frame, text=self.t("change_history_current_session"),
+                        variable=self.session_var, command=self.refresh).pack(side="left", padx=5)
+
+        ttk.Button(filter_frame, text=self.t("change_history_search"),
+                   command=self.refresh).pack(side="left", padx=5)
+
+        # 结果列表
+        list_frame = tk.Frame(self.window)
+        list_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        columns = ("time", "path", "change")
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+        self.tree.heading("time", text=self.t("change_history_col_time"))
+        self.tree.heading("path", text=self.t("change_history_col_path"))
+        self.tree.heading("change", text=self.t("change_history_col_change"))
+        self.tree.column("time", width=150, stretch=False)
+        self.tree.column("path", width=220)
+        self.tree.column("change", width=400)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        self.count_label = tk.Label(self.window, text="", font=get_cjk_font(9),
+                                    fg=Colors.TEXT_SECONDARY, anchor="w")
+        self.count_label.pack(fill="x", padx=10, pady=(0, 10))
+
+        path_entry.focus_set()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """按当前条件重新查询"""
+        path = self.path_var.get().strip() or None
+        entries = self.history.query(path=path, prefix=self.prefix_var.get(),
+                                     current_session=self.session_var.get())
+
+        self.tree.delete(*self.tree.get_children())
+        for entry in entries:
+            timestamp = datetime.fromtimestamp(entry.ts).strftime("%Y-%m-%d %H:%M:%S")
+            self.tree.insert("", "end", values=(timestamp, entry.path, entry.format_change()))
+        self.count_label.config(text=self.t("change_history_count", count=len(entries)))
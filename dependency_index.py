@@ -0,0 +1,63 @@
+from typing import Dict, Hashable, Iterable, Mapping, Set, Tuple, Union
+
+Path = Tuple[str, ...]
+
+
+def parse_path(path: Union[str, Path]) -> Path:
+    """把点分隔的键名（如 "judgeCounts.perfect"）转换为键路径元组"""
+    if isinstance(path, tuple):
+        return path
+    return tuple(path.split(".")) if path else ()
+
+
+class DependencyIndex:
+    """
+    存档键路径 → 依赖它的对象（如界面上的 widget_key）的索引
+
+    一个对象可以依赖多个路径；某个路径变化时，依赖该路径本身、
+    它的祖先路径（整个子树）或它的后代路径的对象都会受影响：
+    例如 ("memory", "name") 变化会影响依赖 "memory.name" 和 "memory" 的对象，
+    ("judgeCounts",) 整体被替换会影响依赖 "judgeCounts.perfect" 的对象
+    """
+
+    def __init__(self, dependencies: Mapping[Hashable, Iterable[Union[str, Path]]] = None):
+        """
+        Args:
+            dependencies: {对象: 依赖的路径列表}
+        """
+        self._exact: Dict[Path, Set[Hashable]] = {}  # 路径 → 直接依赖该路径的对象
+        self._below: Dict[Path, Set[Hashable]] = {}  # 路径 → 依赖其后代路径的对象
+        for target, paths in (dependencies or {}).items():
+            self.add(target, paths)
+
+    def add(self, target: Hashable, paths: Iterable[Union[str, Path]]) -> None:
+        """登记对象依赖的路径"""
+        for path in paths:
+            path = parse_path(path)
+            self._exact.setdefault(path, set()).add(target)
+            for depth in range(len(path)):
+                self._below.setdefault(path[:depth], set()).add(target)
+
+    def dependents(self, changed_paths: Iterable[Union[str, Path]]) -> Set[Hashable]:
+        """
+        计算受一组路径变化影响的对象
+
+        Args:
+            changed_paths: 变化的路径（点分隔字符串或元组，如 SaveChange.path）
+
+        Returns:
+            受影响的对象集合
+        """
+        result: Set[Hashable] = set()
+        for path in changed_paths:
+            path = parse_path(path)
+            # 依赖该路径本身或其祖先路径的对象
+            for depth in range(1, len(path) + 1):
+                targets = self._exact.get(path[:depth])
+                if targets:
+                    result |= targets
+            # 依赖其后代路径的对象
+            targets = self._below.get(path)
+            if targets:
+                result |= targets
+        return result
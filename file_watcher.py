@@ -0,0 +1,226 @@
+import os
+import sys
+import struct
+import select
+import threading
+from typing import Optional, Set
+
+# 轮询模式下的检查间隔（秒）
+POLL_INTERVAL = 0.3
+# inotify模式下的兜底检查间隔（秒）：即使没有事件也定期检查一次，防止漏掉事件
+INOTIFY_FALLBACK_INTERVAL = 5.0
+
+# inotify 常量（见 <sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_BUFFER_SIZE = 64 * 1024
+
+
+class PollingWatcher:
+    """
+    轮询监视器：每隔固定时间唤醒一次，由调用方自行检查文件状态
+
+    在不支持inotify的平台上使用（Windows、macOS等）
+    """
+
+    def __init__(self, directory: str, interval: float = POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self._wake_event = threading.Event()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """
+        等待下一次检查时机
+
+        Args:
+            timeout: 忽略（轮询间隔固定）
+
+        Returns:
+            None，表示不知道具体哪些文件变化，调用方应检查全部文件
+        """
+        self._wake_event.wait(self.interval)
+        self._wake_event.clear()
+        return None
+
+    def wake(self) -> None:
+        """唤醒正在等待的线程（用于停止监控）"""
+        self._wake_event.set()
+
+    def is_valid(self) -> bool:
+        """监视器是否仍然有效"""
+        return True
+
+    def close(self) -> None:
+        """释放资源"""
+        self.wake()
+
+
+class InotifyWatcher:
+    """
+    基于Linux inotify的目录监视器（通过ctypes调用libc，无额外依赖）
+
+    监视目录中的 CLOSE_WRITE/MOVED_TO 等事件，没有事件时线程一直睡眠，
+    有文件写入完成时毫秒级唤醒。
+    """
+
+    WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+                  | IN_DELETE_SELF | IN_MOVE_SELF)
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: 要监视的目录
+
+        Raises:
+            OSError: inotify不可用或无法监视该目录
+        """
+        import ctypes
+        import ctypes.util
+
+        self.directory = directory
+        self._valid = True
+        self._fd = -1
+        self._wake_r = -1
+        self._wake_w = -1
+
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd = fd
+
+        wd = libc.inotify_add_watch(fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            self._fd = -1
+            raise OSError(errno, os.strerror(errno), directory)
+
+        # 用于从其他线程唤醒select的管道
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+
+    def wait(self, timeout: Optional[float] = INOTIFY_FALLBACK_INTERVAL) -> Optional[Set[str]]:
+        """
+        等待目录中的文件事件
+
+        Args:
+            timeout: 最长等待时间（秒），超时后返回None让调用方做一次兜底检查
+
+        Returns:
+            发生变化的文件名集合；返回None表示超时、事件队列溢出或监视失效，
+            调用方应检查全部文件；空集合表示被wake()唤醒
+        """
+        if self._fd < 0:
+            return None
+
+        try:
+            readable, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        except (OSError, ValueError):
+            self._valid = False
+            return None
+
+        if self._wake_r in readable:
+            try:
+                while os.read(self._wake_r, 4096):
+                    pass
+            except (BlockingIOError, OSError):
+                pass
+
+        if self._fd not in readable:
+            return set() if readable else None
+
+        changed = set()
+        unknown = False
+        try:
+            while True:
+                try:
+                    data = os.read(self._fd, _READ_BUFFER_SIZE)
+                except BlockingIOError:
+                    break
+                if not data:
+                    break
+                offset = 0
+                while offset + _EVENT_HEADER.size <= len(data):
+                    _wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                    offset += _EVENT_HEADER.size
+                    name = data[offset:offset + name_len].rstrip(b"\0")
+                    offset += name_len
+
+                    if mask & IN_Q_OVERFLOW:
+                        unknown = True
+                    if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                        # 目录本身被删除或移动，监视已失效
+                        self._valid = False
+                        unknown = True
+                    if name:
+                        changed.add(os.fsdecode(name))
+        except OSError:
+            self._valid = False
+            unknown = True
+
+        return None if unknown else changed
+
+    def wake(self) -> None:
+        """唤醒正在等待的线程（用于停止监控）"""
+        if self._wake_w >= 0:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass
+
+    def is_valid(self) -> bool:
+        """监视是否仍然有效（目录被删除/移动后失效）"""
+        return self._valid
+
+    def close(self) -> None:
+        """释放inotify文件描述符和唤醒管道"""
+        self.wake()
+        self._valid = False
+        for attr in ("_fd", "_wake_r", "_wake_w"):
+            fd = getattr(self, attr)
+            if fd >= 0:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+                setattr(self, attr, -1)
+
+
+def create_watcher(directory: str):
+    """
+    为目录创建最合适的监视器：Linux上优先使用inotify，失败时回退到轮询
+
+    Args:
+        directory: 要监视的目录
+
+    Returns:
+        InotifyWatcher 或 PollingWatcher 实例
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except Exception as e:
+            print(f"inotify不可用，回退到轮询监控: {e}")
+    return PollingWatcher(directory)
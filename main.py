@@ -15,6 +15,7 @@ import zipfile
 import shutil
 import locale
 import threading
+import multiprocessing
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
@@ -27,8 +28,21 @@ from typing import Optional, Dict, List, Tuple, Any, Set, Union
 from translations import TRANSLATIONS
 from save_analyzer import SaveAnalyzer
 from utils import set_window_icon
-from backup_restore import BackupRestore
-from toast import Toast
+from file_watcher import create_watcher, PollingWatcher
+from change_history import ChangeHistory, ChangeHistoryViewer, HISTORY_FILENAME
+from storage_events import EventBus, StorageEvent, StorageScanner, event_for_file_change, EVENT_SAVE_CHANGED
+from monitor_stats import (MonitorStats, MonitorStatsViewer,
+                           COUNTER_POLLS, COUNTER_POLL_EVENTS, COUNTER_POLL_FULL, COUNTER_STAT_CHECKS,
+                           COUNTER_STAT_UNCHANGED, COUNTER_READS, COUNTER_READ_RETRIES, COUNTER_READ_FAILURES,
+                           COUNTER_SAME_CONTENT, COUNTER_PARSE_ERRORS, COUNTER_DIFFS, COUNTER_CHANGES,
+                           COUNTER_NOTIFICATIONS, COUNTER_WATCHER_FALLBACKS, COUNTER_ERRORS,
+                           HIST_WAIT, HIST_CHECK, HIST_QUIET_WAIT, HIST_READ, HIST_PARSE, HIST_HASH_TREE,
+                           HIST_DIFF, HIST_DETECT_LATENCY, HIST_NOTIFY_LATENCY)
+from save_diff import (SaveChange, IgnoreRules, diff_save_data, build_hash_tree, format_value,
+                       OP_CHANGE, OP_ADD, OP_REMOVE, OP_LIST_APPEND, OP_LIST_REMOVE)
+from backup_restore import (BackupRestore, AutoBackupScheduler, CancelToken,
+                            AUTO_BACKUP_PREFIX, AUTO_BACKUP_DEFAULT_INTERVAL_MINUTES)
+from toast import Toast, ToastManager
 from styles import get_cjk_font, get_parent_bg, init_styles, Colors, Debouncer
 from screenshot_manager import ScreenshotManager, ScreenshotManagerUI
 from others import OthersTab
@@ -37,6 +51,10 @@ from others import OthersTab
 PathType = Union[str, bytes, os.PathLike]
 JSONType = Union[Dict[str, Any], List[Any], str, int, float, bool, None]
 
+# 存档监控：游戏保存时会在短时间内多次写入存档，等文件状态静止这么久（秒）后再读取
+SAVE_QUIET_PERIOD = 0.25
+SAVE_BURST_MAX_WAIT = 2.0  # 持续写入时最多等待这么久（秒）就强制读取
+
 # From the sky bereft of stars
 
 if platform.system() == "Windows":
@@ -150,9 +168,20 @@ class SavTool:
         # 存档文件监控相关
         self.storage_dir: Optional[str] = None
         self.save_file_path: Optional[str] = None
-        self.temp_file_path: Optional[str] = None
         self.monitor_thread: Optional[threading.Thread] = None
         self.monitor_running: bool = False
+        self.file_watcher = None  # 监控线程当前使用的目录监视器（inotify或轮询）
+        self.storage_scanner: Optional[StorageScanner] = None  # _storage 中所有 .sav 文件的状态
+        self.event_bus = EventBus(self.root)  # 文件事件总线（存档/截图等变化）
+        self.monitor_stats = MonitorStats()  # 监控线程的运行统计（调试面板中查看）
+        # 监控基线（内存中）：上次读取的存档解析结果、内容哈希和文件状态 (size, mtime_ns, inode)
+        self._last_save_data: Optional[Any] = None
+        self._last_save_hash: Optional[str] = None
+        self._last_save_stat: Optional[Tuple[int, int, int]] = None
+        self._last_save_tree = None  # 基线的子树哈希树，比较时跳过未变化的子树
+        self._last_save_tree_rules: Optional[IgnoreRules] = None  # 构建基线哈希树时使用的忽略规则
+        self._ignore_rules_cache: Optional[Tuple[str, IgnoreRules]] = None  # (规则字符串, 编译结果)
+        self.change_history: Optional[ChangeHistory] = None  # 存档变更历史（SQLite，位于备份目录）
         self.active_toasts: List[Toast] = []
         self.variable_change_chains: Dict[str, Dict[str, Any]] = {}
         self.ab_initio_triggered: bool = False
@@ -160,6 +189,11 @@ class SavTool:
         # Toast功能控制
         self.toast_enabled: bool = True
         self.toast_ignore_record: str = "record, initialVars"
+        
+        # 自动备份（默认关闭）
+        self.auto_backup_enabled: bool = False
+        self.auto_backup_interval_minutes: int = AUTO_BACKUP_DEFAULT_INTERVAL_MINUTES
+        self.auto_backup_scheduler: Optional[AutoBackupScheduler] = None
     
     def _bind_events(self) -> None:
         """绑定事件"""
@@ -381,9 +415,14 @@ class SavTool:
         for widget in self.analyzer_frame.winfo_children():
             widget.destroy()
         
+        # 取消旧实例的事件订阅
+        if self.save_analyzer is not None:
+            self.save_analyzer.detach_event_bus()
+        
         # 创建新的存档分析界面
         self.save_analyzer = SaveAnalyzer(self.analyzer_frame, self.storage_dir, 
                                           self.translations, self.current_language)
+        self.save_analyzer.attach_event_bus(self.event_bus)
     
     def init_others_tab(self):
         """初始化其他功能标签页"""
@@ -421,6 +460,28 @@ class SavTool:
                                    command=self.create_backup)
         self.backup_button.pack(pady=10)
         
+        # 自动备份设置
+        auto_backup_frame = tk.Frame(backup_frame, bg=Colors.WHITE)
+        auto_backup_frame.pack(pady=5)
+        
+        self.auto_backup_var = tk.BooleanVar(value=self.auto_backup_enabled)
+        self.auto_backup_checkbox = ttk.Checkbutton(auto_backup_frame, text=self.t("auto_backup_enable"),
+                                                    variable=self.auto_backup_var,
+                                                    command=self._on_auto_backup_toggle)
+        self.auto_backup_checkbox.pack(side="left", padx=5)
+        
+        self.auto_backup_interval_label = tk.Label(auto_backup_frame, text=self.t("auto_backup_interval"),
+                                                   bg=Colors.WHITE, fg="#666")
+        self.auto_backup_interval_label.pack(side="left", padx=(10, 2))
+        
+        self.auto_backup_interval_var = tk.StringVar(value=str(self.auto_backup_interval_minutes))
+        auto_backup_interval_spinbox = ttk.Spinbox(auto_backup_frame, from_=1, to=1440, width=5,
+                                                   textvariable=self.auto_backup_interval_var,
+                                                   command=self._on_auto_backup_interval_change)
+        auto_backup_interval_spinbox.pack(side="left")
+        auto_backup_interval_spinbox.bind("<FocusOut>", lambda e: self._on_auto_backup_interval_change())
+        auto_backup_interval_spinbox.bind("<Return>", lambda e: self._on_auto_backup_interval_change())
+        
         # 进度条（初始隐藏）
         self.backup_progress = ttk.Progressbar(backup_frame, mode='determinate', length=300)
         self.backup_progress.pack(pady=5)
@@ -431,6 +492,13 @@ class SavTool:
         self.backup_progress_label.pack(pady=2)
         self.backup_progress_label.pack_forget()
         
+        # 取消按钮（初始隐藏，备份/还原进行中显示）
+        self.cancel_operation_button = ttk.Button(backup_frame, text=self.t("cancel_operation"),
+                                                  command=self._cancel_backup_operation)
+        self.cancel_operation_button.pack(pady=2)
+        self.cancel_operation_button.pack_forget()
+        self._operation_cancel_token: Optional[CancelToken] = None
+        
         # 下方：还原列表区域
         restore_frame = tk.Frame(self.backup_restore_frame, bg=Colors.WHITE)
         restore_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -447,6 +515,10 @@ class SavTool:
                                     command=self.refresh_backup_list)
         self.backup_refresh_button.pack(side="right", padx=5)
         
+        self.verify_backups_button = ttk.Button(restore_header, text=self.t("verify_backups_button"),
+                                                command=self.verify_all_backups)
+        self.verify_backups_button.pack(side="right", padx=5)
+        
         # 创建Treeview显示备份列表
         list_container = tk.Frame(restore_frame, bg=Colors.WHITE)
         list_container.pack(fill="both", expand=True)
@@ -499,17 +571,67 @@ class SavTool:
         self.rename_backup_button.pack(side="left", padx=5)
         self.rename_backup_button.pack_forget()
         
+        # 对比按钮（初始隐藏）：选中一个备份时与当前存档对比，选中两个时对比这两个备份
+        self.compare_backup_button = ttk.Button(button_area, text=self.t("compare_backup_button"),
+                                                command=self.compare_backups)
+        self.compare_backup_button.pack(side="left", padx=5)
+        self.compare_backup_button.pack_forget()
+        
+        # 归档按钮（初始隐藏）：把选中的备份重新打包为LZMA以节省空间
+        self.archive_backup_button = ttk.Button(button_area, text=self.t("archive_backup_button"),
+                                                command=self.archive_selected_backups)
+        self.archive_backup_button.pack(side="left", padx=5)
+        self.archive_backup_button.pack_forget()
+        
         # 存储选中的备份路径
         self.selected_backup_path = None
         
         # 刷新备份列表
         self.refresh_backup_list()
+        
+        # 目录变化后按新的BackupRestore重建自动备份调度器
+        self._update_auto_backup_scheduler()
+    
+    def _update_auto_backup_scheduler(self):
+        """根据当前设置启动或停止自动备份调度器"""
+        if self.auto_backup_scheduler is not None:
+            self.auto_backup_scheduler.stop()
+            self.auto_backup_scheduler = None
+        
+        if self.auto_backup_enabled and self.backup_restore is not None:
+            self.auto_backup_scheduler = AutoBackupScheduler(
+                self.backup_restore,
+                interval_minutes=self.auto_backup_interval_minutes,
+                on_snapshot=lambda result: self.root.after(0, self.refresh_backup_list)
+            )
+            self.auto_backup_scheduler.start()
+    
+    def _on_auto_backup_toggle(self):
+        """自动备份开关回调"""
+        self.auto_backup_enabled = self.auto_backup_var.get()
+        self._update_auto_backup_scheduler()
+    
+    def _on_auto_backup_interval_change(self):
+        """自动备份间隔变化回调"""
+        try:
+            minutes = int(self.auto_backup_interval_var.get())
+        except (ValueError, tk.TclError):
+            self.auto_backup_interval_var.set(str(self.auto_backup_interval_minutes))
+            return
+        
+        minutes = max(1, minutes)
+        self.auto_backup_interval_minutes = minutes
+        self.auto_backup_interval_var.set(str(minutes))
+        if self.auto_backup_scheduler is not None:
+            self.auto_backup_scheduler.set_interval(minutes)
     
     def create_backup(self):
         """创建备份"""
         if not self.storage_dir or not self.backup_restore:
             messagebox.showerror(self.t("error"), self.t("select_dir_hint"))
             return
+        if self._operation_cancel_token is not None:
+            return
         
         # 估算压缩后大小
         estimated_size = self.backup_restore.estimate_compressed_size(self.storage_dir)
@@ -531,38 +653,118 @@ class SavTool:
             return
         
         # 显示进度条
-        self.backup_progress.pack(pady=5)
-        self.backup_progress_label.pack(pady=2)
-        self.backup_progress['value'] = 0
-        self.backup_progress_label.config(text="0%")
-        self.root.update()
-        
-        # 定义进度回调函数
-        def progress_callback(current, total):
-            progress = int((current / total) * 100)
-            self.root.after(0, lambda: self._update_backup_progress(progress, current, total))
+        cancel_token = self._begin_backup_operation()
+        if cancel_token is None:
+            return
         
         # 在后台线程中执行备份
         def backup_thread():
             try:
-                result = self.backup_restore.create_backup(self.storage_dir, progress_callback)
-                self.root.after(0, lambda: self._backup_completed(result))
+                skipped_files = []
+                with self.backup_restore.operation_lock:
+                    result = self.backup_restore.create_backup(
+                        self.storage_dir, self._make_progress_callback(), cancel_token=cancel_token,
+                        skipped_files=skipped_files
+                    )
+                self.root.after(0, lambda: self._backup_completed(result, skipped_files))
             except Exception as e:
                 self.root.after(0, lambda: self._backup_completed(None))
         
         threading.Thread(target=backup_thread, daemon=True).start()
     
-    def _update_backup_progress(self, progress, current, total):
-        """更新备份进度条"""
-        self.backup_progress['value'] = progress
-        self.backup_progress_label.config(text=f"{progress}% ({current}/{total})")
-        self.root.update()
+    def _backup_operation_buttons(self):
+        """会启动备份类操作或修改备份文件的按钮（同一时间只允许一个操作）"""
+        return (self.backup_button, self.restore_button, self.verify_backups_button,
+                self.archive_backup_button, self.compare_backup_button,
+                self.delete_backup_button, self.rename_backup_button)
     
-    def _backup_completed(self, result):
-        """备份完成回调"""
-        # 隐藏进度条
+    def _begin_backup_operation(self) -> Optional[CancelToken]:
+        """
+        显示进度条和取消按钮，返回本次操作的取消标记
+        
+        进度条和取消标记只有一份，已有操作在进行时不能开始新的操作
+        
+        Returns:
+            取消标记，已有操作在进行时返回None
+        """
+        if self._operation_cancel_token is not None:
+            return None
+        self._operation_cancel_token = CancelToken()
+        
+        for button in self._backup_operation_buttons():
+            button.config(state="disabled")
+        self.backup_progress.pack(pady=5)
+        self.backup_progress_label.pack(pady=2)
+        self.cancel_operation_button.pack(pady=2)
+        self.cancel_operation_button.config(state="normal")
+        self.backup_progress['value'] = 0
+        self.backup_progress_label.config(text="0%")
+        
+        return self._operation_cancel_token
+    
+    def _end_backup_operation(self) -> bool:
+        """隐藏进度条和取消按钮，返回本次操作是否被取消"""
+        cancelled = (self._operation_cancel_token is not None and
+                     self._operation_cancel_token.is_cancelled())
+        self._operation_cancel_token = None
+        
         self.backup_progress.pack_forget()
         self.backup_progress_label.pack_forget()
+        self.cancel_operation_button.pack_forget()
+        for button in self._backup_operation_buttons():
+            button.config(state="normal")
+        
+        return cancelled
+    
+    def _cancel_backup_operation(self):
+        """取消正在进行的备份/还原"""
+        if self._operation_cancel_token is not None:
+            self._operation_cancel_token.cancel()
+            self.cancel_operation_button.config(state="disabled")
+    
+    def _make_progress_callback(self):
+        """创建按字节汇报的进度回调（已在BackupRestore中节流，这里只转发到主线程）"""
+        def progress_callback(done, total, rate, eta):
+            self.root.after(0, lambda: self._update_backup_progress(done, total, rate, eta))
+        return progress_callback
+    
+    def _update_backup_progress(self, done, total, rate, eta):
+        """更新备份/还原进度条"""
+        if self._operation_cancel_token is None:
+            return
+        
+        progress = int(done * 100 / total) if total > 0 else 100
+        if eta is None:
+            eta_str = "--:--"
+        else:
+            eta_seconds = int(eta + 0.5)
+            eta_str = f"{eta_seconds // 60}:{eta_seconds % 60:02d}"
+        
+        format_size = self.backup_restore.format_size
+        self.backup_progress['value'] = progress
+        self.backup_progress_label.config(text=self.t(
+            "operation_progress_detail",
+            percent=progress,
+            done=format_size(done),
+            total=format_size(total),
+            speed=format_size(int(rate)),
+            eta=eta_str
+        ))
+    
+    def _backup_completed(self, result, skipped_files=()):
+        """
+        备份完成回调
+        
+        Args:
+            result: create_backup的返回值
+            skipped_files: 无法读取而未写入备份的文件（相对路径）
+        """
+        # 隐藏进度条
+        cancelled = self._end_backup_operation()
+        
+        if cancelled:
+            messagebox.showinfo(self.t("info"), self.t("backup_cancelled"))
+            return
         
         if result is None:
             messagebox.showerror(self.t("error"), self.t("backup_failed"))
@@ -579,6 +781,10 @@ class SavTool:
                             filename=filename, 
                             size=actual_size_str, 
                             path=abs_path)
+        if skipped_files:
+            success_msg += "\n\n" + self.t("backup_skipped_files",
+                                           count=len(skipped_files),
+                                           files="\n".join(skipped_files[:10]))
         messagebox.showinfo(self.t("backup_success_title"), success_msg)
         
         # 刷新备份列表
@@ -611,15 +817,119 @@ class SavTool:
             else:
                 timestamp_str = ""
             
-            if has_info:
-                status = ""
-            else:
-                status = self.t("no_info_file")
+            status_parts = []
+            if not has_info:
+                status_parts.append(self.t("no_info_file"))
+            elif filename.startswith(AUTO_BACKUP_PREFIX):
+                status_parts.append(self.t("auto_backup_status"))
+            
+            verification = self.backup_restore.get_verification(zip_path)
+            if verification is not None:
+                if verification.get("ok"):
+                    status_parts.append(self.t("verify_status_ok"))
+                else:
+                    status_parts.append(self.t("verify_status_failed"))
+                if verification.get("archived"):
+                    status_parts.append(self.t("archive_status"))
+            status = ", ".join(status_parts)
             
             self.backup_tree.insert("", tk.END, 
                                    values=(timestamp_str, filename, size_str, status),
                                    tags=(zip_path,))
     
+    def verify_all_backups(self):
+        """在后台校验所有备份的完整性"""
+        if not self.backup_restore or self._operation_cancel_token is not None:
+            return
+        
+        backup_dir = self.backup_restore.get_backup_dir()
+        if not backup_dir:
+            return
+        zip_paths = [backup[0] for backup in self.backup_restore.scan_backups(backup_dir)]
+        if not zip_paths:
+            return
+        
+        cancel_token = self._begin_backup_operation()
+        if cancel_token is None:
+            return
+        
+        def verify_thread():
+            try:
+                results = self.backup_restore.verify_backups(
+                    zip_paths, self._make_progress_callback(), cancel_token
+                )
+            except Exception:
+                results = {}
+            self.root.after(0, lambda: self._verify_completed(results))
+        
+        threading.Thread(target=verify_thread, daemon=True).start()
+    
+    def _verify_completed(self, results):
+        """备份校验完成回调"""
+        cancelled = self._end_backup_operation()
+        self.refresh_backup_list()
+        
+        if cancelled:
+            return
+        
+        failed = [(os.path.basename(path), error) for path, (ok, error) in results.items() if not ok]
+        if failed:
+            details = "\n".join(f"{name}: {error}" for name, error in sorted(failed))
+            messagebox.showwarning(self.t("warning"),
+                                   self.t("verify_backups_failed", count=len(failed), details=details))
+        else:
+            messagebox.showinfo(self.t("success"), self.t("verify_backups_ok", count=len(results)))
+    
+    def archive_selected_backups(self):
+        """把选中的备份在后台重新打包为LZMA格式"""
+        if not self.backup_restore or self._operation_cancel_token is not None:
+            return
+        
+        zip_paths = []
+        for item in self.backup_tree.selection():
+            tags = self.backup_tree.item(item, "tags")
+            if tags:
+                zip_paths.append(tags[0])
+        if not zip_paths:
+            return
+        
+        if not self.ask_yesno(self.t("archive_confirm_title"),
+                              self.t("archive_confirm_text", count=len(zip_paths))):
+            return
+        
+        cancel_token = self._begin_backup_operation()
+        if cancel_token is None:
+            return
+        
+        def archive_thread():
+            try:
+                with self.backup_restore.operation_lock:
+                    results = self.backup_restore.archive_backups(
+                        zip_paths, self._make_progress_callback(), cancel_token
+                    )
+            except Exception:
+                results = {}
+            self.root.after(0, lambda: self._archive_completed(results))
+        
+        threading.Thread(target=archive_thread, daemon=True).start()
+    
+    def _archive_completed(self, results):
+        """LZMA归档完成回调"""
+        self._end_backup_operation()
+        self.refresh_backup_list()
+        
+        archived = [result for result in results.values() if result[0]]
+        failed = [(os.path.basename(path), result[3]) for path, result in results.items() if not result[0]]
+        saved_bytes = sum(old_size - new_size for _, old_size, new_size, _ in archived)
+        
+        message = self.t("archive_result", count=len(archived),
+                         size=self.backup_restore.format_size(max(0, saved_bytes)))
+        if failed:
+            details = "\n".join(f"{name}: {error}" for name, error in sorted(failed))
+            messagebox.showwarning(self.t("warning"), f"{message}\n\n{details}")
+        else:
+            messagebox.showinfo(self.t("success"), message)
+    
     def on_backup_select(self, event):
         """处理备份列表选择事件"""
         selected = self.backup_tree.selection()
@@ -631,18 +941,23 @@ class SavTool:
                 self.restore_button.pack(side="left", padx=5)
                 self.delete_backup_button.pack(side="left", padx=5)
                 self.rename_backup_button.pack(side="left", padx=5)
+                self.compare_backup_button.pack(side="left", padx=5)
+                self.archive_backup_button.pack(side="left", padx=5)
         else:
             self.selected_backup_path = None
             self.restore_button.pack_forget()
             self.delete_backup_button.pack_forget()
             self.rename_backup_button.pack_forget()
+            self.compare_backup_button.pack_forget()
+            self.archive_backup_button.pack_forget()
     
     def delete_backup(self):
         """删除备份"""
         if not self.selected_backup_path:
             return
         
-        if not self.backup_restore:
+        # 备份类操作进行中时不处理
+        if not self.backup_restore or self._operation_cancel_token is not None:
             return
         
         # 确认删除
@@ -666,6 +981,8 @@ class SavTool:
             self.restore_button.pack_forget()
             self.delete_backup_button.pack_forget()
             self.rename_backup_button.pack_forget()
+            self.compare_backup_button.pack_forget()
+            self.archive_backup_button.pack_forget()
             # 刷新备份列表
             self.refresh_backup_list()
         else:
@@ -676,7 +993,8 @@ class SavTool:
         if not self.selected_backup_path:
             return
         
-        if not self.backup_restore:
+        # 备份类操作进行中时不处理
+        if not self.backup_restore or self._operation_cancel_token is not None:
             return
         
         # 获取当前文件名（不含扩展名）
@@ -762,12 +1080,121 @@ class SavTool:
         else:
             messagebox.showerror(self.t("error"), self.t("rename_backup_failed"))
     
+    def compare_backups(self):
+        """对比存档差异：选中两个备份时对比两者，选中一个时与当前_storage对比"""
+        if not self.backup_restore or self._operation_cancel_token is not None:
+            return
+        
+        selected = [item for item in self.backup_tree.selection()
+                    if self.backup_tree.item(item, "tags")]
+        if not selected:
+            return
+        
+        # 列表按时间倒序排列，索引越大越旧
+        selected.sort(key=self.backup_tree.index, reverse=True)
+        old_path = self.backup_tree.item(selected[0], "tags")[0]
+        if len(selected) >= 2:
+            new_path = self.backup_tree.item(selected[-1], "tags")[0]
+            new_name = os.path.basename(new_path)
+        else:
+            new_path = None
+            new_name = self.t("compare_live_label")
+        old_name = os.path.basename(old_path)
+        
+        window, text_widget = self._create_backup_diff_window(old_name, new_name)
+        
+        def diff_thread():
+            old_saves = self.backup_restore.read_backup_saves(old_path)
+            if new_path is not None:
+                new_saves = self.backup_restore.read_backup_saves(new_path)
+            else:
+                new_saves = self.backup_restore.read_live_saves(self.storage_dir)
+            
+            sections = []
+            for name in (old_saves or new_saves or {}):
+                old_data = old_saves.get(name) if old_saves else None
+                new_data = new_saves.get(name) if new_saves else None
+                if old_data is None or new_data is None:
+                    sections.append((name, None))
+                else:
+                    sections.append((name, self._deep_compare_data(old_data, new_data,
+                                                                   use_ignore_list=False,
+                                                                   detect_reorder=True)))
+            self.root.after(0, lambda: self._fill_backup_diff_window(window, text_widget, sections))
+        
+        threading.Thread(target=diff_thread, daemon=True).start()
+    
+    def _create_backup_diff_window(self, old_name, new_name):
+        """创建存档差异窗口，返回 (窗口, 文本组件)"""
+        window = Toplevel(self.root)
+        window.title(self.t("compare_backup_title"))
+        window.geometry("700x500")
+        set_window_icon(window)
+        
+        header = tk.Label(window, text=f"{old_name}  →  {new_name}",
+                          font=get_cjk_font(10, "bold"), anchor="w")
+        header.pack(fill="x", padx=10, pady=(10, 5))
+        
+        text_frame = tk.Frame(window)
+        text_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        
+        scrollbar = Scrollbar(text_frame, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        
+        text_widget = tk.Text(text_frame, font=get_cjk_font(9), wrap="none",
+                              yscrollcommand=scrollbar.set)
+        text_widget.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=text_widget.yview)
+        
+        text_widget.tag_configure("file", font=get_cjk_font(10, "bold"), foreground=Colors.ACCENT_PINK)
+        text_widget.tag_configure("green", foreground="#16a34a")
+        text_widget.tag_configure("red", foreground="#dc2626")
+        text_widget.tag_configure("hint", foreground=Colors.TEXT_SECONDARY)
+        
+        text_widget.insert("end", self.t("compare_loading"), "hint")
+        text_widget.config(state="disabled")
+        return window, text_widget
+    
+    def _fill_backup_diff_window(self, window, text_widget, sections):
+        """把差异结果写入差异窗口"""
+        if not window.winfo_exists():
+            return
+        
+        max_line_length = 500
+        text_widget.config(state="normal")
+        text_widget.delete("1.0", "end")
+        
+        for name, changes in sections:
+            text_widget.insert("end", f"{name}\n", "file")
+            if changes is None:
+                text_widget.insert("end", self.t("compare_file_unavailable") + "\n\n", "hint")
+                continue
+            if not changes:
+                text_widget.insert("end", self.t("compare_no_changes") + "\n\n", "hint")
+                continue
+            
+            for change in sorted(changes, key=lambda c: (c.path, c.op)):
+                line = change.format()
+                if len(line) > max_line_length:
+                    line = line[:max_line_length] + "…"
+                if change.op in (OP_ADD, OP_LIST_APPEND):
+                    tag = "green"
+                elif change.op in (OP_REMOVE, OP_LIST_REMOVE):
+                    tag = "red"
+                else:
+                    tag = ()
+                text_widget.insert("end", line + "\n", tag)
+            text_widget.insert("end", "\n")
+        
+        text_widget.config(state="disabled")
+    
     def restore_backup(self):
         """还原备份"""
         if not self.selected_backup_path:
             return
         
-        if not self.backup_restore:
+        # 备份类操作进行中时不处理
+        if not self.backup_restore or self._operation_cancel_token is not None:
             return
         
         # 第一次确认
@@ -795,16 +1222,41 @@ class SavTool:
             if not result:
                 return
         
-        # 执行还原
-        success = self.backup_restore.restore_backup(self.selected_backup_path, self.storage_dir)
+        # 执行还原（还原期间_storage中的文件会被替换，先暂停文件监控避免误判为目录消失）
+        cancel_token = self._begin_backup_operation()
+        if cancel_token is None:
+            return
+        self._stop_file_monitor()
+        zip_path = self.selected_backup_path
+        
+        def restore_thread():
+            try:
+                with self.backup_restore.operation_lock:
+                    success = self.backup_restore.restore_backup(
+                        zip_path, self.storage_dir,
+                        self._make_progress_callback(), cancel_token
+                    )
+            except Exception:
+                success = False
+            self.root.after(0, lambda: self._restore_completed(success))
+        
+        threading.Thread(target=restore_thread, daemon=True).start()
+    
+    def _restore_completed(self, success):
+        """还原完成回调"""
+        cancelled = self._end_backup_operation()
+        self._start_file_monitor()
         
         if success:
             messagebox.showinfo(self.t("success"), self.t("restore_success"))
             # 刷新其他tab的数据
             if self.storage_dir:
-                self.load_screenshots()
+                if self.screenshot_manager_ui is not None:
+                    self.screenshot_manager_ui.load_screenshots(silent=True)
                 if self.save_analyzer:
                     self.save_analyzer.refresh()
+        elif cancelled:
+            messagebox.showinfo(self.t("info"), self.t("restore_cancelled"))
         else:
             messagebox.showerror(self.t("error"), self.t("restore_failed"))
     
@@ -833,57 +1285,233 @@ class SavTool:
         # 停止之前的监控（如果存在）
         self._stop_file_monitor()
         
-        # 设置存档文件路径和临时文件路径
+        # 设置存档文件路径
         self.save_file_path = os.path.join(self.storage_dir, 'DevilConnection_sf.sav')
-        self.temp_file_path = os.path.join(self.storage_dir, '.temp_sf.sav')
         
-        # 清理可能存在的旧临时文件（防止上次异常退出遗留）
-        self._cleanup_temp_file()
+        # 旧版本会在_storage中留下.temp_sf.sav，清理掉
+        self._remove_legacy_temp_file()
+        
+        # 重置内存基线
+        self._last_save_data = None
+        self._last_save_hash = None
+        self._last_save_stat = None
+        self._last_save_tree = None
+        
+        # 初始化内存基线：优先使用仍然有效的检查点，否则读取当前存档
+        self._initialize_save_baseline()
+        
+        # 打开变更历史数据库，本次监控的变更记录到新的会话中
+        self._open_change_history()
+        if self.change_history is not None:
+            self.change_history.begin_session()
+        
+        # 记录 _storage 中其他 .sav 文件的当前状态（之后的变化作为事件发布）
+        self.storage_scanner = StorageScanner(self.storage_dir)
+        self.storage_scanner.reset()
         
-        # 初始化临时文件：如果不存在或已存在，都尝试写入当前存档内容
-        self._initialize_temp_file()
+        # 预先创建toast窗口池，检测到变化时直接复用窗口
+        if self.toast_enabled:
+            ToastManager.get(self.root).prewarm()
+        
+        # 创建目录监视器（在启动线程前创建，保证停止时总能唤醒监控线程）
+        self.file_watcher = create_watcher(self.storage_dir)
+        self.monitor_stats.set_gauge("watcher", type(self.file_watcher).__name__)
         
         # 启动监控线程
         self.monitor_running = True
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
     
-    def _initialize_temp_file(self):
-        """初始化临时文件：读取当前存档并写入临时文件"""
+    def _initialize_save_baseline(self):
+        """初始化监控基线：读取并解析当前存档，保存在内存中"""
         try:
             # 检查路径有效性
             if not self.save_file_path or not isinstance(self.save_file_path, str):
                 return
             
             if not os.path.exists(self.save_file_path):
-                # 如果存档文件不存在，删除临时文件（如果存在）
-                if self.temp_file_path and isinstance(self.temp_file_path, str) and os.path.exists(self.temp_file_path):
-                    try:
-                        os.remove(self.temp_file_path)
-                    except Exception:
-                        pass
                 return
             
-            # 尝试读取当前存档文件（可能需要重试）
+            # 存档文件状态与检查点一致时直接使用检查点，省去读取和解析
+            if self._load_monitor_checkpoint():
+                return
+            
+            # 尝试读取当前存档文件（可能需要重试），先取文件状态再读取，
+            # 这样读取期间发生的写入会在下一次检查时被发现
             save_content = None
+            save_stat = None
             for retry in range(5):
+                save_stat = self._stat_save_file()
                 save_content = self._read_file_raw(self.save_file_path)
                 if save_content is not None:
                     break
                 time.sleep(0.2)
             
-            # 如果成功读取，写入临时文件
+            # 如果成功读取，记录内存基线
             if save_content is not None:
-                self._write_temp_file(save_content)
+                self._set_save_baseline(self._parse_save_content(save_content),
+                                        self._get_file_content_hash(save_content), save_stat)
         except Exception as e:
             # 捕获初始化过程中的异常
             try:
                 import traceback
-                print(f"临时文件初始化异常: {e}")
+                print(f"监控基线初始化异常: {e}")
                 print(traceback.format_exc())
             except:
                 pass
     
+    def _open_change_history(self) -> None:
+        """
+        打开当前存档目录对应的变更历史（路径未变时沿用）
+        
+        数据库文件在第一次记录变更时才创建
+        """
+        backup_dir = self.backup_restore.get_backup_dir() if self.backup_restore else None
+        db_path = os.path.join(backup_dir, HISTORY_FILENAME) if backup_dir else None
+        
+        history = self.change_history
+        if history is not None and history.db_path == db_path:
+            return
+        
+        self._close_change_history()
+        if not db_path:
+            return
+        self.change_history = ChangeHistory(db_path)
+    
+    def _close_change_history(self) -> None:
+        """关闭变更历史数据库"""
+        if self.change_history is not None:
+            self.change_history.close()
+            self.change_history = None
+    
+    def show_change_history(self) -> None:
+        """打开变更历史查看窗口"""
+        if self.change_history is None:
+            messagebox.showinfo(self.t("info"), self.t("change_history_unavailable"))
+            return
+        ChangeHistoryViewer(self.root, self.change_history, self.t)
+    
+    def show_monitor_stats(self) -> None:
+        """打开监控统计调试面板"""
+        MonitorStatsViewer(self.root, self.monitor_stats, self.t)
+    
+    def _remove_legacy_temp_file(self) -> None:
+        """删除旧版本留在_storage中的.temp_sf.sav"""
+        try:
+            legacy_path = os.path.join(self.storage_dir, '.temp_sf.sav')
+            if os.path.isfile(legacy_path):
+                os.remove(legacy_path)
+        except Exception:
+            pass
+    
+    def _get_monitor_checkpoint_path(self) -> Optional[str]:
+        """
+        获取监控检查点文件路径（位于系统临时目录，不写入游戏的_storage文件夹）
+        
+        Returns:
+            检查点路径，未设置存档目录时返回None
+        """
+        if not self.storage_dir:
+            return None
+        key = hashlib.md5(os.path.abspath(self.storage_dir).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(tempfile.gettempdir(), 'dcsm_monitor', f'{key}.json.gz')
+    
+    def _save_monitor_checkpoint(self) -> bool:
+        """
+        把内存基线写成紧凑的检查点（只在停止监控时写一次，不会每次变化都写）
+        
+        Returns:
+            是否写入成功
+        """
+        checkpoint_path = self._get_monitor_checkpoint_path()
+        if not checkpoint_path or self._last_save_stat is None or self._last_save_data is None:
+            return False
+        
+        try:
+            import gzip
+            os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+            payload = json.dumps({
+                'stat': list(self._last_save_stat),
+                'hash': self._last_save_hash,
+                'data': self._last_save_data,
+            }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            temp_path = checkpoint_path + '.tmp'
+            with gzip.open(temp_path, 'wb', compresslevel=1) as f:
+                f.write(payload)
+            os.replace(temp_path, checkpoint_path)
+            return True
+        except Exception:
+            return False
+    
+    def _load_monitor_checkpoint(self) -> bool:
+        """
+        存档文件状态与检查点记录一致时，从检查点恢复内存基线
+        
+        Returns:
+            是否成功恢复
+        """
+        checkpoint_path = self._get_monitor_checkpoint_path()
+        if not checkpoint_path or not os.path.isfile(checkpoint_path):
+            return False
+        
+        try:
+            import gzip
+            save_stat = self._stat_save_file()
+            with gzip.open(checkpoint_path, 'rb') as f:
+                checkpoint = json.loads(f.read().decode('utf-8'))
+            if save_stat is None or tuple(checkpoint.get('stat') or ()) != save_stat:
+                return False
+            if checkpoint.get('data') is None or not checkpoint.get('hash'):
+                return False
+            self._set_save_baseline(checkpoint['data'], checkpoint['hash'], save_stat)
+            return True
+        except Exception:
+            return False
+    
+    def _stat_save_file(self) -> Optional[Tuple[int, int, int]]:
+        """获取存档文件的状态签名 (size, mtime_ns, inode)，文件不存在时返回None"""
+        try:
+            st = os.stat(self.save_file_path)
+        except (OSError, TypeError, ValueError):
+            return None
+        return (st.st_size, st.st_mtime_ns, st.st_ino)
+    
+    def _wait_for_save_quiet(self, save_stat: Tuple[int, int, int]) -> Optional[Tuple[int, int, int]]:
+        """
+        等待存档文件在SAVE_QUIET_PERIOD内不再变化（最多等待SAVE_BURST_MAX_WAIT）
+        
+        Args:
+            save_stat: 刚检测到的文件状态
+        
+        Returns:
+            静止后的文件状态；文件消失或监控已停止时返回None
+        """
+        deadline = time.monotonic() + SAVE_BURST_MAX_WAIT
+        while self.monitor_running and time.monotonic() < deadline:
+            time.sleep(SAVE_QUIET_PERIOD)
+            self.monitor_stats.incr(COUNTER_STAT_CHECKS)
+            current_stat = self._stat_save_file()
+            if current_stat == save_stat:
+                return save_stat
+            if current_stat is None:
+                return None
+            save_stat = current_stat
+        return save_stat if self.monitor_running else None
+    
+    def _set_save_baseline(self, data: Any, content_hash: Optional[str],
+                           save_stat: Optional[Tuple[int, int, int]]) -> None:
+        """更新内存中的监控基线（解析后的存档对象、内容哈希、文件状态）"""
+        self._last_save_data = data
+        self._last_save_hash = content_hash
+        self._last_save_stat = save_stat
+        rules = self._get_ignore_rules()
+        if data is not None:
+            with self.monitor_stats.timer(HIST_HASH_TREE):
+                self._last_save_tree = build_hash_tree(data, rules)
+        else:
+            self._last_save_tree = None
+        self._last_save_tree_rules = rules
+    
     def _read_file_raw(self, file_path: Optional[str]) -> Optional[str]:
         """读取文件的原始内容（未解码的字符串）"""
         if not self._is_valid_file_path(file_path):
@@ -950,58 +1578,6 @@ class SavTool:
                 continue
         return None
     
-    def _write_temp_file(self, content: Optional[str]) -> bool:
-        """写入临时文件，返回是否成功"""
-        if not self._is_valid_temp_file_path() or content is None:
-            return False
-        
-        try:
-            # 确保目录存在
-            temp_dir = os.path.dirname(self.temp_file_path)
-            if temp_dir and not os.path.exists(temp_dir):
-                os.makedirs(temp_dir, exist_ok=True)
-            
-            # 使用原子写入避免文件损坏
-            temp_fd, temp_path = tempfile.mkstemp(
-                dir=os.path.dirname(self.temp_file_path),
-                prefix='.temp_sf_',
-                suffix='.sav'
-            )
-            
-            try:
-                with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                
-                # 原子替换文件
-                if os.path.exists(self.temp_file_path):
-                    os.replace(temp_path, self.temp_file_path)
-                else:
-                    os.rename(temp_path, self.temp_file_path)
-                
-                return True
-            except Exception:
-                # 清理临时文件
-                try:
-                    os.unlink(temp_path)
-                except OSError:
-                    pass
-                return False
-        except Exception:
-            return False
-    
-    def _is_valid_temp_file_path(self) -> bool:
-        """检查临时文件路径是否有效"""
-        return (self.temp_file_path is not None and
-                isinstance(self.temp_file_path, str) and
-                len(self.temp_file_path) > 0)
-    
-    def _read_temp_file(self) -> Optional[str]:
-        """读取临时文件内容"""
-        if not self._is_valid_temp_file_path():
-            return None
-        
-        return self._read_file_raw(self.temp_file_path)
-    
     def _get_file_content_hash(self, content: Optional[str]) -> Optional[str]:
         """获取文件内容的哈希值"""
         if content is None:
@@ -1019,6 +1595,11 @@ class SavTool:
         """停止存档文件监控"""
         self.monitor_running = False
         
+        # 唤醒正在等待文件事件的监控线程
+        watcher = self.file_watcher
+        if watcher is not None:
+            watcher.wake()
+        
         # 优雅停止监控线程
         if self.monitor_thread is not None and self.monitor_thread.is_alive():
             try:
@@ -1032,133 +1613,132 @@ class SavTool:
             finally:
                 self.monitor_thread = None
         
-        # 清理临时文件
-        self._cleanup_temp_file()
-    
-    def _cleanup_temp_file(self) -> None:
-        """清理临时文件"""
-        if not self._is_valid_temp_file_path():
-            return
-        
-        try:
-            if os.path.exists(self.temp_file_path):
-                # 尝试多次删除，处理文件锁定问题
-                for attempt in range(3):
-                    try:
-                        os.remove(self.temp_file_path)
-                        break  # 删除成功，退出循环
-                    except (OSError, PermissionError):
-                        if attempt < 2:  # 不是最后一次尝试
-                            time.sleep(0.1)
-                        continue
-        except Exception as e:
-            # 记录错误但不中断程序
-            print(f"临时文件清理异常: {e}")
+        # 保存检查点，下次启动时若存档未变可直接复用
+        self._save_monitor_checkpoint()
     
     def _monitor_loop(self):
-        """监控循环（在后台线程中运行）"""
-        while self.monitor_running:
-            try:
-                self._check_file_changes()
-                time.sleep(0.3) # 轮询间隔
-            except Exception as e:
-                # 出错继续监控，但记录异常信息
+        """
+        监控循环（在后台线程中运行）
+        
+        Linux上使用inotify等待_storage中的写入事件，其他平台或inotify不可用时回退到轮询。
+        """
+        watcher = self.file_watcher or PollingWatcher(self.storage_dir)
+        save_file_name = os.path.basename(self.save_file_path)
+        stats = self.monitor_stats
+        try:
+            while self.monitor_running:
                 try:
-                    # 记录异常但不停止监控
-                    import traceback
-                    print(f"监控线程异常: {e}")
-                    print(traceback.format_exc())
-                    time.sleep(1)  # 异常后稍作等待再继续
-                except:
-                    # 如果记录也失败，简单等待后继续
-                    time.sleep(1)
+                    wait_started = time.perf_counter()
+                    changed = watcher.wait()
+                    if not self.monitor_running:
+                        break
+                    stats.observe(HIST_WAIT, (time.perf_counter() - wait_started) * 1000)
+                    stats.incr(COUNTER_POLLS)
+                    if changed is None:
+                        stats.incr(COUNTER_POLL_FULL)
+                    elif changed:
+                        stats.incr(COUNTER_POLL_EVENTS)
+                    
+                    # None表示无法确定具体变化的文件（轮询、超时兜底、事件溢出），需要检查
+                    if changed is None or save_file_name in changed:
+                        self._check_file_changes()
+                    
+                    # 其他 .sav 文件（tyrano数据、截图等）的变化发布到事件总线
+                    self._publish_storage_changes(changed, polling=isinstance(watcher, PollingWatcher))
+                    
+                    # 目录被删除或移动后inotify监视失效，回退到轮询（仍能检测AB INITIO）
+                    if not watcher.is_valid():
+                        watcher.close()
+                        watcher = PollingWatcher(self.storage_dir)
+                        self.file_watcher = watcher
+                        stats.incr(COUNTER_WATCHER_FALLBACKS)
+                        stats.set_gauge("watcher", type(watcher).__name__)
+                    
+                    # 监控线程累计占用的CPU时间
+                    stats.set_gauge("monitor_cpu_s", round(time.thread_time(), 3))
+                except Exception as e:
+                    # 出错继续监控，但记录异常信息
+                    stats.incr(COUNTER_ERRORS)
+                    try:
+                        # 记录异常但不停止监控
+                        import traceback
+                        print(f"监控线程异常: {e}")
+                        print(traceback.format_exc())
+                        time.sleep(1)  # 异常后稍作等待再继续
+                    except:
+                        # 如果记录也失败，简单等待后继续
+                        time.sleep(1)
+        finally:
+            watcher.close()
+            if self.file_watcher is watcher:
+                self.file_watcher = None
+    
+    def _publish_storage_changes(self, changed_names: Optional[Set[str]], polling: bool = False) -> None:
+        """
+        检查 _storage 中除系统存档外的 .sav 文件变化，并发布对应事件
+        
+        Args:
+            changed_names: inotify报告的文件名集合；None表示需要扫描整个目录
+            polling: 是否为轮询模式；轮询模式下只在目录修改时间变化或间隔较长时才扫描整个目录，
+                系统存档仍由 _check_file_changes 按轮询间隔检查
+        """
+        scanner = self.storage_scanner
+        if scanner is None:
+            return
+        if changed_names is not None and not changed_names:
+            return
+        if changed_names is None and polling and not scanner.full_scan_due():
+            return
+        
+        for filename, change in scanner.scan(changed_names):
+            event = event_for_file_change(filename, change)
+            if event is not None:
+                self.event_bus.publish(event)
     
     def _check_file_changes(self):
-        """检查文件是否有变动（通过比较真实文件和临时文件）"""
+        """
+        检查文件是否有变动
+        
+        先用os.stat比较 (size, mtime_ns, inode)，状态未变时直接返回，不读取文件；
+        状态变化后才读取并与内存中的基线比较哈希。
+        """
+        stats = self.monitor_stats
         try:
             # 添加路径有效性检查
             if not self.storage_dir or not isinstance(self.storage_dir, str):
                 return
             
-            # 使用更安全的文件存在性检查
-            def safe_path_exists(path):
-                try:
-                    return path and isinstance(path, str) and os.path.exists(path)
-                except (OSError, TypeError, ValueError, AttributeError):
-                    return False
-            
-            save_file_exists = safe_path_exists(self.save_file_path)
-            temp_file_exists = safe_path_exists(self.temp_file_path)
-            storage_dir_exists = safe_path_exists(self.storage_dir)
+            stats.incr(COUNTER_STAT_CHECKS)
+            save_stat = self._stat_save_file()
             
-            # 如果两个文件同时消失，检查_storage文件夹是否也消失
-            if not save_file_exists and not temp_file_exists:
-                if self.storage_dir and not storage_dir_exists:
+            if save_stat is None:
+                self._last_save_stat = None
+                # 存档文件消失时，检查_storage文件夹是否也消失
+                try:
+                    storage_dir_exists = os.path.exists(self.storage_dir)
+                except (OSError, TypeError, ValueError):
+                    storage_dir_exists = False
+                if not storage_dir_exists and not self.ab_initio_triggered:
                     # 文件夹也消失了，则触发弹窗
-                    if not self.ab_initio_triggered:
-                        self.root.after(0, self._trigger_ab_initio)
-                    return
-            
-            if not save_file_exists:
+                    self.root.after(0, self._trigger_ab_initio)
                 return
             
-            # 获取当前文件修改时间（用于日志/调试，但不作为跳过检查的依据）
-            try:
-                current_mtime = os.path.getmtime(self.save_file_path)
-            except (OSError, IOError, TypeError, AttributeError):
-                current_mtime = 0
-            
-            # 读取临时文件（应该总是成功，因为是我们自己创建的）
-            temp_content = self._read_temp_file()
-            if temp_content is None:
-                # 如果临时文件不存在，重新初始化
-                self._initialize_temp_file()
+            # 文件状态未变化，跳过读取和哈希
+            if save_stat == self._last_save_stat:
+                stats.incr(COUNTER_STAT_UNCHANGED)
                 return
             
-            # 尝试读取真实存档文件（可能需要重试，因为可能被游戏锁定）
-            save_content = None
-            for retry in range(3):
-                save_content = self._read_file_raw(self.save_file_path)
-                if save_content is not None:
-                    break
-                time.sleep(0.1)
-            
-            # 如果读取失败，跳过本次检查（下次再试）
-            if save_content is None:
+            # 等待这一轮连续写入结束，只比较写入前的基线和最终结果，合并为一次通知
+            with stats.timer(HIST_QUIET_WAIT):
+                save_stat = self._wait_for_save_quiet(save_stat)
+            if save_stat is None:
                 return
             
-            # 比较两个文件的内容（始终进行哈希比较，不依赖mtime）
-            temp_hash = self._get_file_content_hash(temp_content)
-            save_hash = self._get_file_content_hash(save_content)
-            
-            # 如果内容不同，说明文件有变动
-            if temp_hash is not None and save_hash is not None and temp_hash != save_hash:
-                # 解析两个文件的数据并比较差异
-                try:
-                    # 解析临时文件数据
-                    temp_data = self._parse_save_content(temp_content)
-                    # 解析真实文件数据
-                    save_data = self._parse_save_content(save_content)
-                    
-                    if temp_data is not None and save_data is not None:
-                        # 直接使用深度比较（更可靠）
-                        changes = self._deep_compare_data(temp_data, save_data)
-                        
-                        if changes and self.toast_enabled:
-                            # 使用 after() 安全地更新 UI（tkinter 不是线程安全的）
-                            # 使用默认参数避免lambda闭包问题
-                            self.root.after(0, lambda c=changes: self._show_change_notification(c))
-                        
-                        # 无论是否检测到变化，都更新临时文件（因为文件哈希已经不同）
-                        self._write_temp_file(save_content)
-                    elif temp_data is None or save_data is None:
-                        # 如果解析失败，至少更新临时文件内容（避免重复检测）
-                        self._write_temp_file(save_content)
-                except Exception as e:
-                    # 如果解析失败，至少更新临时文件内容
-                    self._write_temp_file(save_content)
+            with stats.timer(HIST_CHECK):
+                self._process_save_change(save_stat)
         except Exception as e:
             # 捕获整个检查过程中的任何异常，防止监控线程崩溃
+            stats.incr(COUNTER_ERRORS)
             try:
                 import traceback
                 print(f"文件变化检查异常: {e}")
@@ -1166,6 +1746,94 @@ class SavTool:
             except:
                 pass
     
+    def _process_save_change(self, save_stat: Tuple[int, int, int]) -> None:
+        """
+        读取状态已变化的存档，与内存基线比较并通知
+        
+        Args:
+            save_stat: 写入合并结束后的文件状态
+        """
+        stats = self.monitor_stats
+        
+        # 尝试读取真实存档文件（可能需要重试，因为可能被游戏锁定）
+        save_content = None
+        with stats.timer(HIST_READ):
+            for retry in range(3):
+                if retry:
+                    stats.incr(COUNTER_READ_RETRIES)
+                stats.incr(COUNTER_READS)
+                save_content = self._read_file_raw(self.save_file_path)
+                if save_content is not None:
+                    break
+                time.sleep(0.1)
+        
+        # 如果读取失败，跳过本次检查（不记录文件状态，下次再试）
+        if save_content is None:
+            stats.incr(COUNTER_READ_FAILURES)
+            return
+        
+        save_hash = self._get_file_content_hash(save_content)
+        
+        # 还没有基线（如监控启动时存档文件不存在），本次只建立基线
+        if self._last_save_hash is None:
+            new_data = self._parse_save_content(save_content)
+            self._set_save_baseline(new_data, save_hash, save_stat)
+            if new_data is not None:
+                self.event_bus.publish(StorageEvent(EVENT_SAVE_CHANGED, os.path.basename(self.save_file_path),
+                                                    changes=[], data=new_data))
+            return
+        
+        # 只有mtime等变化而内容相同（如游戏重写了相同内容），只更新文件状态
+        if save_hash is None or save_hash == self._last_save_hash:
+            stats.incr(COUNTER_SAME_CONTENT)
+            self._last_save_stat = save_stat
+            return
+        
+        # 通知自动备份调度器（连续变化会在调度器内合并）
+        scheduler = self.auto_backup_scheduler
+        if scheduler is not None:
+            scheduler.notify_change()
+        
+        old_data = self._last_save_data
+        old_tree = self._last_save_tree
+        if self._last_save_tree_rules != self._get_ignore_rules():
+            # 忽略规则已修改，旧哈希树不再适用
+            old_tree = None
+        with stats.timer(HIST_PARSE):
+            new_data = self._parse_save_content(save_content)
+        if new_data is None:
+            stats.incr(COUNTER_PARSE_ERRORS)
+        # 无论解析和比较是否成功，都更新基线（避免重复检测）
+        self._set_save_baseline(new_data, save_hash, save_stat)
+        
+        try:
+            if old_data is not None and new_data is not None:
+                # 基于子树哈希的深度比较，未变化的子树直接跳过
+                with stats.timer(HIST_DIFF):
+                    changes = self._deep_compare_data(old_data, new_data,
+                                                      old_tree=old_tree, new_tree=self._last_save_tree)
+                stats.incr(COUNTER_DIFFS)
+                stats.incr(COUNTER_CHANGES, len(changes))
+                mtime_ns = save_stat[1]
+                if changes:
+                    stats.observe_since_mtime(HIST_DETECT_LATENCY, mtime_ns)
+                
+                # 记录到变更历史（与toast开关无关）
+                history = self.change_history
+                if changes and history is not None:
+                    history.record(changes)
+                
+                # 通知订阅者（存档分析等），携带解析后的新数据
+                self.event_bus.publish(StorageEvent(EVENT_SAVE_CHANGED, os.path.basename(self.save_file_path),
+                                                    changes=changes, data=new_data))
+                
+                if changes and self.toast_enabled:
+                    # 使用 after() 安全地更新 UI（tkinter 不是线程安全的）
+                    # 使用默认参数避免lambda闭包问题
+                    self.root.after(0, lambda c=changes, m=mtime_ns: self._show_change_notification(c, m))
+        except Exception as e:
+            print(f"存档差异比较异常: {e}")
+    
     def _parse_save_content(self, content):
         """解析存档文件内容为JSON对象"""
         if not content:
@@ -1233,7 +1901,7 @@ class SavTool:
         backup_restore_keys = {
             "backup_restore_tab", "backup_button", "restore_button",
             "backup_confirm_title", "backup_confirm_text", "backup_success_title",
-            "backup_success_text", "restore_confirm_title", "restore_confirm_text",
+            "backup_success_text", "backup_skipped_files", "restore_confirm_title", "restore_confirm_text",
             "restore_missing_files_title", "restore_missing_files_text", "restore_success",
             "backup_list_title", "backup_timestamp", "backup_filename", "backup_size",
             "backup_status", "no_info_file", "backup_estimate_failed", "backup_failed",
@@ -1241,7 +1909,15 @@ class SavTool:
             "delete_backup_confirm_text", "delete_backup_success", "delete_backup_failed",
             "rename_backup_button", "rename_backup_title", "rename_backup_prompt",
             "rename_backup_empty", "rename_backup_invalid_chars", "rename_backup_success",
-            "rename_backup_failed", "yes_button", "no_button"
+            "rename_backup_failed", "yes_button", "no_button",
+            "auto_backup_enable", "auto_backup_interval", "auto_backup_status",
+            "compare_backup_button", "compare_backup_title", "compare_live_label",
+            "compare_loading", "compare_no_changes", "compare_file_unavailable",
+            "cancel_operation", "operation_progress_detail", "backup_cancelled", "restore_cancelled",
+            "verify_backups_button", "verify_status_ok", "verify_status_failed",
+            "verify_backups_ok", "verify_backups_failed",
+            "archive_backup_button", "archive_status", "archive_confirm_title",
+            "archive_confirm_text", "archive_result"
         }
         
         for lang in self.translations:
@@ -1404,271 +2080,57 @@ class SavTool:
         except (json.JSONDecodeError, ValueError, TypeError):
             return None
     
-    def _values_equal(self, old_val: Any, new_val: Any) -> bool:
-        """比较两个值是否相等（处理类型转换问题）"""
-        # None值处理
-        if old_val is None and new_val is None:
-            return True
-        if old_val is None or new_val is None:
-            return False
-        
-        # 类型相同，直接比较
-        if type(old_val) == type(new_val):
-            return self._compare_same_type(old_val, new_val)
-        
-        # 处理数字类型比较
-        if isinstance(old_val, (int, float)) and isinstance(new_val, (int, float)):
-            return self._compare_numbers(old_val, new_val)
-        
-        # 处理布尔值比较
-        if isinstance(old_val, bool) and isinstance(new_val, (int, float)):
-            return old_val == (new_val != 0)
-        if isinstance(new_val, bool) and isinstance(old_val, (int, float)):
-            return new_val == (old_val != 0)
-        
-        # 处理字符串比较
-        if isinstance(old_val, str) and isinstance(new_val, str):
-            return old_val.strip() == new_val.strip()
-        
-        # 其他情况，转换为字符串比较（排除复杂类型）
-        if not isinstance(old_val, (dict, list)) and not isinstance(new_val, (dict, list)):
-            return str(old_val) == str(new_val)
-        
-        return False
-    
-    def _compare_same_type(self, old_val: Any, new_val: Any) -> bool:
-        """比较相同类型的值"""
-        if isinstance(old_val, (list, dict)):
-            return old_val == new_val
-        return old_val == new_val
-    
-    def _compare_numbers(self, old_val: Union[int, float], new_val: Union[int, float]) -> bool:
-        """比较数字值"""
-        # 排除布尔值
-        if isinstance(old_val, bool) or isinstance(new_val, bool):
-            return False
-        
-        # 整数比较
-        if isinstance(old_val, int) and isinstance(new_val, int):
-            return old_val == new_val
-        
-        # 浮点数比较
-        old_float = float(old_val)
-        new_float = float(new_val)
-        
-        # 检查是否为整数值
-        old_is_int = isinstance(old_val, int) or (isinstance(old_val, float) and old_val.is_integer())
-        new_is_int = isinstance(new_val, int) or (isinstance(new_val, float) and new_val.is_integer())
-        
-        if old_is_int and new_is_int:
-            return int(old_float) == int(new_float)
-        
-        # 浮点数比较（带容差）
-        return abs(old_float - new_float) < 1e-10
-    
-    def _deep_compare_data(self, old_data, new_data, prefix=""):
-        """深度比较数据，找出所有差异（使用严格比较）"""
-        changes = []
-        
-        # 需要忽略的字段（这些字段变化频繁但不重要）
-        # 根据toast_ignore_record设置解析忽略变量列表
-        ignored_vars = set()
-        if self.toast_ignore_record and self.toast_ignore_record.strip():
-            # 解析逗号分割的字符串，去除空格并过滤空字符串
-            ignored_vars = {var.strip() for var in self.toast_ignore_record.split(",") if var.strip()}
-        
-        # 确保都是字典
-        if not isinstance(old_data, dict):
-            old_data = {}
-        if not isinstance(new_data, dict):
-            new_data = {}
-        
-        # 比较所有字段
-        all_keys = set(old_data.keys()) | set(new_data.keys())
-        
-        for key in all_keys:
-            full_key = f"{prefix}.{key}" if prefix else key
-            
-            # 1. 检查顶层key是否在忽略列表中（精确匹配）
-            # 2. 检查完整路径是否在忽略列表中（精确匹配）
-            # 3. 检查完整路径是否以某个忽略变量开头（用于忽略整个子树，如"record"会忽略"record.xxx"）
-            should_ignore = False
-            if ignored_vars:
-                if key in ignored_vars or full_key in ignored_vars:
-                    should_ignore = True
-                else:
-                    # 检查full_key是否以某个忽略变量开头（用于忽略整个子树）
-                    for ignored_var in ignored_vars:
-                        if full_key == ignored_var or full_key.startswith(ignored_var + "."):
-                            should_ignore = True
-                            break
-            
-            # 跳过忽略的字段
-            if should_ignore:
-                continue
-            
-            old_value = old_data.get(key)
-            new_value = new_data.get(key)
-            
-            # 字段被删除
-            if key in old_data and key not in new_data:
-                changes.append(f"-{full_key}")
-            # 字段被新增
-            elif key not in old_data and key in new_data:
-                if isinstance(new_value, dict):
-                    nested_changes = self._deep_compare_data({}, new_value, full_key)
-                    changes.extend(nested_changes)
-                else:
-                    changes.append(f"+{full_key} = {self._format_value(new_value)}")
-            # 字段值发生变化
-            else:
-                # 先检查值是否相等（使用_values_equal进行智能比较）
-                if not self._values_equal(old_value, new_value):
-                    if isinstance(old_value, dict) and isinstance(new_value, dict):
-                        nested_changes = self._deep_compare_data(old_value, new_value, full_key)
-                        changes.extend(nested_changes)
-                    elif isinstance(old_value, list) and isinstance(new_value, list):
-                        list_changes = self._compare_lists(full_key, old_value, new_value)
-                        changes.extend(list_changes)
-                    else:
-                        # 普通值变化
-                        changes.append(f"{full_key} {self._format_value(old_value)}→{self._format_value(new_value)}")
-                # 如果值相等但类型不同，也记录变化（可能是游戏写入时的类型变化）
-                elif type(old_value) != type(new_value):
-                    # 对于数值类型，如果数值相同但类型不同，也记录
-                    if isinstance(old_value, (int, float)) and isinstance(new_value, (int, float)):
-                        if float(old_value) == float(new_value):
-                            # 数值相同但类型不同，也记录（比如int(7) vs float(7.0)）
-                            changes.append(f"{full_key} {self._format_value(old_value)} ({type(old_value).__name__})→{self._format_value(new_value)} ({type(new_value).__name__})")
-        
-        return changes
-    
-    def _compare_save_data(self, old_data, new_data, prefix=""):
-        """比较两个存档数据，返回变更列表"""
-        changes = []
-        
-        # 确保都是字典
-        if not isinstance(old_data, dict):
-            old_data = {}
-        if not isinstance(new_data, dict):
-            new_data = {}
-        
-        # 比较所有字段
-        all_keys = set(old_data.keys()) | set(new_data.keys())
-        
-        for key in all_keys:
-            # 构建完整键名（支持嵌套）
-            full_key = f"{prefix}.{key}" if prefix else key
-            
-            old_value = old_data.get(key)
-            new_value = new_data.get(key)
-            
-            # 字段被删除
-            if key in old_data and key not in new_data:
-                changes.append(f"- {full_key}")
-            # 字段被新增
-            elif key not in old_data and key in new_data:
-                if isinstance(new_value, dict):
-                    # 如果是字典，递归比较
-                    nested_changes = self._compare_save_data({}, new_value, full_key)
-                    changes.extend(nested_changes)
-                else:
-                    changes.append(f"+ {full_key} = {self._format_value(new_value)}")
-            # 字段值发生变化
-            else:
-                # 先使用严格比较（直接 !=）
-                if old_value != new_value:
-                    # 如果是字典，递归比较
-                    if isinstance(old_value, dict) and isinstance(new_value, dict):
-                        nested_changes = self._compare_save_data(old_value, new_value, full_key)
-                        changes.extend(nested_changes)
-                    # 如果是列表，比较列表差异
-                    elif isinstance(old_value, list) and isinstance(new_value, list):
-                        list_changes = self._compare_lists(full_key, old_value, new_value)
-                        changes.extend(list_changes)
-                    else:
-                        # 普通值变化（使用严格比较，确保所有变化都能检测到）
-                        changes.append(f"{full_key} {self._format_value(old_value)}→{self._format_value(new_value)}")
-                # 如果严格比较相等，但类型不同，也记录变化（可能是游戏写入时的类型变化）
-                elif type(old_value) != type(new_value):
-                    # 对于数字类型，如果数值相同但类型不同，也记录
-                    if isinstance(old_value, (int, float)) and isinstance(new_value, (int, float)):
-                        if float(old_value) == float(new_value):
-                            # 数值相同但类型不同，也记录（比如int(7) vs float(7.0)）
-                            changes.append(f"{full_key} {self._format_value(old_value)} ({type(old_value).__name__})→{self._format_value(new_value)} ({type(new_value).__name__})")
-        
-        return changes
-    
-    def _compare_lists(self, key, old_list, new_list):
-        """比较两个列表的差异（支持包含不可哈希元素的列表）"""
-        changes = []
-        
-        # 将元素转换为可比较的形式（用于处理嵌套列表/字典）
-        def make_comparable(item):
-            """将元素转换为可用于比较的形式"""
-            if isinstance(item, (list, dict)):
-                return json.dumps(item, sort_keys=True, ensure_ascii=False)
-            return item
-        
-        def find_item_in_list(item, lst):
-            """检查元素是否在列表中（支持复杂类型）"""
-            item_cmp = make_comparable(item)
-            for other in lst:
-                if make_comparable(other) == item_cmp:
-                    return True
-            return False
-        
-        # 查找添加的元素（在new_list中但不在old_list中）
-        for item in new_list:
-            if not find_item_in_list(item, old_list):
-                changes.append(f"{key}.append({self._format_value(item)})")
-        
-        # 查找移除的元素（在old_list中但不在new_list中）
-        for item in old_list:
-            if not find_item_in_list(item, new_list):
-                changes.append(f"{key}.remove({self._format_value(item)})")
-        
-        return changes
-    
-    def _format_value(self, value):
-        """格式化值用于显示"""
-        if isinstance(value, (dict, list)):
-            return str(value)
-        elif isinstance(value, str):
-            return f'"{value}"'
-        elif isinstance(value, float):
-            # 如果是浮点数，检查是否为整数
-            if value.is_integer():
-                return str(int(value))
-            return str(value)
-        elif isinstance(value, bool):
-            return str(value)
-        else:
-            return str(value)
-    
-    def _show_change_notification(self, changes):
-        """显示存档文件变动通知（支持合并连续变化）"""
+    def _deep_compare_data(self, old_data, new_data, use_ignore_list=True,
+                           old_tree=None, new_tree=None, detect_reorder=False) -> List[SaveChange]:
+        """
+        深度比较存档数据，找出所有差异
+        
+        Args:
+            old_data: 旧存档数据
+            new_data: 新存档数据
+            use_ignore_list: 是否应用toast_ignore_record中的忽略变量
+            old_tree/new_tree: 预先构建的哈希树（可选），用于跳过未变化的子树
+            detect_reorder: 是否记录列表只有顺序变化的情况
+        
+        Returns:
+            SaveChange 变更记录列表（显示时再格式化）
+        """
+        # 需要忽略的字段（这些字段变化频繁但不重要），比较前就剪掉
+        rules = self._get_ignore_rules() if use_ignore_list else None
+        return diff_save_data(old_data, new_data, rules, old_tree, new_tree, detect_reorder)
+    
+    def _get_ignore_rules(self) -> IgnoreRules:
+        """
+        获取编译后的忽略规则（根据toast_ignore_record，规则字符串不变时复用编译结果）
+        
+        Returns:
+            IgnoreRules 实例
+        """
+        source = self.toast_ignore_record or ""
+        cache = self._ignore_rules_cache
+        if cache is None or cache[0] != source:
+            cache = (source, IgnoreRules.from_string(source))
+            self._ignore_rules_cache = cache
+        return cache[1]
+    
+    def _show_change_notification(self, changes: List[SaveChange], mtime_ns: Optional[int] = None):
+        """
+        显示存档文件变动通知（支持合并连续变化）
+        
+        Args:
+            changes: 变更记录
+            mtime_ns: 触发本次通知的存档修改时间（用于统计通知延迟）
+        """
         # 解析变化，区分可合并的和不可合并的
         mergeable_changes = {}  # {变量名: (旧值, 新值)}
         other_changes = []
         
         for change in changes:
-            # 检测格式：变量名 旧值→新值
-            if "→" in change and not change.startswith("+") and not change.startswith("-"):
-                # 尝试解析：变量名 旧值→新值
-                arrow_pos = change.find("→")
-                # 从箭头往前找空格，确定变量名
-                prefix = change[:arrow_pos]
-                last_space = prefix.rfind(" ")
-                if last_space > 0:
-                    var_name = prefix[:last_space].strip()
-                    old_val = prefix[last_space+1:].strip()
-                    new_val = change[arrow_pos+1:].strip()
-                    mergeable_changes[var_name] = (old_val, new_val)
-                else:
-                    other_changes.append(change)
+            # 普通值变化可以合并为变化链：变量名 旧值→新值→...
+            if change.op == OP_CHANGE:
+                mergeable_changes[change.key] = (format_value(change.old), format_value(change.new))
             else:
-                other_changes.append(change)
+                other_changes.append(change.format())
         
         # 处理可合并的变化
         updated_toasts = set()
@@ -1679,7 +2141,7 @@ class SavTool:
                 # 该变量已有活跃的变化链，尝试追加
                 chain_info = self.variable_change_chains[var_name]
                 toast = chain_info.get("toast")
-                if toast and toast.window.winfo_exists():
+                if toast and toast.is_active():
                     # Toast 仍然存在，追加变化
                     chain_info["chain"].append(new_val)
                     updated_toasts.add(var_name)
@@ -1699,7 +2161,7 @@ class SavTool:
             chain_info = self.variable_change_chains[var_name]
             chain = chain_info["chain"]
             toast = chain_info["toast"]
-            if toast and toast.window.winfo_exists():
+            if toast and toast.is_active():
                 # 重建该toast的消息
                 chain_str = "→".join(str(v) for v in chain)
                 new_line = f"{var_name} {chain_str}"
@@ -1742,22 +2204,32 @@ class SavTool:
                     if var_name in self.variable_change_chains:
                         self.variable_change_chains[var_name]["toast"] = toast
             
-            # 添加到活跃列表
+            # 添加到活跃列表（顺便移除已经关闭的toast）
+            self.active_toasts = [item for item in self.active_toasts if item.is_active()]
             self.active_toasts.append(toast)
         
         # 清理已经消失的变化链
         to_remove = []
         for var_name, chain_info in self.variable_change_chains.items():
             toast = chain_info.get("toast")
-            if toast and not toast.window.winfo_exists():
+            if toast and not toast.is_active():
                 to_remove.append(var_name)
         for var_name in to_remove:
             del self.variable_change_chains[var_name]
+        
+        self.monitor_stats.incr(COUNTER_NOTIFICATIONS)
+        self.monitor_stats.observe_since_mtime(HIST_NOTIFY_LATENCY, mtime_ns)
     
     def on_closing(self):
         """窗口关闭事件处理"""
         # 停止文件监控（会清理临时文件）
         self._stop_file_monitor()
+        # 停止自动备份调度器
+        if self.auto_backup_scheduler is not None:
+            self.auto_backup_scheduler.stop()
+            self.auto_backup_scheduler = None
+        # 关闭变更历史数据库
+        self._close_change_history()
         # 关闭窗口
         self.root.destroy()
     
@@ -1877,6 +2349,18 @@ class SavTool:
             self.delete_backup_button.config(text=self.t("delete_backup_button"))
         if hasattr(self, 'rename_backup_button') and self.rename_backup_button:
             self.rename_backup_button.config(text=self.t("rename_backup_button"))
+        if hasattr(self, 'verify_backups_button') and self.verify_backups_button:
+            self.verify_backups_button.config(text=self.t("verify_backups_button"))
+        if hasattr(self, 'cancel_operation_button') and self.cancel_operation_button:
+            self.cancel_operation_button.config(text=self.t("cancel_operation"))
+        if hasattr(self, 'archive_backup_button') and self.archive_backup_button:
+            self.archive_backup_button.config(text=self.t("archive_backup_button"))
+        if hasattr(self, 'compare_backup_button') and self.compare_backup_button:
+            self.compare_backup_button.config(text=self.t("compare_backup_button"))
+        if hasattr(self, 'auto_backup_checkbox') and self.auto_backup_checkbox:
+            self.auto_backup_checkbox.config(text=self.t("auto_backup_enable"))
+        if hasattr(self, 'auto_backup_interval_label') and self.auto_backup_interval_label:
+            self.auto_backup_interval_label.config(text=self.t("auto_backup_interval"))
         
         if self.storage_dir and self.screenshot_manager_ui is not None:
             self.screenshot_manager_ui.load_screenshots()
@@ -1908,6 +2392,7 @@ class SavTool:
                     self.screenshot_frame, self.root, self.storage_dir,
                     self.translations, self.current_language, self.t
                 )
+                self.screenshot_manager_ui.attach_event_bus(self.event_bus)
             else:
                 self.screenshot_manager_ui.set_storage_dir(self.storage_dir)
                 self.screenshot_manager_ui.load_screenshots()
@@ -2072,6 +2557,7 @@ class SavTool:
                     self.screenshot_frame, self.root, self.storage_dir,
                     self.translations, self.current_language, self.t
                 )
+                self.screenshot_manager_ui.attach_event_bus(self.event_bus)
             else:
                 self.screenshot_manager_ui.set_storage_dir(self.storage_dir)
                 self.screenshot_manager_ui.load_screenshots(silent=True)
@@ -2087,6 +2573,8 @@ class SavTool:
             messagebox.showinfo(self.t("warning"), self.t("steam_detect_not_found"))
 
 if __name__ == "__main__":
+    # 打包为exe时，LZMA归档使用的进程池需要此调用
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = SavTool(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,347 @@
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from styles import get_cjk_font, Colors
+from utils import set_window_icon
+
+# 直方图分桶上界（毫秒），最后一个桶收集所有更大的值
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+MONITOR_STATS_REFRESH_MS = 1000  # 调试面板刷新间隔
+
+# 计数器
+COUNTER_POLLS = "polls"                    # 监视器唤醒次数
+COUNTER_POLL_EVENTS = "poll_events"        # 其中由inotify事件唤醒的次数
+COUNTER_POLL_FULL = "poll_full_checks"     # 其中需要全量检查的次数（轮询/超时/溢出）
+COUNTER_STAT_CHECKS = "stat_checks"        # 存档文件stat次数
+COUNTER_STAT_UNCHANGED = "stat_unchanged"  # stat结果未变、跳过读取的次数
+COUNTER_READS = "reads"                    # 读取存档文件的次数
+COUNTER_READ_RETRIES = "read_retries"      # 读取失败后重试的次数
+COUNTER_READ_FAILURES = "read_failures"    # 重试后仍然读取失败的次数
+COUNTER_SAME_CONTENT = "same_content"      # 文件状态变化但内容哈希相同的次数
+COUNTER_PARSE_ERRORS = "parse_errors"      # 解析存档失败的次数
+COUNTER_DIFFS = "diffs"                    # 差异比较次数
+COUNTER_CHANGES = "changes"                # 检测到的变更条数
+COUNTER_NOTIFICATIONS = "notifications"    # 显示toast通知的次数
+COUNTER_WATCHER_FALLBACKS = "watcher_fallbacks"  # inotify失效回退到轮询的次数
+COUNTER_ERRORS = "errors"                  # 监控线程异常次数
+
+# 直方图（毫秒）
+HIST_WAIT = "wait_ms"                      # 每次等待监视器的时长
+HIST_CHECK = "check_ms"                    # 一次完整检查的耗时（不含写入合并等待）
+HIST_QUIET_WAIT = "quiet_wait_ms"          # 等待连续写入结束的时长
+HIST_READ = "read_ms"                      # 读取存档文件的耗时
+HIST_PARSE = "parse_ms"                    # 解码+JSON解析的耗时
+HIST_HASH_TREE = "hash_tree_ms"            # 构建子树哈希的耗时
+HIST_DIFF = "diff_ms"                      # 差异比较的耗时
+HIST_DETECT_LATENCY = "detect_latency_ms"  # 文件mtime → 检测出变化
+HIST_NOTIFY_LATENCY = "notify_latency_ms"  # 文件mtime → toast显示
+
+
+class LatencyHistogram:
+    """固定分桶的耗时直方图（毫秒），记录次数、总和、最值，百分位数按分桶估算"""
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value_ms: float) -> None:
+        """记录一个值"""
+        if value_ms < 0:
+            value_ms = 0.0
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if self.min is None or value_ms < self.min:
+            self.min = value_ms
+        if self.max is None or value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        估算百分位数
+
+        Args:
+            fraction: 0~1之间的比例（如0.95）
+
+        Returns:
+            该百分位所在分桶的上界（不超过实际最大值），没有数据时返回None
+        """
+        if not self.count:
+            return None
+        target = max(1, int(round(self.count * fraction)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(self.buckets):
+                    return min(float(self.buckets[index]), self.max)
+                return self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """导出为字典"""
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": {
+                (f"<={bound}" if i < len(self.buckets) else f">{self.buckets[-1]}"): n
+                for i, (bound, n) in enumerate(zip(self.buckets + (None,), self.counts))
+                if n
+            },
+        }
+
+
+class MonitorStats:
+    """
+    存档监控的运行统计：计数器、耗时直方图和少量状态值，
+    由监控线程写入、调试面板读取（线程安全）
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """清空所有统计"""
+        with self._lock:
+            self.started = time.time()
+            self._cpu_started = time.process_time()
+            self.counters: Dict[str, int] = {}
+            self.histograms: Dict[str, LatencyHistogram] = {}
+            self.gauges: Dict[str, Any] = {}
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """计数器加一（或加amount）"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value_ms: float) -> None:
+        """向直方图记录一个耗时（毫秒）"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(value_ms)
+
+    def set_gauge(self, name: str, value: Any) -> None:
+        """记录一个状态值（如监视器类型、监控线程CPU时间）"""
+        with self._lock:
+            self.gauges[name] = value
+
+    @contextmanager
+    def timer(self, name: str):
+        """计时上下文：with stats.timer(HIST_READ): ..."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000)
+
+    def observe_since_mtime(self, name: str, mtime_ns: Optional[int]) -> None:
+        """记录从文件修改时间到现在的延迟"""
+        if mtime_ns:
+            self.observe(name, (time.time_ns() - mtime_ns) / 1e6)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """导出当前统计（可直接序列化为JSON）"""
+        with self._lock:
+            return {
+                "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+                "uptime_s": round(time.time() - self.started, 3),
+                "process_cpu_s": round(time.process_time() - self._cpu_started, 3),
+                "counters": dict(sorted(self.counters.items())),
+                "gauges": dict(sorted(self.gauges.items())),
+                "histograms_ms": {name: histogram.snapshot()
+                                  for name, histogram in sorted(self.histograms.items())},
+            }
+
+    def dump(self, file_path: str) -> bool:
+        """
+        把当前统计写入JSON文件
+
+        Args:
+            file_path: 目标文件路径
+
+        Returns:
+            是否成功
+        """
+        try:
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            print(f"导出监控统计失败: {e}")
+            return False
+
+
+def _format_ms(value: Optional[float]) -> str:
+    """格式化毫秒值用于显示"""
+    if value is None:
+        return "-"
+    if value >= 100:
+        return f"{value:.0f}"
+    return f"{value:.2f}"
+
+
+class MonitorStatsViewer:
+    """监控统计调试面板（定时刷新）"""
+
+    def __init__(self, root, stats: MonitorStats, t_func):
+        """
+        Args:
+            root: 根窗口
+            stats: MonitorStats 实例
+            t_func: 翻译函数
+        """
+        self.stats = stats
+        self.t = t_func
+        self._refresh_job = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title(self.t("monitor_stats_title"))
+        self.window.geometry("720x520")
+        set_window_icon(self.window)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.summary_label = tk.Label(self.window, text="", font=get_cjk_font(9),
+                                      fg=Colors.TEXT_SECONDARY, anchor="w", justify="left")
+        self.summary_label.pack(fill="x", padx=10, pady=(10, 5))
+
+        # 计数器
+        counters_frame = tk.Frame(self.window)
+        counters_frame.pack(fill="x", padx=10, pady=5)
+        self.counter_tree = ttk.Treeview(counters_frame, columns=("name", "value"),
+                                         show="headings", height=8)
+        self.counter_tree.heading("name", text=self.t("monitor_stats_col_metric"))
+        self.counter_tree.heading("value", text=self.t("monitor_stats_col_count"))
+        self.counter_tree.column("name", width=250)
+        self.counter_tree.column("value", width=120, anchor="e")
+        counter_scrollbar = ttk.Scrollbar(counters_frame, orient="vertical", command=self.counter_tree.yview)
+        self.counter_tree.configure(yscrollcommand=counter_scrollbar.set)
+        self.counter_tree.pack(side="left", fill="x", expand=True)
+        counter_scrollbar.pack(side="right", fill="y")
+
+        # 耗时直方图
+        hist_frame = tk.Frame(self.window)
+        hist_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        columns = ("name", "count", "avg", "p50", "p95", "max")
+        self.hist_tree = ttk.Treeview(hist_frame, columns=columns, show="headings")
+        self.hist_tree.heading("name", text=self.t("monitor_stats_col_metric"))
+        self.hist_tree.heading("count", text=self.t("monitor_stats_col_count"))
+        for column in ("avg", "p50", "p95", "max"):
+            self.hist_tree.heading(column, text=self.t(f"monitor_stats_col_{column}"))
+            self.hist_tree.column(column, width=80, anchor="e")
+        self.hist_tree.column("name", width=200)
+        self.hist_tree.column("count", width=80, anchor="e")
+        hist_scrollbar = ttk.Scrollbar(hist_frame, orient="vertical", command=self.hist_tree.yview)
+        self.hist_tree.configure(yscrollcommand=hist_scrollbar.set)
+        self.hist_tree.pack(side="left", fill="both", expand=True)
+        hist_scrollbar.pack(side="right", fill="y")
+
+        button_frame = tk.Frame(self.window)
+        button_frame.pack(fill="x", padx=10, pady=(5, 10))
+        ttk.Button(button_frame, text=self.t("monitor_stats_dump"),
+                   command=self._dump_to_file).pack(side="right", padx=5)
+        ttk.Button(button_frame, text=self.t("monitor_stats_reset"),
+                   command=self._reset).pack(side="right", padx=5)
+
+        self.refresh()
+
+    def refresh(self) -> None:
+        """重新读取统计并更新表格，然后安排下一次刷新"""
+        self._refresh_job = None
+        try:
+            if not self.window.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        snapshot = self.stats.snapshot()
+        gauges = snapshot["gauges"]
+        summary = self.t("monitor_stats_summary",
+                         uptime=f"{snapshot['uptime_s']:.0f}",
+                         cpu=f"{snapshot['process_cpu_s']:.2f}",
+                         monitor_cpu=f"{gauges.get('monitor_cpu_s', 0.0):.2f}",
+                         watcher=gauges.get("watcher", "-"))
+        self.summary_label.config(text=summary)
+
+        self._fill_tree(self.counter_tree, [(name, (name, value))
+                                            for name, value in snapshot["counters"].items()])
+        rows = []
+        for name, histogram in snapshot["histograms_ms"].items():
+            rows.append((name, (name, histogram["count"], _format_ms(histogram["avg"]),
+                                _format_ms(histogram["p50"]), _format_ms(histogram["p95"]),
+                                _format_ms(histogram["max"]))))
+        self._fill_tree(self.hist_tree, rows)
+
+        self._refresh_job = self.window.after(MONITOR_STATS_REFRESH_MS, self.refresh)
+
+    def _fill_tree(self, tree: ttk.Treeview, rows: List[tuple]) -> None:
+        """按行ID更新表格（保留已有行，避免闪烁和滚动位置丢失）"""
+        existing = set(tree.get_children())
+        for iid, values in rows:
+            if iid in existing:
+                tree.item(iid, values=values)
+                existing.discard(iid)
+            else:
+                tree.insert("", "end", iid=iid, values=values)
+        if existing:
+            tree.delete(*existing)
+
+    def _reset(self) -> None:
+        """清空统计"""
+        self.stats.reset()
+        self._cancel_refresh()
+        self.refresh()
+
+    def _dump_to_file(self) -> None:
+        """把统计导出为JSON文件"""
+        file_path = filedialog.asksaveasfilename(
+            parent=self.window,
+            title=self.t("save_file"),
+            defaultextension=".json",
+            initialfile=f"dcsm_monitor_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            filetypes=[(self.t("json_files"), "*.json"), (self.t("all_files"), "*.*")]
+        )
+        if not file_path:
+            return
+        if self.stats.dump(file_path):
+            messagebox.showinfo(self.t("success"), self.t("monitor_stats_dump_success", path=file_path),
+                                parent=self.window)
+        else:
+            messagebox.showerror(self.t("error"), self.t("monitor_stats_dump_failed"), parent=self.window)
+
+    def _cancel_refresh(self) -> None:
+        """取消定时刷新"""
+        if self._refresh_job is not None:
+            try:
+                self.window.after_cancel(self._refresh_job)
+            except tk.TclError:
+                pass
+            self._refresh_job = None
+
+    def close(self) -> None:
+        """关闭面板"""
+        self._cancel_refresh()
+        self.window.destroy()
@@ -129,7 +129,23 @@ class OthersTab:
         # 根据toast_enabled状态设置输入框的可用性
         self._update_ignore_vars_entry_state()
         
-        # 3. 解码并导出tyrano_data.sav
+        # 3. 查看存档变更历史
+        history_button = ttk.Button(
+            button_frame,
+            text=self.t("change_history_button"),
+            command=self.main_app.show_change_history
+        )
+        history_button.pack(fill="x", pady=10)
+        
+        # 4. 监控统计（调试）
+        monitor_stats_button = ttk.Button(
+            button_frame,
+            text=self.t("monitor_stats_button"),
+            command=self.main_app.show_monitor_stats
+        )
+        monitor_stats_button.pack(fill="x", pady=10)
+        
+        # 5. 解码并导出tyrano_data.sav
         export_button = ttk.Button(
             button_frame,
             text=self.t("export_tyrano_data"),
@@ -137,7 +153,7 @@ class OthersTab:
         )
         export_button.pack(fill="x", pady=10)
         
-        # 4. 导入、编码并保存tyrano_data.sav
+        # 6. 导入、编码并保存tyrano_data.sav
         import_button = ttk.Button(
             button_frame,
             text=self.t("import_tyrano_data"),
@@ -145,7 +161,7 @@ class OthersTab:
         )
         import_button.pack(fill="x", pady=10)
         
-        # 5. 检查更新（放在最下面）
+        # 7. 检查更新（放在最下面）
         check_update_button = ttk.Button(
             button_frame,
             text=self.t("check_for_updates"),
@@ -0,0 +1,174 @@
+import math
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageTk
+
+RING_SUPERSAMPLE = 3  # 超采样倍数（先放大绘制再缩小，得到抗锯齿边缘）
+RING_SPRITE_CACHE_SIZE = 256  # 缓存的圆环图像数量（LRU）
+RING_HIGHLIGHT_SEGMENTS = 8  # 末端高亮的段数（最后8段逐渐变亮）
+RING_HIGHLIGHT_LIGHTEN = 0.35  # 高亮色相对主颜色的变浅程度
+RING_TOTAL_SEGMENTS = 99  # 100%时的段数，留出1%的空隙（约3.6度）
+
+_ANGLE_PER_SEGMENT = 360 / 100  # 每1%对应的角度
+# 发光层：(额外宽度, 变浅程度)，从最外层（最淡）到内层
+_GLOW_LAYERS = ((6, 0.85), (4, 0.70), (2, 0.50))
+_COMPLETE_GLOW_LAYERS = ((8, 0.75), (5, 0.55), (3, 0.35))  # 100%时的增强发光
+
+RGB = Tuple[int, int, int]
+
+
+def _parse_color(color: str) -> RGB:
+    """解析 "#RRGGBB" 颜色"""
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def _mix(color1: RGB, color2: RGB, factor: float) -> RGB:
+    """在两个颜色之间线性插值（factor: 0.0 = color1, 1.0 = color2）"""
+    return tuple(max(0, min(255, int(a + (b - a) * factor))) for a, b in zip(color1, color2))
+
+
+def _lighten(color: RGB, factor: float) -> RGB:
+    """将颜色变浅（factor: 0.0 = 不变, 1.0 = 纯白）"""
+    return _mix(color, (255, 255, 255), factor)
+
+
+def ring_segment_colors(percent: float, color: str, complete: bool = False,
+                        highlight_count: Optional[int] = None) -> List[RGB]:
+    """
+    计算每个1%段的主颜色
+
+    Args:
+        percent: 百分比（0-100，四舍五入到1%）
+        color: 进度主颜色
+        complete: 100%时是否整体高亮
+        highlight_count: 庆祝动画中从起点开始已被高亮的段数（None表示不是庆祝动画）
+
+    Returns:
+        各段颜色，列表长度即段数
+    """
+    rounded_percent = round(percent)
+    num_segments = RING_TOTAL_SEGMENTS if rounded_percent >= 100 else max(0, rounded_percent)
+    base = _parse_color(color)
+    highlight = _lighten(base, RING_HIGHLIGHT_LIGHTEN)
+
+    colors = []
+    for i in range(num_segments):
+        segments_from_end = num_segments - 1 - i
+        if highlight_count is not None:
+            # 庆祝动画：高亮从起点顺时针蔓延，同时保留初始的末端高亮
+            is_highlighted = i < highlight_count or segments_from_end < RING_HIGHLIGHT_SEGMENTS
+            colors.append(highlight if is_highlighted else base)
+        elif complete:
+            colors.append(highlight)
+        elif segments_from_end < RING_HIGHLIGHT_SEGMENTS:
+            # 末端高亮：越靠近末端越亮
+            highlight_factor = 1 - (segments_from_end / RING_HIGHLIGHT_SEGMENTS)
+            colors.append(_mix(base, highlight, highlight_factor))
+        else:
+            colors.append(base)
+    return colors
+
+
+def _color_runs(colors: List[RGB]) -> List[Tuple[int, int, RGB]]:
+    """把相邻的同色段合并为 (起始段, 结束段, 颜色)"""
+    runs = []
+    start = 0
+    for i in range(1, len(colors) + 1):
+        if i == len(colors) or colors[i] != colors[start]:
+            runs.append((start, i, colors[start]))
+            start = i
+    return runs
+
+
+def render_progress_ring(radius: int, line_width: int, percent: float, color: str,
+                         complete: bool = False, highlight_count: Optional[int] = None) -> Optional[Image.Image]:
+    """
+    绘制进度圆环（发光层 + 末端高亮的主圆环），返回抗锯齿的RGBA图像
+
+    图像中心即圆心，参数含义见 ring_segment_colors
+
+    Returns:
+        PIL图像，没有需要绘制的段（0%）时返回None
+    """
+    colors = ring_segment_colors(percent, color, complete, highlight_count)
+    if not colors:
+        return None
+
+    strong_glow = complete or highlight_count is not None
+    glow_layers = _COMPLETE_GLOW_LAYERS if strong_glow else _GLOW_LAYERS
+    max_width = line_width + max(extra for extra, _ in glow_layers)
+    half = int(math.ceil(radius + max_width / 2)) + 2
+    size = half * 2
+
+    scale = RING_SUPERSAMPLE
+    image = Image.new("RGBA", (size * scale, size * scale), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    center = half * scale
+    runs = _color_runs(colors)
+    num_segments = len(colors)
+
+    def draw_band(width: float, color_of) -> None:
+        """沿圆环绘制一层（每段颜色由color_of给出，两端为圆头）"""
+        outer = (radius + width / 2) * scale
+        bbox = (center - outer, center - outer, center + outer, center + outer)
+        band_width = max(1, int(round(width * scale)))
+        for index, (start, end, run_color) in enumerate(runs):
+            # PIL的角度从3点钟方向顺时针计算，圆环从12点钟方向开始
+            start_angle = -90 + start * _ANGLE_PER_SEGMENT
+            end_angle = -90 + end * _ANGLE_PER_SEGMENT
+            if index < len(runs) - 1:
+                end_angle += 0.5  # 与下一段略微重叠，避免接缝
+            draw.arc(bbox, start_angle, end_angle, fill=color_of(run_color), width=band_width)
+        # 两端的圆头
+        cap_radius = width / 2 * scale
+        for angle, cap_color in ((-90, colors[0]), (-90 + num_segments * _ANGLE_PER_SEGMENT, colors[-1])):
+            x = center + radius * scale * math.cos(math.radians(angle))
+            y = center + radius * scale * math.sin(math.radians(angle))
+            draw.ellipse((x - cap_radius, y - cap_radius, x + cap_radius, y + cap_radius),
+                         fill=color_of(cap_color))
+
+    # 第一步：发光效果（外层光晕，从最外层开始）
+    for extra_width, lighten_factor in glow_layers:
+        draw_band(line_width + extra_width, lambda c, f=lighten_factor: _lighten(c, f))
+    # 第二步：主进度条
+    draw_band(line_width, lambda c: c)
+
+    return image.reduce(scale)
+
+
+class RingSpriteCache:
+    """
+    进度圆环图像缓存：每种 (半径, 线宽, 百分比, 颜色, 高亮状态) 只绘制一次，
+    动画的每一帧只需要查表并切换Canvas图像
+    """
+
+    def __init__(self, max_entries: int = RING_SPRITE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._sprites: "OrderedDict[tuple, Optional[ImageTk.PhotoImage]]" = OrderedDict()
+
+    def get(self, radius: int, line_width: int, percent: float, color: str,
+            complete: bool = False, highlight_count: Optional[int] = None) -> Optional[ImageTk.PhotoImage]:
+        """
+        获取圆环图像（不存在时绘制并缓存）
+
+        Returns:
+            PhotoImage，0%时返回None
+        """
+        rounded_percent = min(100, round(percent))
+        complete = complete and rounded_percent >= 100
+        key = (radius, line_width, rounded_percent, color, complete, highlight_count)
+        if key in self._sprites:
+            self._sprites.move_to_end(key)
+            return self._sprites[key]
+
+        image = render_progress_ring(radius, line_width, rounded_percent, color, complete, highlight_count)
+        sprite = ImageTk.PhotoImage(image) if image is not None else None
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.max_entries:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._sprites.clear()
@@ -4,25 +4,89 @@ import json
 import urllib.parse
 import os
 import platform
-import math
 import time
 from translations import TRANSLATIONS
 from utils import set_window_icon
-from styles import get_cjk_font, init_styles, Colors, ease_out_cubic, Debouncer
+from styles import get_cjk_font, init_styles, Colors, ease_out_cubic, Debouncer, ThrottledUpdater
 import re
 import random
 import string
+from storage_events import EVENT_SAVE_CHANGED, EVENT_FILE_CHANGED
+from text_layout import wrap_text, text_width as layout_text_width
+from card_viewport import CardViewport
+from ring_sprites import RingSpriteCache, RING_TOTAL_SEGMENTS, RING_HIGHLIGHT_SEGMENTS
+from save_stats import SaveStats, TOTAL_OMAKES, TOTAL_GALLERY, TOTAL_NG_SCENE
+from dependency_index import DependencyIndex
 
 
 class SaveAnalyzer:
-    # 固定的 omakes 总数列表
-    TOTAL_OMAKES = ["1", "3", "5", "10", "15", "17", "21", "22", "9", "4", "19", "20", "23", "2", "8", "7", "6", "11", "12", "13", "14", "16", "18", "24", "26", "33", "25", "31", "38", "39", "41", "40", "42", "43", "44", "32"]
+    # 固定的 omakes 总数列表（定义见 save_stats）
+    TOTAL_OMAKES = TOTAL_OMAKES
     
-    # 固定的 gallery 总数列表
-    TOTAL_GALLERY = ["kupya_kaisou", "JU", "fuga_kaisou", "Lamia", "BBB_1", "BBB_2", "DE", "me", "kaisou", "end", "BBB_3", "NA", "yume", "ma", "D", "pa", "geki", "debi", "NISU", "amo", "mane", "DR", "BBB"]
+    # 固定的 gallery 总数列表（定义见 save_stats）
+    TOTAL_GALLERY = TOTAL_GALLERY
     
-    # 固定的 ngScene 总数列表
-    TOTAL_NG_SCENE = ["geki", "yume_kupya", "yume_debi", "neodebi", "koumori", "BBB", "amo", "naza", "mane", "DR", "hade", "debi", "gauru"]
+    # 存档信息区域的 widget_key → 它所显示的值依赖的存档路径（实时更新时只更新依赖变化路径的 widget）
+    # 路径为空的 widget 显示固定值；"fanatic_related" 表示狂信徒section的位置和样式
+    INFO_WIDGET_DEPENDENCIES = {
+        "memory.name": ("memory.name",),
+        "memory.seibetu": ("memory.seibetu",),
+        "memory.hutanari": ("memory.hutanari",),
+        "memory.cameraEnable": ("memory.cameraEnable",),
+        "memory.yubiwa": ("memory.yubiwa",),
+        "endings.count": ("endings",),
+        "collectedEndings.count": ("collectedEndings",),
+        "missing_endings": ("endings", "collectedEndings"),
+        "stickers.total": (),
+        "sticker.count": ("sticker",),
+        "missing_stickers.count": ("sticker",),
+        "missing_stickers": ("sticker",),
+        "characters.count": ("characters",),
+        "collectedCharacters.count": ("collectedCharacters",),
+        "missing_characters": ("characters", "collectedCharacters"),
+        "omakes.count": (),
+        "collected_omakes.count": ("omakes",),
+        "missing_omakes": ("omakes",),
+        "gallery.count": ("gallery",),
+        "ngScene.count": ("ngScene",),
+        "wholeTotalMP": ("wholeTotalMP",),
+        "judgeCounts.perfect": ("judgeCounts.perfect",),
+        "judgeCounts.good": ("judgeCounts.good",),
+        "judgeCounts.bad": ("judgeCounts.bad",),
+        "secretEndOpen": ("secretEndOpen",),
+        "trueCount": ("trueCount",),
+        "epilogue": ("epilogue",),
+        "loopCount": ("loopCount",),
+        "loopRecord": ("loopRecord",),
+        "NEO": ("NEO",),
+        "Lamia_noroi": ("Lamia_noroi",),
+        "trauma": ("trauma",),
+        "killWarning": ("killWarning",),
+        "killed": ("killed",),
+        "kill": ("kill",),
+        "saveListNo": ("saveListNo",),
+        "albumPageNo": ("albumPageNo",),
+        "desu": ("desu",),
+        "system.autosave": ("system.autosave",),
+        "fullscreen": ("fullscreen",),
+        "fanatic_related": ("kill", "killed"),
+    }
+    
+    # 存档信息区域用到的顶层键（实时更新时只有这些键变化才更新）
+    INFO_PANEL_KEYS = frozenset(path.split(".")[0] for paths in INFO_WIDGET_DEPENDENCIES.values() for path in paths)
+    
+    # 统计面板用到的顶层键（另外还会读取 NEO.sav）
+    STATS_PANEL_KEYS = frozenset(["kill", "killed", "sticker", "wholeTotalMP", "judgeCounts"])
+    
+    # 实时更新的最小间隔（毫秒）
+    LIVE_UPDATE_INTERVAL_MS = 500
+    
+    # 乱码效果的刷新间隔（毫秒）和每个文本预先生成的乱码变体数量
+    GIBBERISH_INTERVAL_MS = 150
+    GIBBERISH_VARIANTS = 16
+    
+    # 固定的 ngScene 总数列表（定义见 save_stats）
+    TOTAL_NG_SCENE = TOTAL_NG_SCENE
     
     def __init__(self, parent, storage_dir, translations, current_language):
         self.parent = parent
@@ -38,6 +102,10 @@ class SaveAnalyzer:
             window_width = 800
         self._cached_width = int(window_width * 2 / 3)
         self._width_update_pending = False
+        self._ring_sprites = RingSpriteCache()  # 进度圆环图像缓存
+        self._save_stats_snapshot = None  # (存档数据对象, SaveStats)，同一份快照只计算一次统计
+        self._info_dependency_index = DependencyIndex(self.INFO_WIDGET_DEPENDENCIES)  # 存档路径 → 存档信息 widget
+        self._gibberish_variants = {}  # 原始文本 -> 预先生成的乱码变体
         
         control_frame = tk.Frame(self.window, bg=Colors.WHITE)
         control_frame.pack(fill="x", padx=10, pady=5)
@@ -364,14 +432,7 @@ class SaveAnalyzer:
             self._gibberish_update_job = None
         
         # 取消统计面板动画定时器
-        if hasattr(self, '_stats_widgets'):
-            sticker_canvas = self._stats_widgets.get('sticker_canvas')
-            if sticker_canvas and hasattr(sticker_canvas, '_animation_job') and sticker_canvas._animation_job:
-                try:
-                    self.window.after_cancel(sticker_canvas._animation_job)
-                except:
-                    pass
-                sticker_canvas._animation_job = None
+        self._cancel_stats_animation()
         
         # 更新按钮文本（语言切换时）
         if hasattr(self, 'show_var_names_checkbox'):
@@ -428,25 +489,42 @@ class SaveAnalyzer:
             # 使用增量更新（display_save_info 内部会判断是否已初始化）
             self.display_save_info(self.scrollable_frame, self.save_data)
             # 更新统计面板（使用存储的容器引用）
-            if hasattr(self, '_stats_container') and self._stats_container:
-                # 检查容器是否仍然有效
+            self._refresh_statistics_panel(self.save_data)
+        else:
+            # 如果存档文件不存在或加载失败
+            if self._is_initialized:
+                # 已初始化：不销毁现有内容，只显示错误提示（可选）
+                # 这里可以选择不显示错误，或者显示一个临时错误提示
+                pass
+            else:
+                # 首次加载失败：清除内容并显示错误信息
+                for widget in self.scrollable_frame.winfo_children():
+                    widget.destroy()
+                error_label = ttk.Label(self.scrollable_frame, text=self.t("save_file_not_found"), 
+                                       font=get_cjk_font(12), foreground="red")
+                error_label.pack(pady=20)
+            self.save_data = None
+    
+    def _cancel_stats_animation(self):
+        """取消统计面板的贴纸进度动画定时器"""
+        if hasattr(self, '_stats_widgets'):
+            sticker_canvas = self._stats_widgets.get('sticker_canvas')
+            if sticker_canvas and hasattr(sticker_canvas, '_animation_job') and sticker_canvas._animation_job:
                 try:
-                    if self._stats_container.winfo_exists():
-                        self.update_statistics_panel(self._stats_container, self.save_data)
-                    else:
-                        # 容器已被销毁，清除引用并重新创建
-                        self._stats_container = None
-                        if hasattr(self, '_right_frame') and self._right_frame:
-                            try:
-                                if self._right_frame.winfo_exists():
-                                    self.create_statistics_panel(self._right_frame)
-                                    # 重新创建后，使用新的容器引用更新
-                                    if hasattr(self, '_stats_container') and self._stats_container:
-                                        self.update_statistics_panel(self._stats_container, self.save_data)
-                            except:
-                                pass
+                    self.window.after_cancel(sticker_canvas._animation_job)
                 except:
-                    # 容器引用无效，清除引用并尝试重新创建
+                    pass
+                sticker_canvas._animation_job = None
+    
+    def _refresh_statistics_panel(self, save_data):
+        """更新统计面板（容器已被销毁时重新创建）"""
+        if hasattr(self, '_stats_container') and self._stats_container:
+            # 检查容器是否仍然有效
+            try:
+                if self._stats_container.winfo_exists():
+                    self.update_statistics_panel(self._stats_container, save_data)
+                else:
+                    # 容器已被销毁，清除引用并重新创建
                     self._stats_container = None
                     if hasattr(self, '_right_frame') and self._right_frame:
                         try:
@@ -454,34 +532,32 @@ class SaveAnalyzer:
                                 self.create_statistics_panel(self._right_frame)
                                 # 重新创建后，使用新的容器引用更新
                                 if hasattr(self, '_stats_container') and self._stats_container:
-                                    self.update_statistics_panel(self._stats_container, self.save_data)
+                                    self.update_statistics_panel(self._stats_container, save_data)
                         except:
                             pass
-            else:
-                # 如果容器不存在，尝试重新创建
+            except:
+                # 容器引用无效，清除引用并尝试重新创建
+                self._stats_container = None
                 if hasattr(self, '_right_frame') and self._right_frame:
                     try:
                         if self._right_frame.winfo_exists():
                             self.create_statistics_panel(self._right_frame)
                             # 重新创建后，使用新的容器引用更新
                             if hasattr(self, '_stats_container') and self._stats_container:
-                                self.update_statistics_panel(self._stats_container, self.save_data)
+                                self.update_statistics_panel(self._stats_container, save_data)
                     except:
                         pass
         else:
-            # 如果存档文件不存在或加载失败
-            if self._is_initialized:
-                # 已初始化：不销毁现有内容，只显示错误提示（可选）
-                # 这里可以选择不显示错误，或者显示一个临时错误提示
-                pass
-            else:
-                # 首次加载失败：清除内容并显示错误信息
-                for widget in self.scrollable_frame.winfo_children():
-                    widget.destroy()
-                error_label = ttk.Label(self.scrollable_frame, text=self.t("save_file_not_found"), 
-                                       font=get_cjk_font(12), foreground="red")
-                error_label.pack(pady=20)
-            self.save_data = None
+            # 如果容器不存在，尝试重新创建
+            if hasattr(self, '_right_frame') and self._right_frame:
+                try:
+                    if self._right_frame.winfo_exists():
+                        self.create_statistics_panel(self._right_frame)
+                        # 重新创建后，使用新的容器引用更新
+                        if hasattr(self, '_stats_container') and self._stats_container:
+                            self.update_statistics_panel(self._stats_container, save_data)
+                except:
+                    pass
     
     def t(self, key, **kwargs):
         """翻译函数"""
@@ -490,6 +566,107 @@ class SaveAnalyzer:
             return text.format(**kwargs)
         return text
     
+    def attach_event_bus(self, event_bus):
+        """
+        订阅存档变化事件，游戏写入存档后自动更新显示
+        
+        Args:
+            event_bus: storage_events.EventBus 实例
+        """
+        self.detach_event_bus()
+        self._live_updater = ThrottledUpdater(self.window, self.LIVE_UPDATE_INTERVAL_MS)
+        self._pending_save_data = None
+        self._pending_changed_paths = set()
+        self._pending_neo_changed = False
+        self._event_unsubscribers = [
+            event_bus.subscribe(EVENT_SAVE_CHANGED, self._on_storage_event),
+            event_bus.subscribe(EVENT_FILE_CHANGED, self._on_storage_event),
+        ]
+    
+    def detach_event_bus(self):
+        """取消订阅存档变化事件"""
+        for unsubscribe in getattr(self, '_event_unsubscribers', []):
+            unsubscribe()
+        self._event_unsubscribers = []
+        updater = getattr(self, '_live_updater', None)
+        if updater is not None:
+            updater.cancel()
+    
+    def _on_storage_event(self, event):
+        """存档文件事件回调：记录最新数据，按固定最大频率应用（统计面板还会读取NEO.sav）"""
+        if event.type == EVENT_SAVE_CHANGED:
+            if not isinstance(event.data, dict):
+                return
+            self._pending_save_data = event.data
+            # 合并两次应用之间的所有变化路径（没有变化记录时为None，表示全部更新）
+            if event.changes is None or self._pending_changed_paths is None:
+                self._pending_changed_paths = None
+            else:
+                self._pending_changed_paths.update(change.path for change in event.changes)
+        elif event.filename == 'NEO.sav':
+            self._pending_neo_changed = True
+        else:
+            return
+        try:
+            if not self.window.winfo_exists():
+                return
+        except Exception:
+            return
+        self._live_updater.update(self._apply_live_update)
+    
+    def _apply_live_update(self):
+        """
+        应用监控线程推送的最新存档数据：直接使用已解析的数据，不重新读取文件，
+        只更新变化的键所涉及的区域
+        """
+        new_data = self._pending_save_data
+        changed_paths = self._pending_changed_paths
+        neo_changed = self._pending_neo_changed
+        self._pending_save_data = None
+        self._pending_changed_paths = set()
+        self._pending_neo_changed = False
+        
+        old_data = getattr(self, 'save_data', None)
+        if not self._is_initialized or not old_data:
+            # 尚未显示过存档，走完整刷新
+            self.refresh()
+            return
+        
+        if new_data is None:
+            new_data = old_data
+            changed_keys = set()
+            changed_paths = set()
+        else:
+            changed_keys = {key for key in old_data.keys() | new_data.keys()
+                            if old_data.get(key) != new_data.get(key)}
+            if changed_paths is not None:
+                # 被忽略规则排除的变化不在监控的变化记录中，按整个顶层键处理
+                reported_keys = {path[0] for path in changed_paths if path}
+                changed_paths |= {(key,) for key in changed_keys - reported_keys}
+        
+        self.save_data = new_data
+        
+        if changed_keys & self.INFO_PANEL_KEYS:
+            self._update_save_info_incremental(new_data, changed_paths)
+        
+        if neo_changed or changed_keys & self.STATS_PANEL_KEYS:
+            self._cancel_stats_animation()
+            self._refresh_statistics_panel(new_data)
+    
+    def _get_save_stats(self, save_data):
+        """
+        获取存档快照的统计数据
+        
+        每次加载或实时更新都会得到新的存档字典，且不会被原地修改，
+        所以按对象身份缓存最近一份快照的结果即可，统计面板和存档信息区域共享
+        """
+        snapshot = self._save_stats_snapshot
+        if snapshot is not None and snapshot[0] is save_data:
+            return snapshot[1]
+        stats = SaveStats(save_data)
+        self._save_stats_snapshot = (save_data, stats)
+        return stats
+    
     def load_save_file(self):
         """加载并解码存档文件"""
         sf_path = os.path.join(self.storage_dir, 'DevilConnection_sf.sav')
@@ -542,55 +719,14 @@ class SaveAnalyzer:
         )
         placeholder.pack(pady=50)
     
-    def _interpolate_color(self, color1, color2, factor):
-        """在两个颜色之间进行线性插值
-        
-        Args:
-            color1: 起始颜色 (hex格式，如 "#RRGGBB")
-            color2: 结束颜色 (hex格式)
-            factor: 插值因子 (0.0 = color1, 1.0 = color2)
-        
-        Returns:
-            插值后的颜色 (hex格式)
-        """
-        # 解析颜色
-        r1 = int(color1[1:3], 16)
-        g1 = int(color1[3:5], 16)
-        b1 = int(color1[5:7], 16)
-        
-        r2 = int(color2[1:3], 16)
-        g2 = int(color2[3:5], 16)
-        b2 = int(color2[5:7], 16)
-        
-        # 线性插值
-        r = int(r1 + (r2 - r1) * factor)
-        g = int(g1 + (g2 - g1) * factor)
-        b = int(b1 + (b2 - b1) * factor)
-        
-        # 确保在有效范围内
-        r = max(0, min(255, r))
-        g = max(0, min(255, g))
-        b = max(0, min(255, b))
-        
-        return f"#{r:02x}{g:02x}{b:02x}"
-    
-    def _lighten_color(self, color, factor=0.3):
-        """将颜色变浅（用于发光效果）
-        
-        Args:
-            color: 原始颜色 (hex格式)
-            factor: 变浅程度 (0.0 = 不变, 1.0 = 纯白)
-        
-        Returns:
-            变浅后的颜色 (hex格式)
-        """
-        return self._interpolate_color(color, "#FFFFFF", factor)
-    
     def _draw_progress_ring(self, canvas, center_x, center_y, radius, line_width, 
                            current_percent, progress_color, tag="progress", 
-                           skip_full_highlight=False):
+                           skip_full_highlight=False, highlight_count=None):
         """绘制进度圆环（支持动画、末端高亮和发光效果）
         
+        圆环按 (百分比, 颜色, 尺寸, 高亮状态) 渲染为抗锯齿图像并缓存，
+        动画的每一帧只是切换Canvas上同一个图像项目显示的图像
+        
         Args:
             canvas: tkinter Canvas对象
             center_x, center_y: 圆心坐标
@@ -600,136 +736,30 @@ class SaveAnalyzer:
             progress_color: 进度主颜色
             tag: 用于标记进度元素的tag，方便清除
             skip_full_highlight: 100%时是否跳过整体高亮（用于庆祝动画前）
+            highlight_count: 庆祝动画中从起点开始已高亮的段数（None表示普通绘制）
         """
-        # 清除旧的进度元素（包括光晕）
-        canvas.delete(tag)
-        canvas.delete(f"{tag}_glow")
-        
-        # 计算进度（四舍五入到1%精度）
-        rounded_percent = round(current_percent)
-        if rounded_percent >= 100:
-            num_segments = 99  # 99个1%段，留出1%的空隙（约3.6度）
-        else:
-            num_segments = rounded_percent  # 每1%一段
-        
-        if num_segments <= 0:
+        sprite = self._ring_sprites.get(radius, line_width, current_percent, progress_color,
+                                        complete=not skip_full_highlight,
+                                        highlight_count=highlight_count)
+        items = canvas.find_withtag(tag)
+        if sprite is None:
+            # 0%：没有需要绘制的段
+            canvas.delete(tag)
+            canvas._ring_sprite = None
             return
         
-        # 每1%对应的角度
-        angle_per_segment = 360 / 100  # 3.6度
-        
-        # 判断是否100%达成（且不跳过整体高亮）
-        is_complete = rounded_percent >= 100 and not skip_full_highlight
-        
-        # 高亮颜色（更亮的版本）
-        highlight_color = self._lighten_color(progress_color, 0.35)
-        
-        # 末端高亮的段数（最后8段会逐渐变亮）
-        highlight_segments = 8
-        
-        # ========== 第一步：绘制发光效果（外层光晕）==========
-        # 发光层：更宽、更透明的圆弧，在主进度条外围
-        if is_complete:
-            # 100%时：整体强发光
-            glow_layers = [
-                (8, 0.75),   # 更大范围
-                (5, 0.55),   
-                (3, 0.35),   # 更亮的光晕
-            ]
+        if items:
+            canvas.itemconfigure(items[0], image=sprite)
+            canvas.coords(items[0], center_x, center_y)
+            if len(items) > 1:
+                canvas.delete(*items[1:])
         else:
-            # 普通发光
-            glow_layers = [
-                (6, 0.85),   # (额外宽度, 变浅程度) - 最外层，最淡
-                (4, 0.70),   # 中间层
-                (2, 0.50),   # 内层，较亮
-            ]
-        
-        for extra_width, lighten_factor in glow_layers:
-            glow_width = line_width + extra_width
-            for i in range(num_segments):
-                # 决定当前段是否需要高亮
-                if is_complete:
-                    # 100%：整体使用高亮色的光晕
-                    glow_color = self._lighten_color(highlight_color, lighten_factor)
-                else:
-                    # 非100%：末端几段使用高亮色光晕
-                    segments_from_end = num_segments - 1 - i
-                    if segments_from_end < highlight_segments:
-                        # 末端高亮：越靠近末端越亮
-                        highlight_factor = 1 - (segments_from_end / highlight_segments)
-                        base_color = self._interpolate_color(progress_color, highlight_color, highlight_factor)
-                        glow_color = self._lighten_color(base_color, lighten_factor)
-                    else:
-                        glow_color = self._lighten_color(progress_color, lighten_factor)
-                
-                # 计算当前段的起始角度（从顶部90度开始，顺时针）
-                start_angle = 90 - (i * angle_per_segment)
-                end_angle = 90 - ((i + 1) * angle_per_segment)
-                
-                # 转换为弧度
-                start_angle_rad = math.radians(start_angle)
-                end_angle_rad = math.radians(end_angle)
-                
-                # 计算起点和终点坐标
-                start_x = center_x + radius * math.cos(start_angle_rad)
-                start_y = center_y - radius * math.sin(start_angle_rad)
-                end_x = center_x + radius * math.cos(end_angle_rad)
-                end_y = center_y - radius * math.sin(end_angle_rad)
-                
-                # 绘制光晕段
-                canvas.create_line(
-                    start_x, start_y,
-                    end_x, end_y,
-                    fill=glow_color,
-                    width=int(glow_width),
-                    capstyle=tk.ROUND,
-                    tags=f"{tag}_glow"
-                )
-        
-        # ========== 第二步：绘制主进度条（末端高亮）==========
-        # 多层绘制改善抗锯齿
-        for offset, width in [(0, line_width), (0.5, line_width - 1), (1, max(1, line_width - 2))]:
-            offset_radius = radius + offset
-            
-            # 绘制每一段
-            for i in range(num_segments):
-                # 决定当前段的颜色
-                if is_complete:
-                    # 100%：整体使用高亮色
-                    segment_color = highlight_color
-                else:
-                    # 非100%：末端几段逐渐变亮
-                    segments_from_end = num_segments - 1 - i
-                    if segments_from_end < highlight_segments:
-                        # 末端高亮：越靠近末端越亮
-                        highlight_factor = 1 - (segments_from_end / highlight_segments)
-                        segment_color = self._interpolate_color(progress_color, highlight_color, highlight_factor)
-                    else:
-                        segment_color = progress_color
-                
-                # 计算当前段的起始角度（从顶部90度开始，顺时针）
-                start_angle = 90 - (i * angle_per_segment)
-                end_angle = 90 - ((i + 1) * angle_per_segment)
-                
-                # 转换为弧度
-                start_angle_rad = math.radians(start_angle)
-                end_angle_rad = math.radians(end_angle)
-                
-                # 计算起点和终点坐标
-                start_x = center_x + offset_radius * math.cos(start_angle_rad)
-                start_y = center_y - offset_radius * math.sin(start_angle_rad)
-                end_x = center_x + offset_radius * math.cos(end_angle_rad)
-                end_y = center_y - offset_radius * math.sin(end_angle_rad)
-                
-                # 绘制直线段，添加tag
-                canvas.create_line(
-                    start_x, start_y,
-                    end_x, end_y,
-                    fill=segment_color,
-                    width=int(width),
-                    capstyle=tk.ROUND,
-                    tags=tag
-                )
+            item = canvas.create_image(center_x, center_y, image=sprite, anchor="center", tags=tag)
+            # 放在背景圆环之上、中心文字之下
+            if canvas.find_withtag("background_ring"):
+                canvas.tag_raise(item, "background_ring")
+        # Canvas持有当前图像的引用，图像被缓存淘汰后也不会被释放
+        canvas._ring_sprite = sprite
     
     def _animate_completion_celebration(self, canvas, center_x, center_y, radius, line_width, progress_color):
         """100%达成时的庆祝动画：高亮从末端逐渐蔓延到整个环
@@ -752,15 +782,11 @@ class SaveAnalyzer:
         animation_duration = 0.6  # 蔓延动画时长（秒）
         animation_start_time = time.time()
         
-        # 高亮颜色
-        highlight_color = self._lighten_color(progress_color, 0.35)
-        
         # 总段数（99段，留1%空隙）
-        total_segments = 99
-        angle_per_segment = 360 / 100
+        total_segments = RING_TOTAL_SEGMENTS
         
         # 末端高亮的段数（与 _draw_progress_ring 保持一致）
-        initial_highlight_segments = 8
+        initial_highlight_segments = RING_HIGHLIGHT_SEGMENTS
         
         def animate_spread():
             """蔓延动画循环"""
@@ -791,87 +817,12 @@ class SaveAnalyzer:
                 (total_segments - initial_highlight_segments) * eased_progress
             )
             
-            # 清除旧的进度元素
-            canvas.delete("progress")
-            canvas.delete("progress_glow")
-            
-            # ========== 绘制发光效果 ==========
-            glow_layers = [
-                (8, 0.75),   # 100%时的增强发光
-                (5, 0.55),   
-                (3, 0.35),
-            ]
-            
-            for extra_width, lighten_factor in glow_layers:
-                glow_width = line_width + extra_width
-                for i in range(total_segments):
-                    # 决定当前段是否高亮
-                    # 从起点开始顺时针蔓延，同时保留初始的末端高亮
-                    segments_from_end = total_segments - 1 - i
-                    is_highlighted = (i < current_highlight_count) or (segments_from_end < initial_highlight_segments)
-                    
-                    if is_highlighted:
-                        # 已被高亮蔓延到或末端高亮
-                        glow_color = self._lighten_color(highlight_color, lighten_factor)
-                    else:
-                        # 还未被蔓延到，使用普通颜色
-                        glow_color = self._lighten_color(progress_color, lighten_factor)
-                    
-                    # 计算角度
-                    start_angle = 90 - (i * angle_per_segment)
-                    end_angle = 90 - ((i + 1) * angle_per_segment)
-                    
-                    start_angle_rad = math.radians(start_angle)
-                    end_angle_rad = math.radians(end_angle)
-                    
-                    start_x = center_x + radius * math.cos(start_angle_rad)
-                    start_y = center_y - radius * math.sin(start_angle_rad)
-                    end_x = center_x + radius * math.cos(end_angle_rad)
-                    end_y = center_y - radius * math.sin(end_angle_rad)
-                    
-                    canvas.create_line(
-                        start_x, start_y,
-                        end_x, end_y,
-                        fill=glow_color,
-                        width=int(glow_width),
-                        capstyle=tk.ROUND,
-                        tags="progress_glow"
-                    )
-            
-            # ========== 绘制主进度条 ==========
-            for offset, width in [(0, line_width), (0.5, line_width - 1), (1, max(1, line_width - 2))]:
-                offset_radius = radius + offset
-                
-                for i in range(total_segments):
-                    # 决定当前段的颜色
-                    # 从起点开始顺时针蔓延，同时保留初始的末端高亮
-                    segments_from_end = total_segments - 1 - i
-                    is_highlighted = (i < current_highlight_count) or (segments_from_end < initial_highlight_segments)
-                    
-                    if is_highlighted:
-                        segment_color = highlight_color
-                    else:
-                        segment_color = progress_color
-                    
-                    start_angle = 90 - (i * angle_per_segment)
-                    end_angle = 90 - ((i + 1) * angle_per_segment)
-                    
-                    start_angle_rad = math.radians(start_angle)
-                    end_angle_rad = math.radians(end_angle)
-                    
-                    start_x = center_x + offset_radius * math.cos(start_angle_rad)
-                    start_y = center_y - offset_radius * math.sin(start_angle_rad)
-                    end_x = center_x + offset_radius * math.cos(end_angle_rad)
-                    end_y = center_y - offset_radius * math.sin(end_angle_rad)
-                    
-                    canvas.create_line(
-                        start_x, start_y,
-                        end_x, end_y,
-                        fill=segment_color,
-                        width=int(width),
-                        capstyle=tk.ROUND,
-                        tags="progress"
-                    )
+            # 绘制当前蔓延状态（增强发光）
+            self._draw_progress_ring(
+                canvas, center_x, center_y, radius, line_width,
+                100, progress_color, tag="progress",
+                highlight_count=current_highlight_count
+            )
             
             # 继续下一帧
             canvas._celebration_job = self.window.after(16, animate_spread)
@@ -929,26 +880,17 @@ class SaveAnalyzer:
         for widget in parent.winfo_children():
             widget.destroy()
         
-        # 检查狂信徒线条件
-        kill = save_data.get("kill", None)
-        killed = save_data.get("killed", None)
+        # 统计数据（同一份存档快照只计算一次）
+        stats = self._get_save_stats(save_data)
+        is_fanatic_route = stats.is_fanatic_route
+        total_stickers = stats.total_stickers
+        collected_stickers = stats.sticker_count
+        stickers_percent = stats.stickers_percent
         
-        is_fanatic_route = (
-            (kill is not None and kill == 1) or
-            (killed is not None and killed == 1)
-        )
-        
-        # 计算统计数据
-        stickers = set(save_data.get("sticker", []))
-        total_stickers = 132
-        collected_stickers = len(stickers)
-        stickers_percent = (collected_stickers / total_stickers * 100) if total_stickers > 0 else 0
-        
-        whole_total_mp = save_data.get("wholeTotalMP", 0)
-        judge_counts = save_data.get("judgeCounts", {})
-        perfect = judge_counts.get("perfect", 0)
-        good = judge_counts.get("good", 0)
-        bad = judge_counts.get("bad", 0)
+        whole_total_mp = stats.whole_total_mp
+        perfect = stats.perfect
+        good = stats.good
+        bad = stats.bad
         
         # 1. 贴纸统计环形图（使用 Canvas 绘制，改善抗锯齿）
         sticker_frame = tk.Frame(parent, bg=Colors.WHITE)
@@ -1366,26 +1308,17 @@ class SaveAnalyzer:
     
     def _update_statistics_panel_incremental(self, parent, save_data):
         """增量更新统计面板内容"""
-        # 检查狂信徒线条件
-        kill = save_data.get("kill", None)
-        killed = save_data.get("killed", None)
-        
-        is_fanatic_route = (
-            (kill is not None and kill == 1) or
-            (killed is not None and killed == 1)
-        )
-        
-        # 计算统计数据
-        stickers = set(save_data.get("sticker", []))
-        total_stickers = 132
-        collected_stickers = len(stickers)
-        stickers_percent = (collected_stickers / total_stickers * 100) if total_stickers > 0 else 0
-        
-        whole_total_mp = save_data.get("wholeTotalMP", 0)
-        judge_counts = save_data.get("judgeCounts", {})
-        perfect = judge_counts.get("perfect", 0)
-        good = judge_counts.get("good", 0)
-        bad = judge_counts.get("bad", 0)
+        # 统计数据（同一份存档快照只计算一次）
+        stats = self._get_save_stats(save_data)
+        is_fanatic_route = stats.is_fanatic_route
+        total_stickers = stats.total_stickers
+        collected_stickers = stats.sticker_count
+        stickers_percent = stats.stickers_percent
+        
+        whole_total_mp = stats.whole_total_mp
+        perfect = stats.perfect
+        good = stats.good
+        bad = stats.bad
         
         # 检查parent是否有效
         if not parent:
@@ -1783,129 +1716,124 @@ class SaveAnalyzer:
             self._update_gibberish_texts()
     
     def _generate_gibberish_text(self, original_text):
-        """生成乱码文本，将20-50%的字符替换为随机乱码"""
+        """生成乱码文本，将20-50%的字符替换为随机乱码
+        
+        每个原始文本只在第一次使用时生成 GIBBERISH_VARIANTS 个变体，
+        之后每次从中随机取一个，不再逐字符调用random
+        """
         if not original_text:
             return original_text
         
-        # 随机选择替换比例（20-50%）
-        replace_ratio = random.uniform(0.2, 0.5)
-        num_replace = max(1, int(len(original_text) * replace_ratio))
-        
-        # 随机选择要替换的位置
-        positions_to_replace = random.sample(range(len(original_text)), min(num_replace, len(original_text)))
-        
-        # 生成乱码文本
-        result = list(original_text)
-        printable_chars = string.printable  # 包含所有可打印字符
-        
-        for pos in positions_to_replace:
-            # 替换为随机可打印字符
-            result[pos] = random.choice(printable_chars)
-        
-        return ''.join(result)
+        variants = self._gibberish_variants.get(original_text)
+        if variants is None:
+            variants = []
+            length = len(original_text)
+            for _ in range(self.GIBBERISH_VARIANTS):
+                # 随机选择替换比例（20-50%）和要替换的位置
+                num_replace = min(length, max(1, int(length * random.uniform(0.2, 0.5))))
+                result = list(original_text)
+                for pos in random.sample(range(length), num_replace):
+                    # 替换为随机可打印字符
+                    result[pos] = random.choice(string.printable)
+                variants.append(''.join(result))
+            self._gibberish_variants[original_text] = variants
+        
+        return variants[random.randrange(len(variants))]
     
     def _update_gibberish_texts(self):
-        """更新所有文字为乱码效果"""
+        """更新所有文字为乱码效果（所有控件在同一次定时回调中更新，Canvas文字复用同一个项目）"""
+        # 保证同一时间只有一个定时器（重新启动时取消尚未执行的那个）
+        if getattr(self, '_gibberish_update_job', None) is not None:
+            try:
+                self.window.after_cancel(self._gibberish_update_job)
+            except:
+                pass
+            self._gibberish_update_job = None
         if not hasattr(self, '_gibberish_widgets') or not self._gibberish_widgets:
             return
         
-        for idx, widget_info in enumerate(self._gibberish_widgets):
-            if idx not in self._original_texts:
-                continue
-            
-            original_text = self._original_texts[idx]
-            gibberish_text = self._generate_gibberish_text(original_text)
-            
-            try:
-                if widget_info['type'] == 'canvas_text':
-                    # 更新Canvas文字：删除旧文字，创建新文字
-                    canvas = widget_info['canvas']
-                    try:
-                        canvas.delete(widget_info['text_id'])
-                    except:
+        # 狂信徒线使用深红色文字
+        dark_red_color = "#8b0000"
+        
+        # 页面不可见时（如切换到其他tab）跳过本次更新，只保留定时器
+        try:
+            visible = self.window.winfo_viewable()
+        except tk.TclError:
+            return
+        
+        if visible:
+            alive_widgets = []
+            alive_texts = {}
+            for idx, widget_info in enumerate(self._gibberish_widgets):
+                original_text = self._original_texts.get(idx)
+                try:
+                    if original_text is None:
                         pass
-                    # 使用保存的tag（以便清理时能被正确删除）
-                    text_tag = widget_info.get('tag', 'gibberish_text')
+                    elif widget_info['type'] == 'canvas_text':
+                        # 更新Canvas文字：直接修改原有项目
+                        widget_info['canvas'].itemconfigure(
+                            widget_info['text_id'],
+                            text=self._generate_gibberish_text(original_text),
+                            font=widget_info['font'],
+                            fill=widget_info['fill']
+                        )
                     
-                    # 创建新文字（带tags）
-                    new_text_id = canvas.create_text(
-                        widget_info['x'],
-                        widget_info['y'],
-                        text=gibberish_text,
-                        font=widget_info['font'],
-                        fill=widget_info['fill'],
-                        anchor=widget_info['anchor'],
-                        tags=text_tag
-                    )
-                    widget_info['text_id'] = new_text_id
-                
-                elif widget_info['type'] == 'tk_label':
-                    # 更新Label文字，在狂信徒线条件下使用深红色
-                    dark_red_color = "#8b0000"
-                    widget_info['widget'].config(text=gibberish_text, fg=dark_red_color)
-                
-                elif widget_info['type'] == 'judge_canvas':
-                    # 重新绘制判定统计Canvas
-                    canvas = widget_info['canvas']
-                    canvas.delete("all")  # 清除所有内容
-                    
-                    # 生成乱码文本
-                    perfect_text = self._generate_gibberish_text(f"{widget_info['perfect']:,}")
-                    good_text = self._generate_gibberish_text(f"{widget_info['good']:,}")
-                    bad_text = self._generate_gibberish_text(f"{widget_info['bad']:,}")
-                    full_text = f"{perfect_text} - {good_text} - {bad_text}"
+                    elif widget_info['type'] == 'tk_label':
+                        # 更新Label文字，在狂信徒线条件下使用深红色
+                        widget_info['widget'].configure(
+                            text=self._generate_gibberish_text(original_text),
+                            fg=dark_red_color
+                        )
                     
-                    # 重新计算位置
-                    font_obj = widget_info['font_obj']
-                    text_width = font_obj.measure(full_text)
-                    center_x = widget_info['canvas_width'] // 2
-                    current_x = center_x - text_width // 2
-                    
-                    # 狂信徒线使用深红色文字
-                    dark_red_color = "#8b0000"
-                    
-                    # 重新绘制文本
-                    perfect_width = font_obj.measure(perfect_text)
-                    canvas.create_text(
-                        current_x + perfect_width // 2, 12,
-                        text=perfect_text,
-                        font=get_cjk_font(10),
-                        fill=dark_red_color,
-                        anchor="center"
-                    )
-                    current_x += perfect_width + font_obj.measure(" - ")
-                    
-                    good_width = font_obj.measure(good_text)
-                    canvas.create_text(
-                        current_x + good_width // 2, 12,
-                        text=good_text,
-                        font=get_cjk_font(10),
-                        fill=dark_red_color,
-                        anchor="center"
-                    )
-                    current_x += good_width + font_obj.measure(" - ")
-                    
-                    bad_width = font_obj.measure(bad_text)
-                    canvas.create_text(
-                        current_x + bad_width // 2, 12,
-                        text=bad_text,
-                        font=get_cjk_font(10),
-                        fill=dark_red_color,
-                        anchor="center"
-                    )
-                    
-                    # 重新绘制分隔符
-                    sep_width = font_obj.measure(" - ")
-                    sep1_x = center_x - text_width // 2 + perfect_width
-                    sep2_x = sep1_x + sep_width + good_width
-                    canvas.create_text(sep1_x + sep_width // 2, 12, text=" - ", font=get_cjk_font(10), fill=dark_red_color, anchor="center")
-                    canvas.create_text(sep2_x + sep_width // 2, 12, text=" - ", font=get_cjk_font(10), fill=dark_red_color, anchor="center")
-            except Exception as e:
-                # 如果widget已被销毁，忽略错误
-                pass
+                    elif widget_info['type'] == 'judge_canvas':
+                        self._update_gibberish_judge_canvas(widget_info, dark_red_color)
+                except tk.TclError:
+                    # widget已被销毁，之后不再更新
+                    continue
+                if original_text is not None:
+                    alive_texts[len(alive_widgets)] = original_text
+                alive_widgets.append(widget_info)
+            
+            if len(alive_widgets) != len(self._gibberish_widgets):
+                self._gibberish_widgets = alive_widgets
+                self._original_texts = alive_texts
+                if not alive_widgets:
+                    return
+        
+        self._gibberish_update_job = self.window.after(self.GIBBERISH_INTERVAL_MS, self._update_gibberish_texts)
+    
+    def _update_gibberish_judge_canvas(self, widget_info, color):
+        """更新判定统计Canvas的乱码文字（第一次时创建文字项目，之后只修改文字和位置）"""
+        canvas = widget_info['canvas']
+        font = get_cjk_font(10)
+        item_ids = widget_info.get('item_ids')
+        if item_ids is None:
+            # 清除原有内容，创建5个文字项目：3个数值和2个分隔符
+            canvas.delete("all")
+            item_ids = [canvas.create_text(0, 12, text="", font=font, fill=color, anchor="center")
+                        for _ in range(5)]
+            widget_info['item_ids'] = item_ids
         
-        # 150ms后再次更新
-        self._gibberish_update_job = self.window.after(150, self._update_gibberish_texts)
+        # 生成乱码文本
+        perfect_text = self._generate_gibberish_text(f"{widget_info['perfect']:,}")
+        good_text = self._generate_gibberish_text(f"{widget_info['good']:,}")
+        bad_text = self._generate_gibberish_text(f"{widget_info['bad']:,}")
+        separator = " - "
+        
+        # 重新计算位置（居中）
+        perfect_width = layout_text_width(perfect_text, font)
+        good_width = layout_text_width(good_text, font)
+        bad_width = layout_text_width(bad_text, font)
+        sep_width = layout_text_width(separator, font)
+        total_width = perfect_width + good_width + bad_width + sep_width * 2
+        current_x = widget_info['canvas_width'] // 2 - total_width // 2
+        
+        for item_id, (text, width) in zip(item_ids, [(perfect_text, perfect_width), (separator, sep_width),
+                                                    (good_text, good_width), (separator, sep_width),
+                                                    (bad_text, bad_width)]):
+            canvas.coords(item_id, current_x + width // 2, 12)
+            canvas.itemconfigure(item_id, text=text)
+            current_x += width
     
     def create_section(self, parent, title, bg_color=None, text_color=None, title_key=None):
         """创建带标题的分区
@@ -2310,14 +2238,9 @@ class SaveAnalyzer:
         # 获取memory数据（在多个地方使用）
         memory = save_data.get("memory", {})
         
-        # 检查狂信徒线条件
-        kill = save_data.get("kill", None)
-        killed = save_data.get("killed", None)
-        
-        is_fanatic_route = (
-            (kill is not None and kill == 1) or
-            (killed is not None and killed == 1)
-        )
+        # 统计数据（同一份存档快照只计算一次，与统计面板共享）
+        stats = self._get_save_stats(save_data)
+        is_fanatic_route = stats.is_fanatic_route
         
         # 如果满足狂信徒线条件，先创建狂信徒section（移到最顶端）
         if is_fanatic_route:
@@ -2359,9 +2282,9 @@ class SaveAnalyzer:
                                            self.t("kill_count_tooltip"), "kill", "kill", text_color=dark_red_text)
         
         # 1. 结局统计 + "查看达成条件"按钮
-        endings = set(save_data.get("endings", []))
-        collected_endings = set(save_data.get("collectedEndings", []))
-        missing_endings = sorted(endings - collected_endings, key=lambda x: int(x) if x.isdigit() else 999)
+        endings = stats.endings
+        collected_endings = stats.collected_endings
+        missing_endings = stats.missing_endings
         
         endings_section = self.create_section_with_button(
             parent, 
@@ -2390,13 +2313,11 @@ class SaveAnalyzer:
         }
         
         # 3. 贴纸统计 + "查看达成条件"按钮
-        stickers = set(save_data.get("sticker", []))
-        # 总共132个贴纸，编号1-133，没有82
-        all_sticker_ids = set(range(1, 82)) | set(range(83, 134))  # 1-81, 83-133
-        stickers_count = len(stickers)
-        total_stickers = 132
-        missing_stickers = sorted(all_sticker_ids - stickers)
-        collected_stickers = sorted(stickers)
+        stickers = stats.stickers
+        stickers_count = stats.sticker_count
+        total_stickers = stats.total_stickers
+        missing_stickers = stats.missing_stickers
+        collected_stickers = stats.collected_stickers
         
         stickers_section = self.create_section_with_button(
             parent, 
@@ -2430,12 +2351,9 @@ class SaveAnalyzer:
         )
         self._section_map["characters_statistics"] = characters_section
         
-        # 过滤掉空字符串和空白字符
-        characters = set(c for c in save_data.get("characters", []) if c and c.strip())
-        collected_characters = set(c for c in save_data.get("collectedCharacters", []) if c and c.strip())
-        characters_count = max(0, len(characters))
-        collected_characters_count = max(0, len(collected_characters))
-        missing_characters = sorted(characters - collected_characters)
+        characters_count = len(stats.characters)
+        collected_characters_count = len(stats.collected_characters)
+        missing_characters = list(stats.missing_characters)
         
         self.add_info_line(characters_section, self.t("total_characters"), characters_count, "characters", "characters.count")
         self.add_info_line(characters_section, self.t("collected_characters"), collected_characters_count, "collectedCharacters", "collectedCharacters.count")
@@ -2469,12 +2387,9 @@ class SaveAnalyzer:
         )
         self._section_map["omakes_statistics"] = omakes_section
         
-        # omakes 是已收集的额外内容列表
-        collected_omakes = set(save_data.get("omakes", []))
-        collected_omakes_count = len(collected_omakes)
-        total_omakes_set = set(self.TOTAL_OMAKES)
-        total_omakes_count = len(total_omakes_set)
-        missing_omakes = sorted(total_omakes_set - collected_omakes, key=lambda x: int(x) if x.isdigit() else 999)
+        collected_omakes_count = len(stats.collected_omakes)
+        total_omakes_count = stats.total_omakes_count
+        missing_omakes = stats.missing_omakes
         
         # 显示总数和已收集数量
         self.add_info_line(omakes_section, self.t("total_omakes"), total_omakes_count, None, "omakes.count")
@@ -2492,16 +2407,9 @@ class SaveAnalyzer:
         }
         
         # 画廊数量和NG场景数移到额外内容统计
-        gallery = save_data.get("gallery", [])
-        gallery_count = len(gallery)
-        total_gallery_count = len(self.TOTAL_GALLERY)
-        gallery_display = f"{gallery_count}/{total_gallery_count}"
-        self.add_info_line(omakes_section, self.t("gallery_count"), gallery_display, "gallery", "gallery.count")
-        
-        ng_scene = save_data.get("ngScene", [])
-        ng_scene_count = len(ng_scene)
-        total_ng_scene_count = len(self.TOTAL_NG_SCENE)
-        ng_scene_display = f"{ng_scene_count}/{total_ng_scene_count}"
+        self.add_info_line(omakes_section, self.t("gallery_count"), stats.gallery_display, "gallery", "gallery.count")
+        
+        ng_scene_display = stats.ng_scene_display
         try:
             ng_scene_tooltip = self.t("ng_scene_count_tooltip")
             self.add_info_line_with_tooltip(omakes_section, self.t("ng_scene_count"), ng_scene_display, ng_scene_tooltip, "ngScene", "ngScene.count")
@@ -2512,16 +2420,10 @@ class SaveAnalyzer:
         stats_section = self.create_section(parent, self.t("game_statistics"), title_key="game_statistics")
         self._section_map["game_statistics"] = stats_section
         
-        whole_total_mp = save_data.get("wholeTotalMP", 0)
-        self.add_info_line(stats_section, self.t("total_mp"), whole_total_mp, "wholeTotalMP", "wholeTotalMP")
-        
-        judge_counts = save_data.get("judgeCounts", {})
-        perfect = judge_counts.get("perfect", 0)
-        good = judge_counts.get("good", 0)
-        bad = judge_counts.get("bad", 0)
-        self.add_info_line(stats_section, self.t("judge_perfect"), perfect, "judgeCounts.perfect", "judgeCounts.perfect")
-        self.add_info_line(stats_section, self.t("judge_good"), good, "judgeCounts.good", "judgeCounts.good")
-        self.add_info_line(stats_section, self.t("judge_bad"), bad, "judgeCounts.bad", "judgeCounts.bad")
+        self.add_info_line(stats_section, self.t("total_mp"), stats.whole_total_mp, "wholeTotalMP", "wholeTotalMP")
+        self.add_info_line(stats_section, self.t("judge_perfect"), stats.perfect, "judgeCounts.perfect", "judgeCounts.perfect")
+        self.add_info_line(stats_section, self.t("judge_good"), stats.good, "judgeCounts.good", "judgeCounts.good")
+        self.add_info_line(stats_section, self.t("judge_bad"), stats.bad, "judgeCounts.bad", "judgeCounts.bad")
         
         secret_end_open = save_data.get("secretEndOpen", 0)
         self.add_info_line(stats_section, self.t("secret_end_open"), secret_end_open, "secretEndOpen", "secretEndOpen")
@@ -2692,8 +2594,14 @@ class SaveAnalyzer:
         # 标记为已初始化
         self._is_initialized = True
     
-    def _update_save_info_incremental(self, save_data):
-        """增量更新存档信息（不销毁重建widget）"""
+    def _update_save_info_incremental(self, save_data, changed_paths=None):
+        """增量更新存档信息（不销毁重建widget）
+        
+        Args:
+            save_data: 新的存档数据
+            changed_paths: 变化的存档路径（如监控差异中的 SaveChange.path），
+                只更新依赖这些路径的 widget（见 INFO_WIDGET_DEPENDENCIES）；None 表示全部更新
+        """
         # 验证关键 widget 是否仍然有效
         # 如果 _widget_map 为空或关键 widget 无效，触发完整重建
         if not self._widget_map:
@@ -2713,17 +2621,22 @@ class SaveAnalyzer:
                     self.display_save_info(self.scrollable_frame, save_data)
                     return
         
-        # 检查狂信徒线状态，如果需要则移动狂信徒section到最上面
-        kill = save_data.get("kill", None)
-        killed = save_data.get("killed", None)
+        # 需要更新的 widget_key（None 表示全部）
+        if changed_paths is None:
+            dirty_keys = None
+        else:
+            dirty_keys = self._info_dependency_index.dependents(changed_paths)
+            if not dirty_keys:
+                return
         
-        is_fanatic_route = (
-            (kill is not None and kill == 1) or
-            (killed is not None and killed == 1)
-        )
+        # 统计数据（同一份存档快照只计算一次，与统计面板共享）
+        stats = self._get_save_stats(save_data)
         
-        # 如果满足狂信徒线条件，检查并移动狂信徒section到最上面
-        if is_fanatic_route:
+        # 检查狂信徒线状态，如果需要则移动狂信徒section到最上面
+        is_fanatic_route = stats.is_fanatic_route
+        
+        # 如果满足狂信徒线条件，检查并移动狂信徒section到最上面（只在 kill/killed 变化时检查）
+        if is_fanatic_route and (dirty_keys is None or "fanatic_related" in dirty_keys):
             fanatic_section = self._section_map.get("fanatic_related")
             # 如果狂信徒section不存在，触发完整重建
             if not fanatic_section or not fanatic_section.winfo_exists():
@@ -2799,195 +2712,142 @@ class SaveAnalyzer:
         
         memory = save_data.get("memory", {})
         
-        # 更新角色信息
-        character_name = memory.get("name", self.t("not_set"))
-        self.add_info_line(None, self.t("character_name"), character_name, "memory.name", "memory.name")
-        
-        seibetu = memory.get("seibetu", 0)
-        if seibetu == 1:
-            gender_text = self.t("gender_male")
-        elif seibetu == 2:
-            gender_text = self.t("gender_female")
-        else:
-            gender_text = self.t("not_set")
-        self.add_info_line(None, self.t("character_gender"), gender_text, "memory.seibetu", "memory.seibetu")
-        
-        hutanari = memory.get("hutanari", 0)
-        self.add_info_line(None, self.t("hutanari"), hutanari, "memory.hutanari", "memory.hutanari")
-        
-        camera_enable = memory.get("cameraEnable", 0)
-        self.add_info_line(None, self.t("camera_enable"), camera_enable, "memory.cameraEnable", "memory.cameraEnable")
-        
-        yubiwa = memory.get("yubiwa", 0)
-        self.add_info_line(None, self.t("yubiwa"), yubiwa, "memory.yubiwa", "memory.yubiwa")
-        
-        # 更新结局统计
-        endings = set(save_data.get("endings", []))
-        collected_endings = set(save_data.get("collectedEndings", []))
-        missing_endings = sorted(endings - collected_endings, key=lambda x: int(x) if x.isdigit() else 999)
-        
-        endings_count = len(endings)
-        collected_endings_count = len(collected_endings)
-        self.add_info_line(None, self.t("total_endings"), endings_count, "endings", "endings.count")
-        self.add_info_line(None, self.t("collected_endings"), collected_endings_count, "collectedEndings", "collectedEndings.count")
-        
-        # 更新缺失结局（动态内容）
-        if missing_endings:
-            missing_endings_text = f"{len(missing_endings)}: {', '.join(missing_endings)}"
-        else:
-            missing_endings_text = self.t("none")
-        self.add_info_line(None, self.t("missing_endings"), missing_endings_text, None, "missing_endings")
-        
-        # 更新贴纸统计
-        stickers = set(save_data.get("sticker", []))
-        all_sticker_ids = set(range(1, 82)) | set(range(83, 134))
-        stickers_count = len(stickers)
-        total_stickers = 132
-        missing_stickers = sorted(all_sticker_ids - stickers)
-        
-        self.add_info_line(None, self.t("total_stickers"), total_stickers, None, "stickers.total")
-        self.add_info_line(None, self.t("collected_stickers"), stickers_count, "sticker", "sticker.count")
-        self.add_info_line(None, self.t("missing_stickers_count"), len(missing_stickers), None, "missing_stickers.count")
-        
-        if missing_stickers:
-            missing_stickers_text = ", ".join(str(s) for s in missing_stickers)
-        else:
-            missing_stickers_text = self.t("none")
-        self.add_info_line(None, self.t("missing_stickers"), missing_stickers_text, None, "missing_stickers")
+        def update_gender():
+            seibetu = memory.get("seibetu", 0)
+            if seibetu == 1:
+                gender_text = self.t("gender_male")
+            elif seibetu == 2:
+                gender_text = self.t("gender_female")
+            else:
+                gender_text = self.t("not_set")
+            self.add_info_line(None, self.t("character_gender"), gender_text, "memory.seibetu", "memory.seibetu")
         
-        # 更新角色统计
-        characters = set(c for c in save_data.get("characters", []) if c and c.strip())
-        collected_characters = set(c for c in save_data.get("collectedCharacters", []) if c and c.strip())
-        characters_count = max(0, len(characters))
-        collected_characters_count = max(0, len(collected_characters))
-        missing_characters = sorted(characters - collected_characters)
+        def update_missing_endings():
+            missing_endings = stats.missing_endings
+            if missing_endings:
+                missing_endings_text = f"{len(missing_endings)}: {', '.join(missing_endings)}"
+            else:
+                missing_endings_text = self.t("none")
+            self.add_info_line(None, self.t("missing_endings"), missing_endings_text, None, "missing_endings")
         
-        self.add_info_line(None, self.t("total_characters"), characters_count, "characters", "characters.count")
-        self.add_info_line(None, self.t("collected_characters"), collected_characters_count, "collectedCharacters", "collectedCharacters.count")
+        def update_missing_stickers():
+            missing_stickers = stats.missing_stickers
+            if missing_stickers:
+                missing_stickers_text = ", ".join(str(s) for s in missing_stickers)
+            else:
+                missing_stickers_text = self.t("none")
+            self.add_info_line(None, self.t("missing_stickers"), missing_stickers_text, None, "missing_stickers")
         
-        # 更新缺失角色（动态内容，需要特殊处理列表）
-        if "missing_characters" in self._dynamic_widgets:
+        def update_missing_characters():
+            # 缺失角色是动态内容，需要特殊处理列表
+            if "missing_characters" not in self._dynamic_widgets:
+                return
             widget_info = self._dynamic_widgets["missing_characters"]
             section = widget_info.get('section')
-            if section and section.winfo_exists():
-                # 如果之前是列表，需要删除旧的widget
-                if widget_info.get('is_list'):
-                    # 找到并删除旧的列表widget
-                    for child in section.winfo_children():
-                        try:
-                            if hasattr(child, 'items_data'):
-                                child.destroy()
-                        except:
-                            pass
-                
-                if missing_characters:
-                    self.add_list_info(section, self.t("missing_characters"), missing_characters)
-                    widget_info['is_list'] = True
-                else:
-                    self.add_info_line(section, self.t("missing_characters"), self.t("none"), None, "missing_characters")
-                    widget_info['is_list'] = False
-        
-        # 更新额外内容统计
-        # omakes 是已收集的额外内容列表
-        collected_omakes = set(save_data.get("omakes", []))
-        collected_omakes_count = len(collected_omakes)
-        total_omakes_set = set(self.TOTAL_OMAKES)
-        total_omakes_count = len(total_omakes_set)
-        missing_omakes = sorted(total_omakes_set - collected_omakes, key=lambda x: int(x) if x.isdigit() else 999)
-        
-        self.add_info_line(None, self.t("total_omakes"), total_omakes_count, None, "omakes.count")
-        self.add_info_line(None, self.t("collected_omakes"), collected_omakes_count, "omakes", "collected_omakes.count")
-        
-        if missing_omakes:
-            missing_omakes_text = ', '.join(missing_omakes)
-        else:
-            missing_omakes_text = self.t("none")
-        self.add_info_line(None, self.t("missing_omakes"), missing_omakes_text, None, "missing_omakes")
-        
-        gallery = save_data.get("gallery", [])
-        gallery_count = len(gallery)
-        total_gallery_count = len(self.TOTAL_GALLERY)
-        gallery_display = f"{gallery_count}/{total_gallery_count}"
-        self.add_info_line(None, self.t("gallery_count"), gallery_display, "gallery", "gallery.count")
-        
-        ng_scene = save_data.get("ngScene", [])
-        ng_scene_count = len(ng_scene)
-        total_ng_scene_count = len(self.TOTAL_NG_SCENE)
-        ng_scene_display = f"{ng_scene_count}/{total_ng_scene_count}"
-        try:
-            ng_scene_tooltip = self.t("ng_scene_count_tooltip")
-            self.add_info_line_with_tooltip(None, self.t("ng_scene_count"), ng_scene_display, ng_scene_tooltip, "ngScene", "ngScene.count")
-        except:
-            self.add_info_line(None, self.t("ng_scene_count"), ng_scene_display, "ngScene", "ngScene.count")
-        
-        # 更新游戏统计
-        whole_total_mp = save_data.get("wholeTotalMP", 0)
-        self.add_info_line(None, self.t("total_mp"), whole_total_mp, "wholeTotalMP", "wholeTotalMP")
-        
-        judge_counts = save_data.get("judgeCounts", {})
-        perfect = judge_counts.get("perfect", 0)
-        good = judge_counts.get("good", 0)
-        bad = judge_counts.get("bad", 0)
-        self.add_info_line(None, self.t("judge_perfect"), perfect, "judgeCounts.perfect", "judgeCounts.perfect")
-        self.add_info_line(None, self.t("judge_good"), good, "judgeCounts.good", "judgeCounts.good")
-        self.add_info_line(None, self.t("judge_bad"), bad, "judgeCounts.bad", "judgeCounts.bad")
-        
-        secret_end_open = save_data.get("secretEndOpen", 0)
-        self.add_info_line(None, self.t("secret_end_open"), secret_end_open, "secretEndOpen", "secretEndOpen")
-        
-        true_count = save_data.get("trueCount", 0)
-        self.add_info_line(None, self.t("true_count"), true_count, "trueCount", "trueCount")
-        
-        epilogue = save_data.get("epilogue", 0)
-        self.add_info_line(None, self.t("epilogue_count"), epilogue, "epilogue", "epilogue")
-        
-        loop_count = save_data.get("loopCount", 0)
-        self.add_info_line(None, self.t("loop_count"), loop_count, "loopCount", "loopCount")
-        
-        loop_record = save_data.get("loopRecord", 0)
-        self.add_info_line_with_tooltip(None, self.t("loop_record"), loop_record,
-                                       self.t("loop_record_tooltip"), "loopRecord", "loopRecord")
-        
-        # 更新狂信徒相关
-        neo = save_data.get("NEO", 0)
-        self.add_info_line_with_tooltip(None, self.t("neo_value"), neo, 
-                                       self.t("neo_value_tooltip"), "NEO", "NEO")
-        
-        lamia_noroi = save_data.get("Lamia_noroi", 0)
-        self.add_info_line(None, self.t("lamia_curse"), lamia_noroi, "Lamia_noroi", "Lamia_noroi")
-        
-        trauma = save_data.get("trauma", 0)
-        self.add_info_line(None, self.t("trauma_value"), trauma, "trauma", "trauma")
-        
-        kill_warning = save_data.get("killWarning", 0)
-        self.add_info_line(None, self.t("kill_warning"), kill_warning, "killWarning", "killWarning")
-        
-        killed = save_data.get("killed", None)
-        if killed is None:
-            killed_display = self.t("variable_not_exist")
-        else:
-            killed_display = killed
-        self.add_info_line_with_tooltip(None, self.t("killed"), killed_display,
-                                       self.t("killed_tooltip"), "killed", "killed")
+            if not section or not section.winfo_exists():
+                return
+            # 如果之前是列表，需要删除旧的widget
+            if widget_info.get('is_list'):
+                # 找到并删除旧的列表widget
+                for child in section.winfo_children():
+                    try:
+                        if hasattr(child, 'items_data'):
+                            child.destroy()
+                    except:
+                        pass
+            
+            missing_characters = list(stats.missing_characters)
+            if missing_characters:
+                self.add_list_info(section, self.t("missing_characters"), missing_characters)
+                widget_info['is_list'] = True
+            else:
+                self.add_info_line(section, self.t("missing_characters"), self.t("none"), None, "missing_characters")
+                widget_info['is_list'] = False
         
-        kill = save_data.get("kill", 0)
-        self.add_info_line_with_tooltip(None, self.t("kill_count"), kill,
-                                       self.t("kill_count_tooltip"), "kill", "kill")
+        def update_missing_omakes():
+            missing_omakes = stats.missing_omakes
+            if missing_omakes:
+                missing_omakes_text = ', '.join(missing_omakes)
+            else:
+                missing_omakes_text = self.t("none")
+            self.add_info_line(None, self.t("missing_omakes"), missing_omakes_text, None, "missing_omakes")
         
-        # 更新其他信息
-        save_list_no = save_data.get("saveListNo", 0)
-        album_page_no = save_data.get("albumPageNo", 0) + 1
-        self.add_info_line(None, self.t("save_list_no"), save_list_no, "saveListNo", "saveListNo")
-        self.add_info_line(None, self.t("album_page_no"), album_page_no, "albumPageNo", "albumPageNo")
+        def update_ng_scene():
+            ng_scene_display = stats.ng_scene_display
+            try:
+                ng_scene_tooltip = self.t("ng_scene_count_tooltip")
+                self.add_info_line_with_tooltip(None, self.t("ng_scene_count"), ng_scene_display, ng_scene_tooltip, "ngScene", "ngScene.count")
+            except:
+                self.add_info_line(None, self.t("ng_scene_count"), ng_scene_display, "ngScene", "ngScene.count")
         
-        desu = save_data.get("desu", 0)
-        self.add_info_line(None, self.t("desu"), desu, "desu", "desu")
+        def update_killed():
+            killed = save_data.get("killed", None)
+            if killed is None:
+                killed_display = self.t("variable_not_exist")
+            else:
+                killed_display = killed
+            self.add_info_line_with_tooltip(None, self.t("killed"), killed_display,
+                                           self.t("killed_tooltip"), "killed", "killed")
         
-        autosave = save_data.get("system", {}).get("autosave", False)
-        self.add_info_line(None, self.t("autosave_enabled"), autosave, "system.autosave", "system.autosave")
+        # widget_key → 更新函数，依赖关系见 INFO_WIDGET_DEPENDENCIES
+        updaters = {
+            # 角色信息
+            "memory.name": lambda: self.add_info_line(None, self.t("character_name"), memory.get("name", self.t("not_set")), "memory.name", "memory.name"),
+            "memory.seibetu": update_gender,
+            "memory.hutanari": lambda: self.add_info_line(None, self.t("hutanari"), memory.get("hutanari", 0), "memory.hutanari", "memory.hutanari"),
+            "memory.cameraEnable": lambda: self.add_info_line(None, self.t("camera_enable"), memory.get("cameraEnable", 0), "memory.cameraEnable", "memory.cameraEnable"),
+            "memory.yubiwa": lambda: self.add_info_line(None, self.t("yubiwa"), memory.get("yubiwa", 0), "memory.yubiwa", "memory.yubiwa"),
+            # 结局统计
+            "endings.count": lambda: self.add_info_line(None, self.t("total_endings"), len(stats.endings), "endings", "endings.count"),
+            "collectedEndings.count": lambda: self.add_info_line(None, self.t("collected_endings"), len(stats.collected_endings), "collectedEndings", "collectedEndings.count"),
+            "missing_endings": update_missing_endings,
+            # 贴纸统计
+            "stickers.total": lambda: self.add_info_line(None, self.t("total_stickers"), stats.total_stickers, None, "stickers.total"),
+            "sticker.count": lambda: self.add_info_line(None, self.t("collected_stickers"), stats.sticker_count, "sticker", "sticker.count"),
+            "missing_stickers.count": lambda: self.add_info_line(None, self.t("missing_stickers_count"), len(stats.missing_stickers), None, "missing_stickers.count"),
+            "missing_stickers": update_missing_stickers,
+            # 角色统计
+            "characters.count": lambda: self.add_info_line(None, self.t("total_characters"), len(stats.characters), "characters", "characters.count"),
+            "collectedCharacters.count": lambda: self.add_info_line(None, self.t("collected_characters"), len(stats.collected_characters), "collectedCharacters", "collectedCharacters.count"),
+            "missing_characters": update_missing_characters,
+            # 额外内容统计
+            "omakes.count": lambda: self.add_info_line(None, self.t("total_omakes"), stats.total_omakes_count, None, "omakes.count"),
+            "collected_omakes.count": lambda: self.add_info_line(None, self.t("collected_omakes"), len(stats.collected_omakes), "omakes", "collected_omakes.count"),
+            "missing_omakes": update_missing_omakes,
+            "gallery.count": lambda: self.add_info_line(None, self.t("gallery_count"), stats.gallery_display, "gallery", "gallery.count"),
+            "ngScene.count": update_ng_scene,
+            # 游戏统计
+            "wholeTotalMP": lambda: self.add_info_line(None, self.t("total_mp"), stats.whole_total_mp, "wholeTotalMP", "wholeTotalMP"),
+            "judgeCounts.perfect": lambda: self.add_info_line(None, self.t("judge_perfect"), stats.perfect, "judgeCounts.perfect", "judgeCounts.perfect"),
+            "judgeCounts.good": lambda: self.add_info_line(None, self.t("judge_good"), stats.good, "judgeCounts.good", "judgeCounts.good"),
+            "judgeCounts.bad": lambda: self.add_info_line(None, self.t("judge_bad"), stats.bad, "judgeCounts.bad", "judgeCounts.bad"),
+            "secretEndOpen": lambda: self.add_info_line(None, self.t("secret_end_open"), save_data.get("secretEndOpen", 0), "secretEndOpen", "secretEndOpen"),
+            "trueCount": lambda: self.add_info_line(None, self.t("true_count"), save_data.get("trueCount", 0), "trueCount", "trueCount"),
+            "epilogue": lambda: self.add_info_line(None, self.t("epilogue_count"), save_data.get("epilogue", 0), "epilogue", "epilogue"),
+            "loopCount": lambda: self.add_info_line(None, self.t("loop_count"), save_data.get("loopCount", 0), "loopCount", "loopCount"),
+            "loopRecord": lambda: self.add_info_line_with_tooltip(None, self.t("loop_record"), save_data.get("loopRecord", 0),
+                                                                  self.t("loop_record_tooltip"), "loopRecord", "loopRecord"),
+            # 狂信徒相关
+            "NEO": lambda: self.add_info_line_with_tooltip(None, self.t("neo_value"), save_data.get("NEO", 0),
+                                                           self.t("neo_value_tooltip"), "NEO", "NEO"),
+            "Lamia_noroi": lambda: self.add_info_line(None, self.t("lamia_curse"), save_data.get("Lamia_noroi", 0), "Lamia_noroi", "Lamia_noroi"),
+            "trauma": lambda: self.add_info_line(None, self.t("trauma_value"), save_data.get("trauma", 0), "trauma", "trauma"),
+            "killWarning": lambda: self.add_info_line(None, self.t("kill_warning"), save_data.get("killWarning", 0), "killWarning", "killWarning"),
+            "killed": update_killed,
+            "kill": lambda: self.add_info_line_with_tooltip(None, self.t("kill_count"), save_data.get("kill", 0),
+                                                            self.t("kill_count_tooltip"), "kill", "kill"),
+            # 其他信息（相册页码从0开始，显示时+1）
+            "saveListNo": lambda: self.add_info_line(None, self.t("save_list_no"), save_data.get("saveListNo", 0), "saveListNo", "saveListNo"),
+            "albumPageNo": lambda: self.add_info_line(None, self.t("album_page_no"), save_data.get("albumPageNo", 0) + 1, "albumPageNo", "albumPageNo"),
+            "desu": lambda: self.add_info_line(None, self.t("desu"), save_data.get("desu", 0), "desu", "desu"),
+            "system.autosave": lambda: self.add_info_line(None, self.t("autosave_enabled"), save_data.get("system", {}).get("autosave", False), "system.autosave", "system.autosave"),
+            "fullscreen": lambda: self.add_info_line(None, self.t("fullscreen"), save_data.get("fullscreen", False), "fullscreen", "fullscreen"),
+        }
         
-        fullscreen = save_data.get("fullscreen", False)
-        self.add_info_line(None, self.t("fullscreen"), fullscreen, "fullscreen", "fullscreen")
+        # 按界面上的顺序更新（没有变化集时更新全部）
+        for widget_key, update in updaters.items():
+            if dirty_keys is None or widget_key in dirty_keys:
+                update()
     
     def apply_json_syntax_highlight(self, text_widget, content):
         """应用JSON语法高亮"""
@@ -3790,7 +3650,12 @@ class SaveAnalyzer:
     
     def _create_rounded_rect(self, canvas, x1, y1, x2, y2, radius, **kwargs):
         """在Canvas上绘制圆角矩形"""
-        points = [
+        points = self._rounded_rect_points(x1, y1, x2, y2, radius)
+        return canvas.create_polygon(points, smooth=True, **kwargs)
+    
+    def _rounded_rect_points(self, x1, y1, x2, y2, radius):
+        """圆角矩形的多边形顶点（配合 smooth=True 使用）"""
+        return [
             x1 + radius, y1,
             x2 - radius, y1,
             x2, y1,
@@ -3805,32 +3670,10 @@ class SaveAnalyzer:
             x1, y1,
             x1 + radius, y1,
         ]
-        return canvas.create_polygon(points, smooth=True, **kwargs)
     
-    def _wrap_text(self, text, font, max_width, canvas):
-        """计算文本换行，返回行列表"""
-        words = text
-        lines = []
-        current_line = ""
-        
-        for char in words:
-            test_line = current_line + char
-            # 创建临时文本来测量宽度
-            temp_id = canvas.create_text(0, 0, text=test_line, font=font, anchor="nw")
-            bbox = canvas.bbox(temp_id)
-            canvas.delete(temp_id)
-            
-            if bbox and (bbox[2] - bbox[0]) > max_width:
-                if current_line:
-                    lines.append(current_line)
-                current_line = char
-            else:
-                current_line = test_line
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return lines if lines else [text]
+    def _wrap_text(self, text, font, max_width):
+        """计算文本换行，返回行列表（按字符宽度累加计算，结果带缓存）"""
+        return wrap_text(text, font, max_width, self.current_language)
     
     def _show_requirements_canvas(self, title_key, hint_key, items, collected_set, 
                                    id_prefix, window_title_suffix, is_sticker=False, is_ng_scene=False):
@@ -3939,7 +3782,7 @@ class SaveAnalyzer:
             is_missing = item_id not in collected_set
             
             # 计算文本换行后的行数
-            wrapped_lines = self._wrap_text(condition_text, font_card_text, CARD_WIDTH - CARD_PADDING * 2 - 20, canvas)
+            wrapped_lines = self._wrap_text(condition_text, font_card_text, CARD_WIDTH - CARD_PADDING * 2 - 20)
             line_height = 18
             text_height = len(wrapped_lines) * line_height
             
@@ -3962,104 +3805,134 @@ class SaveAnalyzer:
         # 设置Canvas滚动区域
         canvas.configure(scrollregion=(0, 0, CARD_WIDTH + 40, total_height))
         
-        # 绘制所有卡片
-        for card in card_data:
-            is_missing = card['is_missing']
-            y = card['y']
-            h = card['height']
-            
-            # 选择配色
-            if is_missing:
-                card_color = COLORS['missing_card']
-                border_color = COLORS['missing_border']
-                shadow_color = COLORS['missing_shadow']
-                title_color = COLORS['missing_title']
-                status_color = COLORS['missing_status']
-                text_color = COLORS['missing_text']
-                status_text = "❌ " + (self.t("status_missing_ending") if not is_sticker and not is_ng_scene else (self.t("status_missing_sticker") if is_sticker else self.t("status_missing_ending")))
-            else:
-                card_color = COLORS['collected_card']
-                border_color = COLORS['collected_border']
-                shadow_color = COLORS['collected_shadow']
-                title_color = COLORS['collected_title']
-                status_color = COLORS['collected_status']
-                text_color = COLORS['collected_text']
-                status_text = "✓ " + (self.t("status_collected_ending") if not is_sticker and not is_ng_scene else (self.t("status_collected_sticker") if is_sticker else self.t("status_collected_ending")))
-            
-            x1, y1 = 25, y
-            x2, y2 = 25 + CARD_WIDTH, y + h
-            
-            # 绘制阴影
-            self._create_rounded_rect(canvas, 
-                                     x1 + SHADOW_OFFSET, y1 + SHADOW_OFFSET, 
-                                     x2 + SHADOW_OFFSET, y2 + SHADOW_OFFSET, 
-                                     CARD_RADIUS, fill=shadow_color, outline="")
-            
-            # 绘制卡片边框
-            self._create_rounded_rect(canvas, x1 - 1, y1 - 1, x2 + 1, y2 + 1, 
-                                     CARD_RADIUS, fill=border_color, outline="")
-            
-            # 绘制卡片主体
-            self._create_rounded_rect(canvas, x1, y1, x2, y2, 
-                                     CARD_RADIUS, fill=card_color, outline="")
-            
-            # 绘制标题
-            title_text = f"{id_prefix}{card['item_id']}"
-            canvas.create_text(x1 + CARD_PADDING, y1 + CARD_PADDING, 
-                             text=title_text, font=font_card_title, 
-                             fill=title_color, anchor="nw")
-            
-            # 绘制状态（右侧）
-            canvas.create_text(x2 - CARD_PADDING, y1 + CARD_PADDING, 
-                             text=status_text, font=font_card_status, 
-                             fill=status_color, anchor="ne")
-            
-            # 绘制分隔线
-            line_y = y1 + 40
-            canvas.create_line(x1 + CARD_PADDING, line_y, x2 - CARD_PADDING, line_y, 
-                             fill=border_color, width=1)
-            
-            # 绘制达成条件文本（多行）- 使用可选择的Text控件
-            text_y = line_y + 12
-            text_height = len(card['wrapped_lines']) * 18
+        # 两种卡片的配色和状态文字
+        if not is_sticker and not is_ng_scene:
+            missing_status_text = "❌ " + self.t("status_missing_ending")
+            collected_status_text = "✓ " + self.t("status_collected_ending")
+        elif is_sticker:
+            missing_status_text = "❌ " + self.t("status_missing_sticker")
+            collected_status_text = "✓ " + self.t("status_collected_sticker")
+        else:
+            missing_status_text = "❌ " + self.t("status_missing_ending")
+            collected_status_text = "✓ " + self.t("status_collected_ending")
+        card_styles = {
+            True: {
+                'card': COLORS['missing_card'],
+                'border': COLORS['missing_border'],
+                'shadow': COLORS['missing_shadow'],
+                'title': COLORS['missing_title'],
+                'status': COLORS['missing_status'],
+                'text': COLORS['missing_text'],
+                'status_text': missing_status_text,
+            },
+            False: {
+                'card': COLORS['collected_card'],
+                'border': COLORS['collected_border'],
+                'shadow': COLORS['collected_shadow'],
+                'title': COLORS['collected_title'],
+                'status': COLORS['collected_status'],
+                'text': COLORS['collected_text'],
+                'status_text': collected_status_text,
+            },
+        }
+        
+        # 只绘制可见区域附近的卡片，滚出可见区域的卡片项目回收后给新卡片复用
+        def create_slot():
+            """创建一张卡片所需的Canvas项目（位置、颜色和内容在bind_slot中设置）"""
+            slot = {
+                'shadow': self._create_rounded_rect(canvas, 0, 0, 1, 1, CARD_RADIUS, outline=""),
+                'border': self._create_rounded_rect(canvas, 0, 0, 1, 1, CARD_RADIUS, outline=""),
+                'body': self._create_rounded_rect(canvas, 0, 0, 1, 1, CARD_RADIUS, outline=""),
+                'title': canvas.create_text(0, 0, font=font_card_title, anchor="nw"),
+                'status': canvas.create_text(0, 0, font=font_card_status, anchor="ne"),
+                'line': canvas.create_line(0, 0, 1, 0, width=1),
+            }
             
-            # 创建Text控件用于文本选择
-            text_frame = tk.Frame(canvas, bg=card_color)
+            # 达成条件文本使用可选择的Text控件
+            text_frame = tk.Frame(canvas)
             text_widget = tk.Text(
                 text_frame,
                 wrap=tk.NONE,  # 不自动换行，保持原有的换行
                 font=font_card_text,
-                fg=text_color,
-                bg=card_color,
                 relief=tk.FLAT,
                 borderwidth=0,
                 highlightthickness=0,
                 selectbackground='#4A90E2',  # 选中背景色
                 selectforeground='white',     # 选中文字颜色
                 cursor='ibeam',              # 文本光标
-                state=tk.NORMAL,
+                state=tk.DISABLED,
                 padx=0,
                 pady=0,
                 spacing1=0,  # 行前间距
                 spacing2=0,  # 行间间距
                 spacing3=0   # 行后间距
             )
-            
-            # 插入文本内容
-            full_text = '\n'.join(card['wrapped_lines'])
-            text_widget.insert('1.0', full_text)
-            text_widget.config(state=tk.DISABLED)  # 设置为只读
-            
             text_widget.pack(fill='both', expand=True)
-            
-            # 将Text控件窗口添加到Canvas上
-            canvas.create_window(
-                x1 + CARD_PADDING, text_y,
+            slot['text_frame'] = text_frame
+            slot['text_widget'] = text_widget
+            slot['window'] = canvas.create_window(
+                0, 0,
                 window=text_frame,
                 anchor='nw',
                 width=CARD_WIDTH - CARD_PADDING * 2,
-                height=text_height
+                height=18
             )
+            return slot
+        
+        def bind_slot(slot, index):
+            """把槽中的项目移动到第index张卡片的位置并填充内容"""
+            card = card_data[index]
+            style = card_styles[card['is_missing']]
+            y = card['y']
+            h = card['height']
+            
+            x1, y1 = 25, y
+            x2, y2 = 25 + CARD_WIDTH, y + h
+            
+            # 阴影、边框、卡片主体
+            canvas.coords(slot['shadow'], *self._rounded_rect_points(
+                x1 + SHADOW_OFFSET, y1 + SHADOW_OFFSET, x2 + SHADOW_OFFSET, y2 + SHADOW_OFFSET, CARD_RADIUS))
+            canvas.itemconfigure(slot['shadow'], fill=style['shadow'], state="normal")
+            canvas.coords(slot['border'], *self._rounded_rect_points(x1 - 1, y1 - 1, x2 + 1, y2 + 1, CARD_RADIUS))
+            canvas.itemconfigure(slot['border'], fill=style['border'], state="normal")
+            canvas.coords(slot['body'], *self._rounded_rect_points(x1, y1, x2, y2, CARD_RADIUS))
+            canvas.itemconfigure(slot['body'], fill=style['card'], state="normal")
+            
+            # 标题和状态（右侧）
+            canvas.coords(slot['title'], x1 + CARD_PADDING, y1 + CARD_PADDING)
+            canvas.itemconfigure(slot['title'], text=f"{id_prefix}{card['item_id']}",
+                                 fill=style['title'], state="normal")
+            canvas.coords(slot['status'], x2 - CARD_PADDING, y1 + CARD_PADDING)
+            canvas.itemconfigure(slot['status'], text=style['status_text'],
+                                 fill=style['status'], state="normal")
+            
+            # 分隔线
+            line_y = y1 + 40
+            canvas.coords(slot['line'], x1 + CARD_PADDING, line_y, x2 - CARD_PADDING, line_y)
+            canvas.itemconfigure(slot['line'], fill=style['border'], state="normal")
+            
+            # 达成条件文本（多行）
+            text_widget = slot['text_widget']
+            slot['text_frame'].config(bg=style['card'])
+            text_widget.config(state=tk.NORMAL, fg=style['text'], bg=style['card'])
+            text_widget.delete('1.0', 'end')
+            text_widget.insert('1.0', '\n'.join(card['wrapped_lines']))
+            text_widget.config(state=tk.DISABLED)  # 设置为只读
+            canvas.coords(slot['window'], x1 + CARD_PADDING, line_y + 12)
+            canvas.itemconfigure(slot['window'], height=len(card['wrapped_lines']) * 18, state="normal")
+        
+        def hide_slot(slot):
+            """隐藏槽中的项目，等待复用"""
+            for key in ('shadow', 'border', 'body', 'title', 'status', 'line', 'window'):
+                canvas.itemconfigure(slot[key], state="hidden")
+            # 嵌入的窗口同时移出可见区域
+            canvas.coords(slot['window'], -CARD_WIDTH, -100)
+        
+        viewport = CardViewport(canvas, [(card['y'], card['height']) for card in card_data],
+                                create_slot, bind_slot, hide_slot)
+        canvas.configure(yscrollcommand=lambda *args: (scrollbar.set(*args), viewport.update()))
+        canvas.bind("<Configure>", viewport.update)
+        viewport.update()
         
         # 绑定鼠标滚轮
         def on_mousewheel(event):
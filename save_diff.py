@@ -0,0 +1,516 @@
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# 变更类型
+OP_ADD = "add"                   # 新增字段
+OP_REMOVE = "remove"             # 删除字段
+OP_CHANGE = "change"             # 值变化
+OP_TYPE = "type"                 # 数值相同但类型变化（如 int(7) → float(7.0)）
+OP_LIST_APPEND = "append"        # 列表新增元素
+OP_LIST_REMOVE = "list_remove"   # 列表移除元素
+OP_LIST_REORDER = "reorder"      # 列表元素相同但顺序变化
+
+# 哈希树节点：(子树摘要, 字典子节点 或 None)
+HashTree = Tuple[bytes, Optional[Dict[str, Any]]]
+
+_DIGEST_SIZE = 16  # 子树摘要的字节数（blake2b）
+_INLINE_LEAF_SIZE = 32  # 不超过这个长度的值直接以规范化文本作为摘要，省去一次哈希
+_LEGACY_BENCHMARK_SIZE = 300  # 旧实现性能测试的元素数量上限
+
+
+def format_value(value: Any) -> str:
+    """格式化值用于显示"""
+    if isinstance(value, (dict, list)):
+        return str(value)
+    elif isinstance(value, str):
+        return f'"{value}"'
+    elif isinstance(value, float):
+        # 如果是浮点数，检查是否为整数
+        if value.is_integer():
+            return str(int(value))
+        return str(value)
+    elif isinstance(value, bool):
+        return str(value)
+    else:
+        return str(value)
+
+
+class SaveChange(NamedTuple):
+    """
+    一条存档变更记录
+
+    path: 键路径元组，如 ("status", "hp")
+    op: 变更类型（OP_*）
+    old/new: 旧值/新值（不适用时为None）
+    """
+    path: Tuple[str, ...]
+    op: str
+    old: Any = None
+    new: Any = None
+
+    @property
+    def key(self) -> str:
+        """点分隔的完整键名"""
+        return ".".join(self.path)
+
+    def format(self) -> str:
+        """格式化为显示用的文本（只在需要显示时调用）"""
+        key = self.key
+        if self.op == OP_REMOVE:
+            return f"-{key}"
+        if self.op == OP_ADD:
+            return f"+{key} = {format_value(self.new)}"
+        if self.op == OP_LIST_APPEND:
+            return f"{key}.append({format_value(self.new)})"
+        if self.op == OP_LIST_REMOVE:
+            return f"{key}.remove({format_value(self.old)})"
+        if self.op == OP_LIST_REORDER:
+            return f"{key}.reorder()"
+        if self.op == OP_TYPE:
+            return (f"{key} {format_value(self.old)} ({type(self.old).__name__})"
+                    f"→{format_value(self.new)} ({type(self.new).__name__})")
+        return f"{key} {format_value(self.old)}→{format_value(self.new)}"
+
+
+# =====================================================
+# 值比较
+# =====================================================
+
+def values_equal(old_val: Any, new_val: Any) -> bool:
+    """比较两个值是否相等（处理类型转换问题）"""
+    # None值处理
+    if old_val is None and new_val is None:
+        return True
+    if old_val is None or new_val is None:
+        return False
+
+    # 类型相同，直接比较
+    if type(old_val) == type(new_val):
+        return old_val == new_val
+
+    # 处理数字类型比较
+    if isinstance(old_val, (int, float)) and isinstance(new_val, (int, float)):
+        return _numbers_equal(old_val, new_val)
+
+    # 处理布尔值比较
+    if isinstance(old_val, bool) and isinstance(new_val, (int, float)):
+        return old_val == (new_val != 0)
+    if isinstance(new_val, bool) and isinstance(old_val, (int, float)):
+        return new_val == (old_val != 0)
+
+    # 处理字符串比较
+    if isinstance(old_val, str) and isinstance(new_val, str):
+        return old_val.strip() == new_val.strip()
+
+    # 其他情况，转换为字符串比较（排除复杂类型）
+    if not isinstance(old_val, (dict, list)) and not isinstance(new_val, (dict, list)):
+        return str(old_val) == str(new_val)
+
+    return False
+
+
+def _numbers_equal(old_val: Any, new_val: Any) -> bool:
+    """比较数字值"""
+    # 排除布尔值
+    if isinstance(old_val, bool) or isinstance(new_val, bool):
+        return False
+
+    # 整数比较
+    if isinstance(old_val, int) and isinstance(new_val, int):
+        return old_val == new_val
+
+    # 浮点数比较
+    old_float = float(old_val)
+    new_float = float(new_val)
+
+    # 检查是否为整数值
+    old_is_int = isinstance(old_val, int) or (isinstance(old_val, float) and old_val.is_integer())
+    new_is_int = isinstance(new_val, int) or (isinstance(new_val, float) and new_val.is_integer())
+
+    if old_is_int and new_is_int:
+        return int(old_float) == int(new_float)
+
+    # 浮点数比较（带容差）
+    return abs(old_float - new_float) < 1e-10
+
+
+# =====================================================
+# 忽略规则
+# =====================================================
+
+class _RuleNode:
+    """忽略规则前缀树节点"""
+    __slots__ = ("children", "terminal")
+
+    def __init__(self):
+        self.children: Dict[str, "_RuleNode"] = {}
+        self.terminal = False
+
+
+# 匹配状态：当前所在的前缀树节点（根节点之下）
+RuleState = Tuple[_RuleNode, ...]
+
+
+class IgnoreRules:
+    """
+    编译后的忽略规则（逗号分隔，如 "record, initialVars, flags.*, *.time"）
+
+    - 不含"."的规则匹配任意层级中同名的键，如 "record"
+    - 含"."的规则从根开始匹配完整路径，如 "status.hp"
+    - "*" 匹配任意一级键名，如 "record.*"、"*.time"
+    - 匹配到的键连同整个子树一起忽略，比较前就剪掉
+    """
+
+    def __init__(self, rules: Iterable[str] = ()):
+        self._anchored = _RuleNode()  # 从根开始匹配的规则
+        self._floating = _RuleNode()  # 任意层级匹配的单级规则
+        self.rules: Tuple[str, ...] = ()
+        compiled = []
+        for rule in rules:
+            rule = rule.strip().strip(".")
+            if not rule:
+                continue
+            segments = [segment.strip() for segment in rule.split(".")]
+            if any(not segment for segment in segments):
+                continue
+            node = self._anchored if len(segments) > 1 else self._floating
+            for segment in segments:
+                node = node.children.setdefault(segment, _RuleNode())
+            node.terminal = True
+            compiled.append(rule)
+        self.rules = tuple(compiled)
+
+    @classmethod
+    def from_string(cls, text: Optional[str]) -> "IgnoreRules":
+        """从逗号分隔的字符串编译规则"""
+        return cls((text or "").split(","))
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IgnoreRules) and self.rules == other.rules
+
+    def __hash__(self) -> int:
+        return hash(self.rules)
+
+    def root_state(self) -> RuleState:
+        """根节点的匹配状态"""
+        return (self._anchored,)
+
+    def step(self, state: RuleState, key: str) -> Tuple[bool, RuleState]:
+        """
+        沿键名前进一级
+
+        Args:
+            state: 父节点的匹配状态
+            key: 子键名
+
+        Returns:
+            (是否忽略该键, 子节点的匹配状态)
+        """
+        next_state = []
+        for node in state + (self._floating,):
+            for child in (node.children.get(key), node.children.get("*")):
+                if child is None:
+                    continue
+                if child.terminal:
+                    return True, ()
+                if child.children:
+                    next_state.append(child)
+        return False, tuple(next_state)
+
+    def is_ignored(self, path: Tuple[str, ...]) -> bool:
+        """检查完整路径（或其祖先）是否被忽略"""
+        state = self.root_state()
+        for key in path:
+            ignored, state = self.step(state, key)
+            if ignored:
+                return True
+        return False
+
+
+# =====================================================
+# 子树哈希
+# =====================================================
+
+def _leaf_digest(value: Any) -> bytes:
+    """
+    计算非字典值（列表、数值、字符串等）的摘要
+
+    首字节为类型标记，所以 7 / 7.0 / True / "7" 的摘要都不同；
+    列表等复合值使用规范化的JSON（字典键排序）；
+    较短的值直接使用文本本身（首字节区分文本和哈希，两者不会相等）
+    """
+    value_type = type(value)
+    if value_type is str:
+        data = b"s" + value.encode("utf-8", "surrogatepass")
+    elif value_type is int:
+        data = b"i%d" % value
+    elif value_type is float:
+        data = b"f" + repr(value).encode("ascii")
+    elif value_type is bool:
+        data = b"b1" if value else b"b0"
+    elif value is None:
+        data = b"n"
+    else:
+        try:
+            data = b"j" + json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8", "surrogatepass")
+        except (TypeError, ValueError):
+            # 不是JSON数据（理论上存档中不会出现）
+            data = f"r{value_type.__name__}:{value!r}".encode("utf-8", "surrogatepass")
+    if len(data) <= _INLINE_LEAF_SIZE:
+        return data
+    return b"h" + hashlib.blake2b(data, digest_size=_DIGEST_SIZE).digest()
+
+
+def build_hash_tree(value: Any, rules: Optional[IgnoreRules] = None,
+                    state: Optional[RuleState] = None) -> HashTree:
+    """
+    为存档数据构建哈希树，字典节点保留子节点，用于比较时跳过未变化的子树
+
+    使用 blake2b 摘要而不是内置 hash()（如 hash(-1) == hash(-2)），
+    摘要相同即可认为内容相同；摘要包含类型信息，所以 7 和 7.0 的摘要不同；
+    被忽略规则匹配的子树不参与计算，只有它们变化时整棵树摘要不变
+
+    Args:
+        value: 解析后的存档数据
+        rules: 忽略规则（可选）
+        state: 当前节点的规则匹配状态（递归用）
+
+    Returns:
+        (摘要, 子节点字典或None)
+    """
+    if isinstance(value, dict):
+        if not rules:
+            children = {key: build_hash_tree(child) for key, child in value.items()}
+        else:
+            if state is None:
+                state = rules.root_state()
+            children = {}
+            for key, child in value.items():
+                ignored, child_state = rules.step(state, key)
+                if not ignored:
+                    children[key] = build_hash_tree(child, rules, child_state)
+        # 键的JSON以引号结束、子节点摘要带长度前缀，拼接后不会产生歧义
+        digest = hashlib.blake2b(b"dict", digest_size=_DIGEST_SIZE)
+        for key in sorted(children, key=str):
+            child_digest = children[key][0]
+            digest.update(json.dumps(key, ensure_ascii=False).encode("utf-8"))
+            digest.update(len(child_digest).to_bytes(4, "little"))
+            digest.update(child_digest)
+        return (b"h" + digest.digest(), children)
+    # 列表元素不应用忽略规则，整体序列化一次即可
+    return (_leaf_digest(value), None)
+
+
+# =====================================================
+# 差异比较
+# =====================================================
+
+def _canonical_item(item: Any) -> Any:
+    """把列表元素转换为可哈希、可比较的形式（嵌套列表/字典序列化为JSON）"""
+    if isinstance(item, (list, dict)):
+        return json.dumps(item, sort_keys=True, ensure_ascii=False)
+    return item
+
+
+def diff_lists(path: Tuple[str, ...], old_list: list, new_list: list,
+               detect_reorder: bool = False) -> List[SaveChange]:
+    """
+    按多重集合比较两个列表的差异（支持包含不可哈希元素的列表）
+
+    每个元素只序列化一次，用计数器比较，重复元素按次数计算，
+    如旧列表有两个1、新列表只有一个1，会记录一次移除。
+
+    Args:
+        path: 列表的键路径
+        old_list: 旧列表
+        new_list: 新列表
+        detect_reorder: 元素相同只是顺序变化时是否记录OP_LIST_REORDER
+
+    Returns:
+        SaveChange 列表
+    """
+    changes = []
+    old_keys = [_canonical_item(item) for item in old_list]
+    new_keys = [_canonical_item(item) for item in new_list]
+
+    # 查找添加的元素（新列表中超出旧列表次数的部分）
+    remaining = Counter(old_keys)
+    for item, key in zip(new_list, new_keys):
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            changes.append(SaveChange(path, OP_LIST_APPEND, None, item))
+
+    # 查找移除的元素（旧列表中超出新列表次数的部分）
+    remaining = Counter(new_keys)
+    for item, key in zip(old_list, old_keys):
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            changes.append(SaveChange(path, OP_LIST_REMOVE, item, None))
+
+    if detect_reorder and not changes and old_keys != new_keys:
+        changes.append(SaveChange(path, OP_LIST_REORDER, old_list, new_list))
+
+    return changes
+
+
+def diff_save_data(old_data: Any, new_data: Any, rules: Optional[IgnoreRules] = None,
+                   old_tree: Optional[HashTree] = None,
+                   new_tree: Optional[HashTree] = None,
+                   detect_reorder: bool = False) -> List[SaveChange]:
+    """
+    深度比较两份存档数据，返回变更记录列表
+
+    被忽略的子树在比较前就被剪掉；两边子树摘要相同时直接跳过，不再逐层比较
+
+    Args:
+        old_data: 旧存档数据
+        new_data: 新存档数据
+        rules: 编译后的忽略规则（可选）
+        old_tree: old_data的哈希树（可选，须用同一组规则构建，未提供时现场构建）
+        new_tree: new_data的哈希树（可选，须用同一组规则构建，未提供时现场构建）
+        detect_reorder: 是否记录列表顺序变化
+
+    Returns:
+        SaveChange 列表
+    """
+    if not rules:
+        rules = None
+    # 确保都是字典
+    if not isinstance(old_data, dict):
+        old_data, old_tree = {}, None
+    if not isinstance(new_data, dict):
+        new_data, new_tree = {}, None
+    if old_tree is None:
+        old_tree = build_hash_tree(old_data, rules)
+    if new_tree is None:
+        new_tree = build_hash_tree(new_data, rules)
+
+    changes = []
+    state = rules.root_state() if rules else ()
+    _diff_dicts((), old_data, new_data, old_tree, new_tree, rules, state, detect_reorder, changes)
+    return changes
+
+
+def _diff_dicts(prefix: Tuple[str, ...], old_data: dict, new_data: dict,
+                old_tree: HashTree, new_tree: HashTree,
+                rules: Optional[IgnoreRules], state: RuleState,
+                detect_reorder: bool, changes: List[SaveChange]) -> None:
+    """递归比较两个字典，把变更追加到changes"""
+    if old_tree[0] == new_tree[0]:
+        return
+
+    old_nodes = old_tree[1] or {}
+    new_nodes = new_tree[1] or {}
+
+    for key in old_data.keys() | new_data.keys():
+        child_state = ()
+        if rules is not None:
+            # 跳过忽略的字段（连同整个子树）
+            ignored, child_state = rules.step(state, key)
+            if ignored:
+                continue
+
+        path = prefix + (key,)
+        in_old = key in old_data
+        in_new = key in new_data
+
+        # 字段被删除
+        if in_old and not in_new:
+            changes.append(SaveChange(path, OP_REMOVE, old_data[key], None))
+            continue
+
+        new_value = new_data[key]
+        new_node = new_nodes.get(key) or build_hash_tree(new_value, rules, child_state)
+
+        # 字段被新增
+        if not in_old:
+            if isinstance(new_value, dict):
+                _diff_dicts(path, {}, new_value, build_hash_tree({}), new_node,
+                            rules, child_state, detect_reorder, changes)
+            else:
+                changes.append(SaveChange(path, OP_ADD, None, new_value))
+            continue
+
+        old_value = old_data[key]
+        old_node = old_nodes.get(key) or build_hash_tree(old_value, rules, child_state)
+
+        # 子树摘要相同，跳过
+        if old_node[0] == new_node[0]:
+            continue
+
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            _diff_dicts(path, old_value, new_value, old_node, new_node,
+                        rules, child_state, detect_reorder, changes)
+        elif not values_equal(old_value, new_value):
+            if isinstance(old_value, list) and isinstance(new_value, list):
+                changes.extend(diff_lists(path, old_value, new_value, detect_reorder))
+            else:
+                # 普通值变化
+                changes.append(SaveChange(path, OP_CHANGE, old_value, new_value))
+        # 值相等但类型不同（可能是游戏写入时的类型变化），数值相同时也记录
+        elif type(old_value) != type(new_value):
+            if isinstance(old_value, (int, float)) and isinstance(new_value, (int, float)):
+                if float(old_value) == float(new_value):
+                    changes.append(SaveChange(path, OP_TYPE, old_value, new_value))
+
+
+def _benchmark_list_diff(size: int = 5000, repeat: int = 3, legacy: bool = False) -> None:
+    """
+    列表比较的性能测试：对比逐元素查找（旧实现）和计数器比较
+
+    用法: python save_diff.py [元素数量] [--legacy]
+
+    Args:
+        size: 列表元素数量
+        repeat: 重复次数
+        legacy: 是否同时测试旧实现（O(n·m)，只测前 _LEGACY_BENCHMARK_SIZE 个元素）
+    """
+    import random
+    import time
+
+    def legacy_diff(old_list, new_list):
+        """旧实现：每个元素都在另一个列表中线性查找并重复序列化"""
+        def find_item_in_list(item, lst):
+            item_cmp = _canonical_item(item)
+            return any(_canonical_item(other) == item_cmp for other in lst)
+        added = [item for item in new_list if not find_item_in_list(item, old_list)]
+        removed = [item for item in old_list if not find_item_in_list(item, new_list)]
+        return added, removed
+
+    rng = random.Random(0)
+    old_list = [{"id": i, "name": f"sticker_{i}", "flags": [rng.randint(0, 9) for _ in range(5)],
+                 "meta": {"time": rng.random()}} for i in range(size)]
+    new_list = list(old_list)
+    rng.shuffle(new_list)
+    for _ in range(size // 100 or 1):
+        new_list.pop()
+        new_list.append({"id": -1, "name": "new", "flags": [], "meta": {}})
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        diff_lists(("bench",), old_list, new_list, detect_reorder=True)
+    new_time = (time.perf_counter() - start) / repeat
+    print(f"diff_lists: {size} items, {new_time * 1000:.1f} ms")
+
+    if not legacy:
+        return
+
+    # 旧实现是O(n·m)，只取少量元素测一次
+    legacy_size = min(size, _LEGACY_BENCHMARK_SIZE)
+    start = time.perf_counter()
+    legacy_diff(old_list[:legacy_size], new_list[:legacy_size])
+    legacy_time = time.perf_counter() - start
+    print(f"legacy:     {legacy_size} items, {legacy_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+    args = [arg for arg in sys.argv[1:] if arg != "--legacy"]
+    _benchmark_list_diff(int(args[0]) if args else 5000, legacy="--legacy" in sys.argv[1:])
@@ -0,0 +1,127 @@
+from typing import Any, Dict, FrozenSet, Tuple
+
+# 固定的 omakes 总数列表
+TOTAL_OMAKES = ["1", "3", "5", "10", "15", "17", "21", "22", "9", "4", "19", "20", "23", "2", "8", "7", "6", "11", "12", "13", "14", "16", "18", "24", "26", "33", "25", "31", "38", "39", "41", "40", "42", "43", "44", "32"]
+
+# 固定的 gallery 总数列表
+TOTAL_GALLERY = ["kupya_kaisou", "JU", "fuga_kaisou", "Lamia", "BBB_1", "BBB_2", "DE", "me", "kaisou", "end", "BBB_3", "NA", "yume", "ma", "D", "pa", "geki", "debi", "NISU", "amo", "mane", "DR", "BBB"]
+
+# 固定的 ngScene 总数列表
+TOTAL_NG_SCENE = ["geki", "yume_kupya", "yume_debi", "neodebi", "koumori", "BBB", "amo", "naza", "mane", "DR", "hade", "debi", "gauru"]
+
+# 总共132个贴纸，编号1-133，没有82
+ALL_STICKER_IDS = frozenset(set(range(1, 82)) | set(range(83, 134)))
+TOTAL_STICKERS = 132
+
+
+def _numeric_sort_key(value: str) -> int:
+    """结局、额外内容编号的排序键（非数字排在最后）"""
+    return int(value) if value.isdigit() else 999
+
+
+class SaveStats:
+    """
+    由一份存档数据计算出的统计结果（纯数据，不依赖Tk）
+
+    各集合为 frozenset，各列表为已排序的 tuple，创建后不应修改，
+    同一份存档快照的统计结果会被多个界面共享
+    """
+
+    def __init__(self, save_data: Dict[str, Any]):
+        if not save_data:
+            save_data = {}
+        # 狂信徒线条件
+        kill = save_data.get("kill", None)
+        killed = save_data.get("killed", None)
+        self.is_fanatic_route: bool = (
+            (kill is not None and kill == 1) or
+            (killed is not None and killed == 1)
+        )
+
+        # 结局
+        self.endings: FrozenSet[str] = frozenset(save_data.get("endings", []))
+        self.collected_endings: FrozenSet[str] = frozenset(save_data.get("collectedEndings", []))
+        self.missing_endings: Tuple[str, ...] = tuple(
+            sorted(self.endings - self.collected_endings, key=_numeric_sort_key))
+
+        # 贴纸
+        self.stickers: FrozenSet[int] = frozenset(save_data.get("sticker", []))
+        self.sticker_count: int = len(self.stickers)
+        self.total_stickers: int = TOTAL_STICKERS
+        self.collected_stickers: Tuple[int, ...] = tuple(sorted(self.stickers))
+        self.missing_stickers: Tuple[int, ...] = tuple(sorted(ALL_STICKER_IDS - self.stickers))
+        self.stickers_percent: float = (
+            (self.sticker_count / self.total_stickers * 100) if self.total_stickers > 0 else 0)
+
+        # 角色（过滤掉空字符串和空白字符）
+        self.characters: FrozenSet[str] = frozenset(
+            c for c in save_data.get("characters", []) if c and c.strip())
+        self.collected_characters: FrozenSet[str] = frozenset(
+            c for c in save_data.get("collectedCharacters", []) if c and c.strip())
+        self.missing_characters: Tuple[str, ...] = tuple(sorted(self.characters - self.collected_characters))
+
+        # 额外内容（omakes 是已收集的额外内容列表）
+        total_omakes_set = frozenset(TOTAL_OMAKES)
+        self.collected_omakes: FrozenSet[str] = frozenset(save_data.get("omakes", []))
+        self.total_omakes_count: int = len(total_omakes_set)
+        self.missing_omakes: Tuple[str, ...] = tuple(
+            sorted(total_omakes_set - self.collected_omakes, key=_numeric_sort_key))
+
+        # 画廊和NG场景
+        self.gallery_count: int = len(save_data.get("gallery", []))
+        self.total_gallery_count: int = len(TOTAL_GALLERY)
+        self.ng_scene_count: int = len(save_data.get("ngScene", []))
+        self.total_ng_scene_count: int = len(TOTAL_NG_SCENE)
+
+        # MP和判定
+        self.whole_total_mp = save_data.get("wholeTotalMP", 0)
+        judge_counts = save_data.get("judgeCounts", {})
+        self.perfect = judge_counts.get("perfect", 0)
+        self.good = judge_counts.get("good", 0)
+        self.bad = judge_counts.get("bad", 0)
+
+    @property
+    def gallery_display(self) -> str:
+        """画廊数量显示文本（已收集/总数）"""
+        return f"{self.gallery_count}/{self.total_gallery_count}"
+
+    @property
+    def ng_scene_display(self) -> str:
+        """NG场景数量显示文本（已收集/总数）"""
+        return f"{self.ng_scene_count}/{self.total_ng_scene_count}"
+
+
+def _benchmark(repeat: int = 1000) -> None:
+    """
+    统计计算的性能测试
+
+    用法: python save_stats.py [次数]
+    """
+    import random
+    import time
+
+    rng = random.Random(0)
+    save_data = {
+        "sticker": rng.sample(sorted(ALL_STICKER_IDS), 100),
+        "endings": [str(i) for i in range(1, 46)],
+        "collectedEndings": [str(i) for i in rng.sample(range(1, 46), 30)],
+        "characters": [f"chara_{i}" for i in range(60)],
+        "collectedCharacters": [f"chara_{i}" for i in range(40)],
+        "omakes": rng.sample(TOTAL_OMAKES, 20),
+        "gallery": TOTAL_GALLERY[:15],
+        "ngScene": TOTAL_NG_SCENE[:5],
+        "wholeTotalMP": 123456,
+        "judgeCounts": {"perfect": 1000, "good": 200, "bad": 30},
+        "memory": {f"flag_{i}": i for i in range(2000)},
+    }
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        SaveStats(save_data)
+    compute_time = (time.perf_counter() - start) / repeat
+    print(f"SaveStats(): {compute_time * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
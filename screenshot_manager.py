@@ -16,6 +16,9 @@ import shutil
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
+from styles import Debouncer
+from storage_events import (EVENT_PHOTO_INDEX_CHANGED, EVENT_SCREENSHOT_ADDED,
+                            EVENT_SCREENSHOT_REMOVED, EVENT_SCREENSHOT_CHANGED)
 
 # I really should have used rust。
 
@@ -548,6 +551,66 @@ class ScreenshotManagerUI:
         else:
             self.hint_label.pack(pady=10)
     
+    def attach_event_bus(self, event_bus):
+        """
+        订阅截图相关的文件事件，游戏或其他程序修改截图时自动更新列表
+        
+        Args:
+            event_bus: storage_events.EventBus 实例
+        """
+        self.detach_event_bus()
+        self._storage_event_debouncer = Debouncer(self.root, 300)
+        self._event_unsubscribers = [
+            event_bus.subscribe(event_type, self._on_storage_event)
+            for event_type in (EVENT_PHOTO_INDEX_CHANGED, EVENT_SCREENSHOT_ADDED,
+                               EVENT_SCREENSHOT_REMOVED, EVENT_SCREENSHOT_CHANGED)
+        ]
+    
+    def detach_event_bus(self):
+        """取消订阅文件事件"""
+        for unsubscribe in getattr(self, '_event_unsubscribers', []):
+            unsubscribe()
+        self._event_unsubscribers = []
+        debouncer = getattr(self, '_storage_event_debouncer', None)
+        if debouncer is not None:
+            debouncer.cancel()
+    
+    def _on_storage_event(self, event):
+        """截图文件事件回调：先清理受影响的图片缓存，再合并重新加载"""
+        if event.item_id and event.type in (EVENT_SCREENSHOT_REMOVED, EVENT_SCREENSHOT_CHANGED):
+            with self.cache_lock:
+                self.image_cache.pop(event.item_id, None)
+        self._storage_event_debouncer.call(self._reload_if_changed)
+    
+    def _reload_if_changed(self):
+        """重新读取索引和文件列表，只有与当前显示不同时才刷新列表（保留勾选状态）"""
+        if not self.storage_dir:
+            return
+        
+        manager = self.screenshot_manager
+        old_ids_data = list(manager.ids_data)
+        old_pairs = dict(manager.sav_pairs)
+        checked_ids = set(self.get_selected_ids())
+        
+        manager.set_storage_dir(self.storage_dir)
+        try:
+            if not manager.load_screenshots():
+                return
+        except Exception:
+            return
+        
+        if manager.ids_data == old_ids_data and manager.sav_pairs == old_pairs:
+            return
+        
+        # 数据已在上面读取，只需刷新列表
+        self.load_screenshots(silent=True, reload=False)
+        
+        # 恢复勾选状态
+        if checked_ids:
+            for var, id_str in self.checkbox_vars.values():
+                if id_str in checked_ids:
+                    var.set(True)
+    
     def update_ui_texts(self):
         """更新UI文本"""
         self.hint_label.config(text=self.t("select_dir_hint"))
@@ -563,18 +626,25 @@ class ScreenshotManagerUI:
         self.export_button.config(text=self.t("export_image"))
         self.batch_export_button.config(text=self.t("batch_export"))
     
-    def load_screenshots(self, silent=False):
-        """加载截图列表"""
+    def load_screenshots(self, silent=False, reload=True):
+        """
+        加载截图列表
+        
+        Args:
+            silent: 加载失败时是否不弹出错误提示
+            reload: 是否重新读取索引和文件（False时直接用screenshot_manager中已读取的数据刷新列表）
+        """
         if not self.storage_dir:
             return
         
-        # 设置screenshot_manager的存储目录并加载数据
-        self.screenshot_manager.set_storage_dir(self.storage_dir)
-        
-        if not self.screenshot_manager.load_screenshots():
-            if not silent:
-                messagebox.showerror(self.t("error"), self.t("missing_files"))
-            return
+        if reload:
+            # 设置screenshot_manager的存储目录并加载数据
+            self.screenshot_manager.set_storage_dir(self.storage_dir)
+            
+            if not self.screenshot_manager.load_screenshots():
+                if not silent:
+                    messagebox.showerror(self.t("error"), self.t("missing_files"))
+                return
         
         # 隐藏提示标签（因为已经成功加载）
         self.hint_label.pack_forget()
@@ -0,0 +1,278 @@
+import os
+import re
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+# 事件类型
+EVENT_SAVE_CHANGED = "save_changed"                # DevilConnection_sf.sav 内容变化
+EVENT_TYRANO_CHANGED = "tyrano_changed"            # DevilConnection_tyrano_data.sav 变化
+EVENT_PHOTO_INDEX_CHANGED = "photo_index_changed"  # 截图索引文件（photo_ids / photo_all_ids）变化
+EVENT_SCREENSHOT_ADDED = "screenshot_added"        # 新增截图文件
+EVENT_SCREENSHOT_REMOVED = "screenshot_removed"    # 截图文件被删除
+EVENT_SCREENSHOT_CHANGED = "screenshot_changed"    # 截图或缩略图内容变化
+EVENT_FILE_CHANGED = "file_changed"                # 其他 .sav 文件（如 NEO.sav）变化
+
+# 文件分类
+FILE_SAVE = "save"
+FILE_TYRANO = "tyrano"
+FILE_PHOTO_INDEX = "photo_index"
+FILE_PHOTO = "photo"
+FILE_PHOTO_THUMB = "photo_thumb"
+FILE_OTHER = "other"
+
+SAVE_FILENAME = "DevilConnection_sf.sav"
+TYRANO_FILENAME = "DevilConnection_tyrano_data.sav"
+PHOTO_INDEX_FILENAMES = {"DevilConnection_photo_ids.sav", "DevilConnection_photo_all_ids.sav"}
+_PHOTO_PATTERN = re.compile(r"^DevilConnection_photo_([^_]+)(_thumb)?\.sav$")
+
+# 文件变化类型
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_MODIFIED = "modified"
+
+# 轮询模式下，目录修改时间未变化时完整扫描 _storage 的最小间隔（秒）：
+# 新增/删除/替换文件会改变目录修改时间，原地写入不会，靠定期扫描兜底
+POLL_FULL_SCAN_INTERVAL = 5.0
+
+
+class StorageEvent(NamedTuple):
+    """
+    _storage 中的文件事件
+
+    type: 事件类型（EVENT_*）
+    filename: 相关文件名
+    changes: 存档变更记录（仅 EVENT_SAVE_CHANGED，已应用忽略规则）
+    data: 解析后的新存档数据（仅 EVENT_SAVE_CHANGED）
+    item_id: 截图ID（仅截图相关事件）
+    """
+    type: str
+    filename: str
+    changes: Optional[list] = None
+    data: Any = None
+    item_id: Optional[str] = None
+
+
+def classify_storage_file(filename: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    判断 _storage 中文件的类别
+
+    Args:
+        filename: 文件名
+
+    Returns:
+        (类别 FILE_*, 截图ID)；不是 .sav 文件时类别为None
+    """
+    if not filename.endswith(".sav"):
+        return None, None
+    if filename == SAVE_FILENAME:
+        return FILE_SAVE, None
+    if filename == TYRANO_FILENAME:
+        return FILE_TYRANO, None
+    if filename in PHOTO_INDEX_FILENAMES:
+        return FILE_PHOTO_INDEX, None
+    match = _PHOTO_PATTERN.match(filename)
+    if match:
+        return (FILE_PHOTO_THUMB if match.group(2) else FILE_PHOTO), match.group(1)
+    return FILE_OTHER, None
+
+
+def event_for_file_change(filename: str, change: str) -> Optional[StorageEvent]:
+    """
+    把文件变化转换为事件（存档文件本身由监控线程做差异比较后单独发布）
+
+    Args:
+        filename: 文件名
+        change: 变化类型（CHANGE_*）
+
+    Returns:
+        StorageEvent，不需要发布时返回None
+    """
+    category, item_id = classify_storage_file(filename)
+    if category is None or category == FILE_SAVE:
+        return None
+    if category == FILE_TYRANO:
+        return StorageEvent(EVENT_TYRANO_CHANGED, filename)
+    if category == FILE_PHOTO_INDEX:
+        return StorageEvent(EVENT_PHOTO_INDEX_CHANGED, filename)
+    if category == FILE_PHOTO and change == CHANGE_ADDED:
+        return StorageEvent(EVENT_SCREENSHOT_ADDED, filename, item_id=item_id)
+    if category == FILE_PHOTO and change == CHANGE_REMOVED:
+        return StorageEvent(EVENT_SCREENSHOT_REMOVED, filename, item_id=item_id)
+    if category in (FILE_PHOTO, FILE_PHOTO_THUMB):
+        return StorageEvent(EVENT_SCREENSHOT_CHANGED, filename, item_id=item_id)
+    return StorageEvent(EVENT_FILE_CHANGED, filename)
+
+
+class StorageScanner:
+    """
+    记录 _storage 中所有 .sav 文件的状态 (size, mtime_ns, inode)，找出新增/删除/修改的文件
+    """
+
+    def __init__(self, directory: str, full_scan_interval: float = POLL_FULL_SCAN_INTERVAL):
+        self.directory = directory
+        self.full_scan_interval = full_scan_interval
+        self._stats: Dict[str, Tuple[int, int, int]] = {}
+        self._dir_mtime_ns: Optional[int] = None  # 上次完整扫描时的目录修改时间
+        self._last_full_scan = 0.0  # 上次完整扫描的时间（time.monotonic）
+
+    def reset(self) -> None:
+        """以当前目录状态作为基线（不产生变化）"""
+        self._dir_mtime_ns = self._get_dir_mtime()
+        self._last_full_scan = time.monotonic()
+        self._stats = self._scan_all()
+
+    def _get_dir_mtime(self) -> Optional[int]:
+        """获取目录的修改时间，目录不存在时返回None"""
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def full_scan_due(self) -> bool:
+        """
+        轮询模式下是否需要完整扫描：目录修改时间变化（文件新增/删除/替换）
+        或距离上次完整扫描超过 full_scan_interval 时才需要
+        """
+        if time.monotonic() - self._last_full_scan >= self.full_scan_interval:
+            return True
+        return self._get_dir_mtime() != self._dir_mtime_ns
+
+    def _scan_all(self) -> Dict[str, Tuple[int, int, int]]:
+        """扫描目录中所有 .sav 文件的状态"""
+        stats = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".sav"):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    stats[entry.name] = (st.st_size, st.st_mtime_ns, st.st_ino)
+        except OSError:
+            pass
+        return stats
+
+    def _stat_file(self, filename: str) -> Optional[Tuple[int, int, int]]:
+        """获取单个文件的状态，不存在时返回None"""
+        try:
+            st = os.stat(os.path.join(self.directory, filename))
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+    def scan(self, names: Optional[Set[str]] = None) -> List[Tuple[str, str]]:
+        """
+        找出发生变化的文件并更新基线
+
+        Args:
+            names: 只检查这些文件名（来自inotify事件）；None表示扫描整个目录
+
+        Returns:
+            [(文件名, CHANGE_*), ...]
+        """
+        if names is None:
+            # 先记录目录修改时间再扫描，扫描期间的变化会在下一次检查时发现
+            self._dir_mtime_ns = self._get_dir_mtime()
+            self._last_full_scan = time.monotonic()
+            current = self._scan_all()
+            candidates = set(current) | set(self._stats)
+        else:
+            candidates = {name for name in names if name.endswith(".sav")}
+            current = {}
+            for name in candidates:
+                file_stat = self._stat_file(name)
+                if file_stat is not None:
+                    current[name] = file_stat
+
+        changes = []
+        for name in sorted(candidates):
+            old_stat = self._stats.get(name)
+            new_stat = current.get(name)
+            if old_stat == new_stat:
+                continue
+            if old_stat is None:
+                changes.append((name, CHANGE_ADDED))
+            elif new_stat is None:
+                changes.append((name, CHANGE_REMOVED))
+            else:
+                changes.append((name, CHANGE_MODIFIED))
+            if new_stat is None:
+                self._stats.pop(name, None)
+            else:
+                self._stats[name] = new_stat
+        return changes
+
+
+class EventBus:
+    """
+    内部事件总线：任意线程发布，订阅者的回调统一在 tkinter 主线程中执行
+    """
+
+    def __init__(self, root):
+        """
+        Args:
+            root: tkinter 根窗口（用于 after 调度）
+        """
+        self.root = root
+        self._subscribers: Dict[str, List[Callable[[StorageEvent], None]]] = {}
+        self._lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._dispatch_scheduled = False
+
+    def subscribe(self, event_type: str, callback: Callable[[StorageEvent], None]) -> Callable[[], None]:
+        """
+        订阅事件
+
+        Args:
+            event_type: 事件类型（EVENT_*）
+            callback: 回调函数，参数为 StorageEvent
+
+        Returns:
+            取消订阅的函数
+        """
+        with self._lock:
+            self._subscribers.setdefault(event_type, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(event_type, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, event: StorageEvent) -> None:
+        """发布事件（线程安全，回调在主线程中异步执行）"""
+        with self._lock:
+            if not self._subscribers.get(event.type):
+                return
+            self._pending.put(event)
+            if self._dispatch_scheduled:
+                return
+            self._dispatch_scheduled = True
+        try:
+            self.root.after(0, self._dispatch)
+        except Exception:
+            with self._lock:
+                self._dispatch_scheduled = False
+
+    def _dispatch(self) -> None:
+        """在主线程中把排队的事件分发给订阅者"""
+        with self._lock:
+            self._dispatch_scheduled = False
+        while True:
+            try:
+                event = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                callbacks = list(self._subscribers.get(event.type, []))
+            for callback in callbacks:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"事件处理异常 ({event.type}): {e}")
@@ -348,6 +348,15 @@ class ThrottledUpdater:
                     pass
             
             self._pending_update = self.widget.after(max(1, delay), execute)
+    
+    def cancel(self):
+        """取消待执行的延迟更新"""
+        if self._pending_update is not None:
+            try:
+                self.widget.after_cancel(self._pending_update)
+            except:
+                pass
+            self._pending_update = None
 
 
 # =====================================================
@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from tkinter import font as tkfont
+
+TEXT_LAYOUT_CACHE_SIZE = 4096  # 换行结果缓存的最大条数（LRU）
+
+# 这些语言的文本按单词换行（在空格处断行），其他语言（中文、日文）按字符换行
+_WORD_WRAP_LANGUAGES = {"en_US"}
+
+
+class TextLayout:
+    """
+    基于 tkinter.font.Font.measure 的文本换行计算
+
+    每种字体的单字符宽度只测量一次并缓存，换行时累加字符宽度判断是否超出；
+    换行结果按 (文本, 字体, 宽度, 语言) 缓存
+    """
+
+    def __init__(self, max_entries: int = TEXT_LAYOUT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._fonts: Dict[Any, tkfont.Font] = {}
+        self._char_widths: Dict[Any, Dict[str, int]] = {}
+        self._layouts: "OrderedDict[Tuple[str, Any, int, Optional[str]], Tuple[str, ...]]" = OrderedDict()
+
+    def _font_object(self, font) -> tkfont.Font:
+        """获取字体描述对应的Font对象（带缓存）"""
+        font_obj = self._fonts.get(font)
+        if font_obj is None:
+            if isinstance(font, tkfont.Font):
+                font_obj = font
+            elif isinstance(font, tuple) and len(font) == 2:
+                font_obj = tkfont.Font(family=font[0], size=font[1])
+            else:
+                font_obj = tkfont.Font(font=font)
+            self._fonts[font] = font_obj
+        return font_obj
+
+    def char_width(self, font, char: str) -> int:
+        """获取单个字符的宽度（像素）"""
+        widths = self._char_widths.get(font)
+        if widths is None:
+            widths = self._char_widths[font] = {}
+        width = widths.get(char)
+        if width is None:
+            width = widths[char] = self._font_object(font).measure(char)
+        return width
+
+    def text_width(self, text: str, font) -> int:
+        """按字符宽度累加计算文本宽度（像素）"""
+        return sum(self.char_width(font, char) for char in text)
+
+    def wrap(self, text: str, font, max_width: int, language: Optional[str] = None) -> List[str]:
+        """
+        计算文本换行
+
+        Args:
+            text: 文本（其中的换行符作为强制换行）
+            font: 字体描述（如 get_cjk_font() 的返回值）
+            max_width: 每行最大宽度（像素）
+            language: 语言代码，英文按单词换行，其他按字符换行
+
+        Returns:
+            行列表
+        """
+        key = (text, font, max_width, language)
+        lines = self._layouts.get(key)
+        if lines is not None:
+            self._layouts.move_to_end(key)
+            return list(lines)
+
+        word_wrap = language in _WORD_WRAP_LANGUAGES
+        result = []
+        for paragraph in text.split("\n"):
+            result.extend(self._wrap_paragraph(paragraph, font, max_width, word_wrap))
+        lines = tuple(result) if result else (text,)
+
+        self._layouts[key] = lines
+        if len(self._layouts) > self.max_entries:
+            self._layouts.popitem(last=False)
+        return list(lines)
+
+    def _wrap_paragraph(self, text: str, font, max_width: int, word_wrap: bool) -> List[str]:
+        """对不含换行符的一段文本计算换行"""
+        if not text:
+            return [""]
+
+        lines = []
+        current = []  # 当前行的字符
+        current_width = 0
+        last_space = -1  # 当前行中最后一个空格的位置（按单词换行时使用）
+
+        for char in text:
+            width = self.char_width(font, char)
+            if current and current_width + width > max_width:
+                if word_wrap and last_space > 0 and char != " ":
+                    # 在最后一个空格处断行，空格之后的部分移到下一行
+                    lines.append("".join(current[:last_space]).rstrip())
+                    current = current[last_space + 1:]
+                    current_width = self.text_width("".join(current), font)
+                else:
+                    lines.append("".join(current).rstrip() if word_wrap else "".join(current))
+                    current = []
+                    current_width = 0
+                last_space = -1
+                if word_wrap and char == " " and not current:
+                    # 行首的空格直接丢弃
+                    continue
+            if char == " ":
+                last_space = len(current)
+            current.append(char)
+            current_width += width
+
+        if current:
+            lines.append("".join(current))
+        return lines
+
+    def clear(self) -> None:
+        """清空所有缓存（如字体缩放变化后）"""
+        self._fonts.clear()
+        self._char_widths.clear()
+        self._layouts.clear()
+
+
+_default_layout = TextLayout()
+
+
+def wrap_text(text: str, font, max_width: int, language: Optional[str] = None) -> List[str]:
+    """使用共享的 TextLayout 计算文本换行（见 TextLayout.wrap）"""
+    return _default_layout.wrap(text, font, max_width, language)
+
+
+def text_width(text: str, font) -> int:
+    """使用共享的 TextLayout 计算文本宽度"""
+    return _default_layout.text_width(text, font)
@@ -1,52 +1,44 @@
+import time
 import tkinter as tk
 import platform
+from typing import Dict, List, Optional
 from styles import get_cjk_font, Colors
 
+TOAST_POOL_SIZE = 4  # 空闲时保留的toast窗口数量（超出的窗口关闭后直接销毁）
+TOAST_FRAME_INTERVAL = 16  # 动画帧间隔（毫秒）
+TOAST_WIDTH = 300
+TOAST_MARGIN = 15  # 距屏幕右下角的距离（像素）
+TOAST_SPACING = 10  # toast之间的间距（像素）
+TOAST_ALPHA = 0.85  # 正常显示时的透明度
+TOAST_FLASH_ALPHA = 0.95  # 点击反馈时的透明度
+TOAST_FLASH_DURATION = 200  # 点击反馈持续时间（毫秒）
 
-class Toast:
-    
-    # 类变量：存储所有活跃的toast实例
-    _active_toasts = []
-    _toast_spacing = 10  # toast之间的间距（像素）
+
+class _ToastWindow:
+    """
+    可复用的toast窗口：Toplevel及其内部组件只创建一次，
+    关闭toast时隐藏窗口并放回池中，下次显示toast时直接复用
+    """
     
-    def __init__(self, root, message, duration=10000, fade_in=200, fade_out=200, y_offset=None):
-        """
-        创建通知
-        
-        Args:
-            root: 根窗口
-            message: 通知消息
-            duration: 显示持续时间（毫秒，不包括动画时间）
-            fade_in: 淡入动画时间（毫秒）
-            fade_out: 淡出动画时间（毫秒）
-            y_offset: Y轴偏移量（从底部算起），如果为None则自动计算
-        """
-        self.root = root
-        self.message = message
-        self.duration = duration
-        self.fade_in = fade_in
-        self.fade_out = fade_out
-        self.y_offset = y_offset
-        self._fade_out_scheduled = None
-        self._pinned = False
+    def __init__(self, root):
+        self.toast: Optional["Toast"] = None  # 当前使用该窗口的Toast
+        self._geometry = None  # 最近一次设置的 (高度, y)，位置不变时不重复设置
+        self._alpha = None
         
         self.window = tk.Toplevel(root)
+        self.window.withdraw()
         self.window.title("")
         self.window.overrideredirect(True)
         self.window.attributes("-topmost", True)
         
         self.window.configure(bg=Colors.TOAST_BG)
         
-        self.screen_width = root.winfo_screenwidth()
-        self.screen_height = root.winfo_screenheight()
-        
-        self.window_width = 300
-        
         self.supports_alpha = False
         if platform.system() == "Windows":
             try:
                 self.window.attributes("-alpha", 0.0)
                 self.supports_alpha = True
+                self._alpha = 0.0
             except:
                 self.supports_alpha = False
         
@@ -101,20 +93,7 @@ class Toast:
         self.message_text.tag_configure("red", foreground="#f87171")
         self.message_text.tag_configure("default", foreground=Colors.TOAST_TEXT)
         
-        self._bind_click_events()
-        
-        self._insert_colored_text(self.message_text, message)
-        
-        self.window.update_idletasks()
-        
-        self._calculate_and_set_geometry()
-        
-        Toast._active_toasts.append(self)
-        
-        self._animate()
-    
-    def _bind_click_events(self):
-        """绑定点击事件到所有组件（除了关闭按钮）"""
+        # 点击toast的其他部分（除了关闭按钮）
         for widget in [self.main_container, self.content_frame, self.message_text, self.top_bar]:
             widget.bind("<Button-1>", self._on_toast_click)
     
@@ -128,66 +107,306 @@ class Toast:
     
     def _on_close_click(self, event):
         """点击关闭按钮"""
-        self._close_toast()
+        if self.toast is not None:
+            self.toast._close_toast()
     
     def _on_toast_click(self, event):
         """点击toast的其他部分"""
-        if self._pinned:
+        if self.toast is not None:
+            self.toast._on_toast_click(event)
+    
+    def exists(self) -> bool:
+        """窗口是否仍然存在（根窗口销毁后为False）"""
+        try:
+            return bool(self.window.winfo_exists())
+        except:
+            return False
+    
+    def set_alpha(self, alpha: float) -> None:
+        """设置透明度（与当前值相同时跳过）"""
+        if not self.supports_alpha or alpha == self._alpha:
             return
+        try:
+            self.window.attributes("-alpha", alpha)
+            self._alpha = alpha
+        except:
+            pass
+    
+    def place(self, x: int, y: int, height: int) -> None:
+        """设置窗口位置和大小（与上次相同时跳过）"""
+        if self._geometry == (height, y):
+            return
+        try:
+            self.window.geometry(f"{TOAST_WIDTH}x{height}+{x}+{y}")
+            self._geometry = (height, y)
+        except:
+            pass
+    
+    def show(self) -> None:
+        """显示窗口"""
+        try:
+            self.window.deiconify()
+            self.window.attributes("-topmost", True)
+        except:
+            pass
+    
+    def hide(self) -> None:
+        """隐藏窗口并恢复初始状态，准备放回池中"""
+        self.toast = None
+        try:
+            self.set_alpha(0.0)
+            self.window.withdraw()
+            self.pin_indicator.pack_forget()
+            self.close_btn.configure(fg="#666666")
+        except:
+            pass
+    
+    def destroy(self) -> None:
+        """销毁窗口"""
+        self.toast = None
+        try:
+            self.window.destroy()
+        except:
+            pass
+
+
+class ToastManager:
+    """
+    toast管理器：复用toast窗口池，所有toast的淡入淡出由同一个帧时钟驱动，
+    只在有动画时以帧间隔运行，其余时间只在最近的到期时间唤醒一次
+    """
+    
+    _managers: Dict[tk.Misc, "ToastManager"] = {}
+    
+    def __init__(self, root):
+        self.root = root
+        self.active: List["Toast"] = []  # 显示中的toast（从下往上排列）
+        self._idle: List[_ToastWindow] = []
+        self._tick_job = None
+        self._tick_due = None  # 已调度的时钟触发时间（time.monotonic()）
+    
+    @classmethod
+    def get(cls, root) -> "ToastManager":
+        """获取根窗口对应的管理器（不存在时创建）"""
+        manager = cls._managers.get(root)
+        if manager is None:
+            manager = cls(root)
+            cls._managers[root] = manager
+        return manager
+    
+    def prewarm(self, count: int = TOAST_POOL_SIZE) -> None:
+        """预先创建窗口放入池中，第一次显示toast时不需要再创建"""
+        self._idle = [handle for handle in self._idle if handle.exists()]
+        try:
+            while len(self._idle) < count:
+                self._idle.append(_ToastWindow(self.root))
+        except:
+            pass
+    
+    def acquire(self) -> _ToastWindow:
+        """从池中取出一个窗口（池为空时新建）"""
+        while self._idle:
+            handle = self._idle.pop()
+            if handle.exists():
+                return handle
+        return _ToastWindow(self.root)
+    
+    def release(self, handle: _ToastWindow) -> None:
+        """隐藏窗口并放回池中"""
+        if not handle.exists():
+            return
+        if len(self._idle) < TOAST_POOL_SIZE:
+            handle.hide()
+            self._idle.append(handle)
+        else:
+            handle.destroy()
+    
+    def add(self, toast: "Toast") -> None:
+        """添加一个新的toast并显示"""
+        self.active.append(toast)
+        if toast.y_offset is None:
+            self.relayout(len(self.active) - 1)
+        else:
+            toast._place()
+        toast._handle.show()
+        self.schedule()
+    
+    def remove(self, toast: "Toast") -> None:
+        """移除toast，并把它上方的toast往下移"""
+        try:
+            index = self.active.index(toast)
+        except ValueError:
+            return
+        del self.active[index]
+        self.relayout(index)
+    
+    def relayout(self, start: int = 0) -> None:
+        """
+        重新排列toast（只处理start及之后的toast，下方的toast位置不受影响）
         
-        self._pinned = True
-        
-        if self._fade_out_scheduled:
+        Args:
+            start: 第一个可能移动的toast在 active 中的下标
+        """
+        y_offset = sum(toast.window_height + TOAST_SPACING for toast in self.active[:start])
+        for toast in self.active[start:]:
+            toast.y_offset = y_offset
+            toast._place()
+            y_offset += toast.window_height + TOAST_SPACING
+    
+    def schedule(self) -> None:
+        """根据动画和到期时间安排下一次时钟触发"""
+        if any(toast._anim is not None for toast in self.active):
+            delay = TOAST_FRAME_INTERVAL
+        else:
+            deadlines = [toast._deadline for toast in self.active if toast._deadline is not None]
+            if not deadlines:
+                self._cancel_tick()
+                return
+            delay = max(0, int((min(deadlines) - time.monotonic()) * 1000) + 1)
+        
+        due = time.monotonic() + delay / 1000
+        if self._tick_job is not None and self._tick_due is not None and self._tick_due <= due:
+            return
+        self._cancel_tick()
+        try:
+            self._tick_job = self.root.after(delay, self._tick)
+            self._tick_due = due
+        except:
+            self._tick_job = None
+            self._tick_due = None
+    
+    def _cancel_tick(self) -> None:
+        """取消已调度的时钟触发"""
+        if self._tick_job is not None:
             try:
-                self.window.after_cancel(self._fade_out_scheduled)
-                self._fade_out_scheduled = None
+                self.root.after_cancel(self._tick_job)
             except:
                 pass
+        self._tick_job = None
+        self._tick_due = None
+    
+    def _tick(self) -> None:
+        """时钟触发：推进所有toast的动画，处理到期的toast"""
+        self._tick_job = None
+        self._tick_due = None
+        now = time.monotonic()
+        for toast in list(self.active):
+            if not toast._handle.exists():
+                self.active.remove(toast)
+                toast._closed = True
+                continue
+            toast._advance(now)
+        self.schedule()
+
+
+class Toast:
+    
+    def __init__(self, root, message, duration=10000, fade_in=200, fade_out=200, y_offset=None):
+        """
+        创建通知
         
-        self.pin_indicator.pack(side="left", padx=2)
+        Args:
+            root: 根窗口
+            message: 通知消息
+            duration: 显示持续时间（毫秒，不包括动画时间）
+            fade_in: 淡入动画时间（毫秒）
+            fade_out: 淡出动画时间（毫秒）
+            y_offset: Y轴偏移量（从底部算起），如果为None则自动计算
+        """
+        self.root = root
+        self.message = message
+        self.duration = duration
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+        self.y_offset = y_offset
+        self._pinned = False
+        self._closed = False
+        self._anim = None  # (开始时间, 持续秒数, 起始透明度, 目标透明度, 完成回调)
+        self._deadline = None  # 开始淡出的时间（time.monotonic()）
+        self._fading_out = False
         
-        self._flash_feedback()
-    
-    def _flash_feedback(self):
-        """点击反馈：短暂提高透明度"""
-        if not self.window.winfo_exists():
-            return
+        self._manager = ToastManager.get(root)
+        self._handle = self._manager.acquire()
+        self._handle.toast = self
         
-        if self.supports_alpha:
-            try:
-                self.window.attributes("-alpha", 0.95)
-                self.window.after(200, self._restore_alpha)
-            except:
-                pass
+        self.window = self._handle.window
+        self.message_text = self._handle.message_text
+        self.pin_indicator = self._handle.pin_indicator
+        self.supports_alpha = self._handle.supports_alpha
+        
+        self.screen_width = root.winfo_screenwidth()
+        self.screen_height = root.winfo_screenheight()
+        
+        self.window_width = TOAST_WIDTH
+        
+        self._handle.set_alpha(0.0)
+        self._insert_colored_text(self.message_text, message)
+        self.window_height = self._calculate_window_height()
+        
+        self._animate()
+        self._manager.add(self)
     
-    def _restore_alpha(self):
-        """恢复正常透明度"""
-        if not self.window.winfo_exists():
+    def is_active(self) -> bool:
+        """toast是否仍在显示（窗口会被复用，不能用 window.winfo_exists() 判断）"""
+        return not self._closed and self._handle.exists()
+    
+    def _on_toast_click(self, event):
+        """点击toast的其他部分：固定显示"""
+        if self._pinned or self._closed:
             return
         
-        if self.supports_alpha:
-            try:
-                self.window.attributes("-alpha", 0.85)
-            except:
-                pass
+        self._pinned = True
+        self._deadline = None
+        
+        self.pin_indicator.pack(side="left", padx=2)
+        
+        # 点击反馈：短暂提高透明度
+        self._fading_out = False
+        self._start_animation(TOAST_FLASH_ALPHA, TOAST_FLASH_ALPHA, TOAST_FLASH_DURATION,
+                              lambda: self._handle.set_alpha(TOAST_ALPHA))
     
     def _close_toast(self):
-        """关闭toast"""
-        if not self.window.winfo_exists():
+        """关闭toast，窗口放回池中"""
+        if self._closed:
             return
         
-        if self._fade_out_scheduled:
-            try:
-                self.window.after_cancel(self._fade_out_scheduled)
-            except:
-                pass
+        self._closed = True
+        self._anim = None
+        self._deadline = None
+        
+        self._manager.remove(self)
+        self._manager.release(self._handle)
+        self._manager.schedule()
+    
+    def _place(self):
+        """按当前高度和 y_offset 设置窗口位置"""
+        x = self.screen_width - self.window_width - TOAST_MARGIN
+        y = self.screen_height - self.window_height - TOAST_MARGIN - self.y_offset
+        self._handle.place(x, y, self.window_height)
+    
+    def _calculate_window_height(self):
+        """根据消息内容计算窗口高度，并设置文本框行数"""
+        content_height = self._calculate_content_height()
         
-        self.window.destroy()
+        top_bar_height = 19
+        bottom_padding = 8
+        window_height = content_height + top_bar_height + bottom_padding
+        
+        max_height = int(self.screen_height * 0.8)
+        if window_height > max_height:
+            window_height = max_height
+        
+        min_height = 60
+        if window_height < min_height:
+            window_height = min_height
         
-        if self in Toast._active_toasts:
-            Toast._active_toasts.remove(self)
+        try:
+            lines_needed = max(1, content_height // 18)
+            self.message_text.configure(height=lines_needed)
+        except:
+            pass
         
-        Toast._reposition_toasts()
+        return window_height
     
     def _calculate_content_height(self):
         """计算内容实际需要的高度"""
@@ -229,102 +448,41 @@ class Toast:
         
         return 50
     
-    def _calculate_and_set_geometry(self):
-        """计算并设置窗口位置和大小"""
-        content_height = self._calculate_content_height()
-        
-        top_bar_height = 19
-        bottom_padding = 8
-        window_height = content_height + top_bar_height + bottom_padding
-        
-        max_height = int(self.screen_height * 0.8)
-        if window_height > max_height:
-            window_height = max_height
-        
-        min_height = 60
-        if window_height < min_height:
-            window_height = min_height
-        
-        self.window_height = window_height
-        
-        if self.y_offset is None:
-            active_toasts = [toast for toast in Toast._active_toasts if toast.window.winfo_exists()]
-            if active_toasts:
-                total_height = sum(toast.window_height + Toast._toast_spacing 
-                                 for toast in active_toasts)
-                y_offset = total_height
-            else:
-                y_offset = 0
-            self.y_offset = y_offset
-        
-        x = self.screen_width - self.window_width - 15
-        y = self.screen_height - window_height - 15 - self.y_offset
-        
-        self.window.geometry(f"{self.window_width}x{window_height}+{x}+{y}")
-        
-        try:
-            lines_needed = max(1, content_height // 18)
-            self.message_text.configure(height=lines_needed)
-        except:
-            pass
-    
     def update_message(self, new_message):
         """更新toast的消息内容（用于合并连续变化）"""
-        if not self.window.winfo_exists():
+        if not self.is_active():
             return False
         
         self.message = new_message
         self._insert_colored_text(self.message_text, new_message)
         
-        self.window.update_idletasks()
-        
-        content_height = self._calculate_content_height()
-        
-        top_bar_height = 19
-        bottom_padding = 8
-        new_height = content_height + top_bar_height + bottom_padding
-        
-        max_height = int(self.screen_height * 0.8)
-        if new_height > max_height:
-            new_height = max_height
-        min_height = 60
-        if new_height < min_height:
-            new_height = min_height
-        
         old_height = self.window_height
-        self.window_height = new_height
+        self.window_height = self._calculate_window_height()
         
-        x = self.screen_width - self.window_width - 15
-        y = self.screen_height - new_height - 15 - self.y_offset
-        self.window.geometry(f"{self.window_width}x{new_height}+{x}+{y}")
-        
-        try:
-            lines_needed = max(1, content_height // 18)
-            self.message_text.configure(height=lines_needed)
-        except:
-            pass
-        
-        if old_height != new_height:
-            Toast._reposition_toasts()
+        if old_height != self.window_height:
+            # 高度变化时，该toast及其上方的toast需要移动
+            try:
+                start = self._manager.active.index(self)
+            except ValueError:
+                start = 0
+            self._manager.relayout(start)
         
         return True
     
     def reset_timer(self):
         """重置toast的显示时间（延长显示）"""
-        if not self.window.winfo_exists():
+        if not self.is_active():
             return False
         
         if self._pinned:
             return True
         
-        if self._fade_out_scheduled:
-            try:
-                self.window.after_cancel(self._fade_out_scheduled)
-                self._fade_out_scheduled = None
-            except:
-                pass
-        
-        self._fade_out_scheduled = self.window.after(self.duration, self._start_fade_out)
+        if self._fading_out:
+            # 正在淡出时恢复显示
+            self._animate()
+        elif self._anim is None:
+            self._deadline = time.monotonic() + self.duration / 1000
+        self._manager.schedule()
         return True
     
     def _insert_colored_text(self, text_widget, message):
@@ -374,104 +532,56 @@ class Toast:
         
         text_widget.config(state="disabled")
     
+    def _start_animation(self, start_alpha, end_alpha, duration, on_done=None):
+        """
+        开始一段透明度动画（由管理器的帧时钟推进）
+        
+        Args:
+            start_alpha: 起始透明度
+            end_alpha: 目标透明度
+            duration: 持续时间（毫秒）
+            on_done: 动画结束后的回调
+        """
+        self._anim = (time.monotonic(), duration / 1000, start_alpha, end_alpha, on_done)
+        self._handle.set_alpha(start_alpha)
+        self._manager.schedule()
+    
+    def _advance(self, now):
+        """推进动画；显示时间到期时开始淡出"""
+        if self._anim is not None:
+            started, duration, start_alpha, end_alpha, on_done = self._anim
+            progress = 1.0 if duration <= 0 else min(1.0, (now - started) / duration)
+            self._handle.set_alpha(start_alpha + (end_alpha - start_alpha) * progress)
+            if progress >= 1.0:
+                self._anim = None
+                if on_done is not None:
+                    on_done()
+        elif self._deadline is not None and now >= self._deadline:
+            self._deadline = None
+            self._start_fade_out()
+    
     def _animate(self):
         """执行淡入-等待-淡出动画"""
-        self._fade_in(0.0, 0.85, self.fade_in, 0)
+        self._fading_out = False
+        self._deadline = None
+        start_alpha = 0.0
+        if self._handle._alpha is not None:
+            start_alpha = self._handle._alpha
+        self._start_animation(start_alpha, TOAST_ALPHA, self.fade_in, self._on_fade_in_done)
     
-    def _fade_in(self, start_alpha, end_alpha, duration, step):
-        """淡入动画"""
-        if not self.window.winfo_exists():
-            return
-        
-        steps = max(1, duration // 16)
-        alpha_step = (end_alpha - start_alpha) / steps
-        
-        if step < steps:
-            current_alpha = start_alpha + alpha_step * step
-            if self.supports_alpha:
-                try:
-                    self.window.attributes("-alpha", current_alpha)
-                except:
-                    pass
-            self.window.after(16, lambda: self._fade_in(start_alpha, end_alpha, duration, step + 1))
-        else:
-            if self.supports_alpha:
-                try:
-                    self.window.attributes("-alpha", end_alpha)
-                except:
-                    pass
-            if not self._pinned:
-                self._fade_out_scheduled = self.window.after(self.duration, self._start_fade_out)
+    def _on_fade_in_done(self):
+        """淡入完成，开始计时"""
+        if not self._pinned:
+            self._deadline = time.monotonic() + self.duration / 1000
     
     def _start_fade_out(self):
         """开始淡出动画"""
-        if not self.window.winfo_exists():
-            return
-        
-        if self._pinned:
-            return
-        
-        current_alpha = 0.85
-        if self.supports_alpha:
-            try:
-                current_alpha = self.window.attributes("-alpha")
-            except:
-                current_alpha = 0.85
-        
-        self._fade_out(current_alpha, 0.0, self.fade_out, 0)
-    
-    def _fade_out(self, start_alpha, end_alpha, duration, step):
-        """淡出动画"""
-        if not self.window.winfo_exists():
-            return
-        
-        steps = max(1, duration // 16)
-        alpha_step = (end_alpha - start_alpha) / steps
-        
-        if step < steps:
-            current_alpha = start_alpha + alpha_step * step
-            if self.supports_alpha:
-                try:
-                    self.window.attributes("-alpha", current_alpha)
-                except:
-                    pass
-            self.window.after(16, lambda: self._fade_out(start_alpha, end_alpha, duration, step + 1))
-        else:
-            if self.window.winfo_exists():
-                self.window.destroy()
-            if self in Toast._active_toasts:
-                Toast._active_toasts.remove(self)
-            Toast._reposition_toasts()
-    
-    @staticmethod
-    def _reposition_toasts():
-        """重新排列所有活跃的toast"""
-        if not Toast._active_toasts:
+        if self._closed or self._pinned:
             return
         
-        try:
-            root = Toast._active_toasts[0].root
-            screen_width = root.winfo_screenwidth()
-            screen_height = root.winfo_screenheight()
-        except:
-            return
+        current_alpha = TOAST_ALPHA
+        if self._handle._alpha is not None:
+            current_alpha = self._handle._alpha
         
-        active_toasts = [toast for toast in Toast._active_toasts if toast.window.winfo_exists()]
-        Toast._active_toasts = active_toasts
-        
-        if not active_toasts:
-            return
-        
-        y_offset = 0
-        window_width = 300
-        
-        for toast in active_toasts:
-            x = screen_width - window_width - 15
-            y = screen_height - toast.window_height - 15 - y_offset
-            try:
-                if toast.window.winfo_exists():
-                    toast.window.geometry(f"{window_width}x{toast.window_height}+{x}+{y}")
-                    toast.y_offset = y_offset
-                    y_offset += toast.window_height + Toast._toast_spacing
-            except:
-                continue
+        self._fading_out = True
+        self._start_animation(current_alpha, 0.0, self.fade_out, self._close_toast)
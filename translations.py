@@ -263,6 +263,7 @@ TRANSLATIONS = {
         "backup_confirm_text": "预计压缩后大小：{size}\n\n确定要创建备份吗？",
         "backup_success_title": "备份成功",
         "backup_success_text": "备份文件：{filename}\n大小：{size}\n位置：{path}",
+        "backup_skipped_files": "以下 {count} 个文件无法读取，未包含在备份中：\n{files}",
         "restore_confirm_title": "确认还原",
         "restore_confirm_text": "当前的_storage文件夹将会被完全替换，确定要继续吗？",
         "restore_missing_files_title": "缺少必需文件",
@@ -289,13 +290,60 @@ TRANSLATIONS = {
         "rename_backup_invalid_chars": "文件名包含非法字符，请勿使用：< > : \" / \\ | ? *",
         "rename_backup_success": "备份已重命名！\n原文件名：{old_filename}\n新文件名：{new_filename}",
         "rename_backup_failed": "重命名备份失败",
+        "auto_backup_enable": "存档变化时自动备份",
+        "auto_backup_interval": "最小间隔（分钟）：",
+        "auto_backup_status": "自动备份",
+        "compare_backup_button": "对比差异",
+        "compare_backup_title": "存档差异",
+        "compare_live_label": "当前_storage",
+        "compare_loading": "正在对比…",
+        "compare_no_changes": "无差异",
+        "compare_file_unavailable": "文件缺失或无法解码",
+        "cancel_operation": "取消",
+        "operation_progress_detail": "{percent}%  {done} / {total}  {speed}/s  剩余 {eta}",
+        "backup_cancelled": "备份已取消",
+        "restore_cancelled": "还原已取消，_storage未被修改",
+        "verify_backups_button": "校验备份",
+        "verify_status_ok": "✓ 校验通过",
+        "verify_status_failed": "✗ 已损坏",
+        "verify_backups_ok": "已校验 {count} 个备份，全部完好。",
+        "verify_backups_failed": "{count} 个备份校验失败：\n\n{details}",
+        "archive_backup_button": "LZMA归档",
+        "archive_status": "LZMA归档",
+        "archive_confirm_title": "确认归档",
+        "archive_confirm_text": "将在后台把选中的 {count} 个备份重新压缩为LZMA格式（体积更小，但压缩较慢）。\n压缩结果校验通过后才会替换原文件，是否继续？",
+        "archive_result": "已归档 {count} 个备份，共节省 {size}",
 
         # Others tab
         "others_tab": "其他",
         "enable_toast": "开启toast功能",
         "toast_ignore_record": "toast不监听sf.record内的变动",
         "toast_ignore_vars_label": "不监听的变量（逗号分割）",
-        "toast_ignore_vars_hint": "留空表示监听所有变量。默认：record, initialVars",
+        "toast_ignore_vars_hint": "留空表示监听所有变量。支持路径和通配符，如 record.*、*.time。默认：record, initialVars",
+        "change_history_button": "查看存档变更历史",
+        "change_history_title": "存档变更历史",
+        "change_history_path_label": "变量路径：",
+        "change_history_include_children": "包含子路径",
+        "change_history_current_session": "仅本次会话",
+        "change_history_search": "查询",
+        "change_history_col_time": "时间",
+        "change_history_col_path": "变量",
+        "change_history_col_change": "变化",
+        "change_history_count": "共 {count} 条记录",
+        "change_history_unavailable": "变更历史不可用，请先选择存档目录。",
+        "monitor_stats_button": "监控统计（调试）",
+        "monitor_stats_title": "存档监控统计",
+        "monitor_stats_col_metric": "指标",
+        "monitor_stats_col_count": "次数",
+        "monitor_stats_col_avg": "平均(ms)",
+        "monitor_stats_col_p50": "P50(ms)",
+        "monitor_stats_col_p95": "P95(ms)",
+        "monitor_stats_col_max": "最大(ms)",
+        "monitor_stats_reset": "清空",
+        "monitor_stats_dump": "导出到文件...",
+        "monitor_stats_dump_success": "监控统计已导出到：\n{path}",
+        "monitor_stats_dump_failed": "导出监控统计失败。",
+        "monitor_stats_summary": "运行 {uptime} 秒 | 进程CPU {cpu} 秒 | 监控线程CPU {monitor_cpu} 秒 | 监视器：{watcher}",
         "sf_sav_changes_notification": "sf.sav文件有如下更改：",
         "export_tyrano_data": "解码并导出tyrano_data.sav",
         "import_tyrano_data": "导入、编码并保存tyrano_data.sav",
@@ -771,6 +819,7 @@ TRANSLATIONS = {
         "backup_confirm_text": "Estimated compressed size: {size}\n\nAre you sure you want to create a backup?",
         "backup_success_title": "Backup Successful",
         "backup_success_text": "Backup file: {filename}\nSize: {size}\nLocation: {path}",
+        "backup_skipped_files": "{count} file(s) could not be read and were not included in the backup:\n{files}",
         "restore_confirm_title": "Confirm Restore",
         "restore_confirm_text": "The current _storage folder will be completely replaced. Are you sure you want to continue?",
         "restore_missing_files_title": "Missing Required Files",
@@ -797,13 +846,60 @@ TRANSLATIONS = {
         "rename_backup_invalid_chars": "Filename contains invalid characters. Do not use: < > : \" / \\ | ? *",
         "rename_backup_success": "Backup renamed!\nOld filename: {old_filename}\nNew filename: {new_filename}",
         "rename_backup_failed": "Failed to rename backup",
+        "auto_backup_enable": "Auto-backup when the save changes",
+        "auto_backup_interval": "Minimum interval (minutes):",
+        "auto_backup_status": "Auto backup",
+        "compare_backup_button": "Compare",
+        "compare_backup_title": "Save Differences",
+        "compare_live_label": "Current _storage",
+        "compare_loading": "Comparing…",
+        "compare_no_changes": "No differences",
+        "compare_file_unavailable": "File missing or could not be decoded",
+        "cancel_operation": "Cancel",
+        "operation_progress_detail": "{percent}%  {done} / {total}  {speed}/s  ETA {eta}",
+        "backup_cancelled": "Backup cancelled",
+        "restore_cancelled": "Restore cancelled. _storage was not modified",
+        "verify_backups_button": "Verify Backups",
+        "verify_status_ok": "✓ Verified",
+        "verify_status_failed": "✗ Corrupted",
+        "verify_backups_ok": "Verified {count} backups. All are intact.",
+        "verify_backups_failed": "{count} backups failed verification:\n\n{details}",
+        "archive_backup_button": "Archive (LZMA)",
+        "archive_status": "LZMA archive",
+        "archive_confirm_title": "Confirm Archive",
+        "archive_confirm_text": "The {count} selected backups will be recompressed with LZMA in the background (smaller, but slower to create).\nOriginals are only replaced after the new archive is verified. Continue?",
+        "archive_result": "Archived {count} backups, reclaimed {size}",
 
         # Others tab
         "others_tab": "Others",
         "enable_toast": "Enable toast notifications",
         "toast_ignore_record": "Toast ignores changes in sf.record",
         "toast_ignore_vars_label": "Ignored variables (comma-separated)",
-        "toast_ignore_vars_hint": "Leave empty to monitor all variables. Default: record, initialVars",
+        "toast_ignore_vars_hint": "Leave empty to monitor all variables. Paths and wildcards such as record.* or *.time are supported. Default: record, initialVars",
+        "change_history_button": "View Save Change History",
+        "change_history_title": "Save Change History",
+        "change_history_path_label": "Variable path:",
+        "change_history_include_children": "Include sub-paths",
+        "change_history_current_session": "Current session only",
+        "change_history_search": "Search",
+        "change_history_col_time": "Time",
+        "change_history_col_path": "Variable",
+        "change_history_col_change": "Change",
+        "change_history_count": "{count} records",
+        "change_history_unavailable": "Change history is unavailable. Please select the save directory first.",
+        "monitor_stats_button": "Monitor statistics (debug)",
+        "monitor_stats_title": "Save Monitor Statistics",
+        "monitor_stats_col_metric": "Metric",
+        "monitor_stats_col_count": "Count",
+        "monitor_stats_col_avg": "Avg (ms)",
+        "monitor_stats_col_p50": "P50 (ms)",
+        "monitor_stats_col_p95": "P95 (ms)",
+        "monitor_stats_col_max": "Max (ms)",
+        "monitor_stats_reset": "Reset",
+        "monitor_stats_dump": "Dump to file...",
+        "monitor_stats_dump_success": "Monitor statistics saved to:\n{path}",
+        "monitor_stats_dump_failed": "Failed to save monitor statistics.",
+        "monitor_stats_summary": "Uptime {uptime}s | Process CPU {cpu}s | Monitor thread CPU {monitor_cpu}s | Watcher: {watcher}",
         "sf_sav_changes_notification": "sf.sav file has the following changes:",
         "export_tyrano_data": "Decode and export tyrano_data.sav",
         "import_tyrano_data": "Import, encode and save tyrano_data.sav",
@@ -1280,6 +1376,7 @@ TRANSLATIONS = {
         "backup_confirm_text": "予想圧縮サイズ：{size}\n\nバックアップを作成してもよろしいですか？",
         "backup_success_title": "バックアップ成功",
         "backup_success_text": "バックアップファイル：{filename}\nサイズ：{size}\n場所：{path}",
+        "backup_skipped_files": "以下の {count} 個のファイルは読み込めなかったため、バックアップに含まれていません：\n{files}",
         "restore_confirm_title": "復元を確認",
         "restore_confirm_text": "現在の_storageフォルダが完全に置き換えられます。続行してもよろしいですか？",
         "restore_missing_files_title": "必須ファイルが不足",
@@ -1306,13 +1403,60 @@ TRANSLATIONS = {
         "rename_backup_invalid_chars": "ファイル名に無効な文字が含まれています。使用しないでください：< > : \" / \\ | ? *",
         "rename_backup_success": "バックアップの名前を変更しました！\n元のファイル名：{old_filename}\n新しいファイル名：{new_filename}",
         "rename_backup_failed": "バックアップの名前変更に失敗しました",
+        "auto_backup_enable": "セーブ変更時に自動バックアップ",
+        "auto_backup_interval": "最小間隔（分）：",
+        "auto_backup_status": "自動バックアップ",
+        "compare_backup_button": "差分を比較",
+        "compare_backup_title": "セーブデータの差分",
+        "compare_live_label": "現在の_storage",
+        "compare_loading": "比較中…",
+        "compare_no_changes": "差分はありません",
+        "compare_file_unavailable": "ファイルが存在しないか、デコードできません",
+        "cancel_operation": "キャンセル",
+        "operation_progress_detail": "{percent}%  {done} / {total}  {speed}/s  残り {eta}",
+        "backup_cancelled": "バックアップをキャンセルしました",
+        "restore_cancelled": "復元をキャンセルしました。_storageは変更されていません",
+        "verify_backups_button": "バックアップを検証",
+        "verify_status_ok": "✓ 検証済み",
+        "verify_status_failed": "✗ 破損",
+        "verify_backups_ok": "{count} 件のバックアップを検証しました。すべて正常です。",
+        "verify_backups_failed": "{count} 件のバックアップの検証に失敗しました：\n\n{details}",
+        "archive_backup_button": "LZMAでアーカイブ",
+        "archive_status": "LZMAアーカイブ",
+        "archive_confirm_title": "アーカイブを確認",
+        "archive_confirm_text": "選択した {count} 件のバックアップをバックグラウンドでLZMA形式に再圧縮します（サイズは小さくなりますが、時間がかかります）。\n再圧縮したファイルの検証に成功した場合のみ元のファイルを置き換えます。続行しますか？",
+        "archive_result": "{count} 件のバックアップをアーカイブし、{size} 削減しました",
 
         # Others tab
         "others_tab": "その他",
         "enable_toast": "toast機能を有効にする",
         "toast_ignore_record": "toastはsf.record内の変動を監視しない",
         "toast_ignore_vars_label": "監視しない変数（カンマ区切り）",
-        "toast_ignore_vars_hint": "空欄の場合はすべての変数を監視します。デフォルト：record, initialVars",
+        "toast_ignore_vars_hint": "空欄の場合はすべての変数を監視します。record.*、*.time のようなパスとワイルドカードも使用できます。デフォルト：record, initialVars",
+        "change_history_button": "セーブ変更履歴を表示",
+        "change_history_title": "セーブ変更履歴",
+        "change_history_path_label": "変数パス：",
+        "change_history_include_children": "子パスを含む",
+        "change_history_current_session": "今回のセッションのみ",
+        "change_history_search": "検索",
+        "change_history_col_time": "時刻",
+        "change_history_col_path": "変数",
+        "change_history_col_change": "変化",
+        "change_history_count": "{count} 件",
+        "change_history_unavailable": "変更履歴を利用できません。先にセーブディレクトリを選択してください。",
+        "monitor_stats_button": "監視統計（デバッグ）",
+        "monitor_stats_title": "セーブ監視統計",
+        "monitor_stats_col_metric": "指標",
+        "monitor_stats_col_count": "回数",
+        "monitor_stats_col_avg": "平均(ms)",
+        "monitor_stats_col_p50": "P50(ms)",
+        "monitor_stats_col_p95": "P95(ms)",
+        "monitor_stats_col_max": "最大(ms)",
+        "monitor_stats_reset": "リセット",
+        "monitor_stats_dump": "ファイルに出力...",
+        "monitor_stats_dump_success": "監視統計を保存しました：\n{path}",
+        "monitor_stats_dump_failed": "監視統計の保存に失敗しました。",
+        "monitor_stats_summary": "稼働 {uptime} 秒 | プロセスCPU {cpu} 秒 | 監視スレッドCPU {monitor_cpu} 秒 | 監視方式：{watcher}",
         "sf_sav_changes_notification": "sf.savファイルに以下の変更があります：",
         "export_tyrano_data": "tyrano_data.savをデコードしてエクスポート",
         "import_tyrano_data": "tyrano_data.savをインポート、エンコードして保存",